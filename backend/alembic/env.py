@@ -43,6 +43,7 @@ from app.models.alert import Alert
 from app.models.insight import PatientInsight
 from app.models.activity_log import ActivityLog
 from app.models.system_log import SystemLog
+from app.models.patient_daily_metrics import PatientDailyMetrics
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,29 @@
+"""add_schedule_next_reminder_at
+
+Revision ID: 3f6d2b9c41e7
+Revises: 0fce1b03abdf
+Create Date: 2026-10-18 09:30:12.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6d2b9c41e7'
+down_revision: Union[str, None] = '0fce1b03abdf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left NULL here - the reminder job initializes it for active schedules on its next run
+    op.add_column('schedules', sa.Column('next_reminder_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_schedules_next_reminder_at'), 'schedules', ['next_reminder_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_schedules_next_reminder_at'), table_name='schedules')
+    op.drop_column('schedules', 'next_reminder_at')
@@ -0,0 +1,51 @@
+"""add_hot_query_composite_indexes
+
+Revision ID: 5b8e1f3a2c9d
+Revises: 3f6d2b9c41e7
+Create Date: 2026-10-18 11:05:47.203118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1f3a2c9d'
+down_revision: Union[str, None] = '3f6d2b9c41e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Missed/retry reminder jobs scan pending reminders by due time
+    op.create_index(
+        'ix_reminders_pending_due_at', 'reminders', ['due_at'], unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    # Reminder job looks up reminders already created for due schedules
+    op.create_index('ix_reminders_schedule_id_due_at', 'reminders', ['schedule_id', 'due_at'], unique=False)
+    # Recent conversation turns per patient
+    op.create_index(
+        'ix_conversations_patient_id_created_at', 'conversations', ['patient_id', 'created_at'], unique=False
+    )
+    # Inactivity detector checks for an open alert per patient, type and severity
+    op.create_index(
+        'ix_alerts_open_patient_type_severity_created_at', 'alerts',
+        ['patient_id', 'alert_type', 'severity', 'created_at'], unique=False,
+        postgresql_where=sa.text('acknowledged_at IS NULL')
+    )
+    # Latest heartbeat and activity feeds per patient and type
+    op.create_index(
+        'ix_activity_logs_patient_id_type_logged_at', 'activity_logs',
+        ['patient_id', 'activity_type', 'logged_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activity_logs_patient_id_type_logged_at', table_name='activity_logs')
+    op.drop_index('ix_alerts_open_patient_type_severity_created_at', table_name='alerts')
+    op.drop_index('ix_conversations_patient_id_created_at', table_name='conversations')
+    op.drop_index('ix_reminders_schedule_id_due_at', table_name='reminders')
+    op.drop_index('ix_reminders_pending_due_at', table_name='reminders')
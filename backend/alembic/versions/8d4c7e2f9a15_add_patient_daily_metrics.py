@@ -0,0 +1,43 @@
+"""add_patient_daily_metrics
+
+Revision ID: 8d4c7e2f9a15
+Revises: 5b8e1f3a2c9d
+Create Date: 2026-10-18 14:22:09.518734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4c7e2f9a15'
+down_revision: Union[str, None] = '5b8e1f3a2c9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left empty here - the metrics rollup job backfills all history on its first run
+    op.create_table('patient_daily_metrics',
+    sa.Column('patient_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('reminders_total', sa.Integer(), nullable=False),
+    sa.Column('reminders_completed', sa.Integer(), nullable=False),
+    sa.Column('interactions', sa.Integer(), nullable=False),
+    sa.Column('activity_minutes', sa.Integer(), nullable=False),
+    sa.Column('conversations', sa.Integer(), nullable=False),
+    sa.Column('sentiment_score_sum', sa.Float(), nullable=False),
+    sa.Column('positive_conversations', sa.Integer(), nullable=False),
+    sa.Column('negative_conversations', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('patient_id', 'day')
+    )
+    op.create_index(op.f('ix_patient_daily_metrics_day'), 'patient_daily_metrics', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_patient_daily_metrics_day'), table_name='patient_daily_metrics')
+    op.drop_table('patient_daily_metrics')
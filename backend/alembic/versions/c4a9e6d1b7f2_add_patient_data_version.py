@@ -0,0 +1,26 @@
+"""add_patient_data_version
+
+Revision ID: c4a9e6d1b7f2
+Revises: 8d4c7e2f9a15
+Create Date: 2026-10-18 16:05:47.203914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a9e6d1b7f2'
+down_revision: Union[str, None] = '8d4c7e2f9a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('patients', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('patients', 'data_version')
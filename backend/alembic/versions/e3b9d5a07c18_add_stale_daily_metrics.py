@@ -0,0 +1,35 @@
+"""add_stale_daily_metrics
+
+Revision ID: e3b9d5a07c18
+Revises: c4a9e6d1b7f2
+Create Date: 2026-10-18 18:12:31.604227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9d5a07c18'
+down_revision: Union[str, None] = 'c4a9e6d1b7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stale_daily_metrics',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('patient_id', sa.UUID(), nullable=False),
+    sa.Column('first_day', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stale_daily_metrics_patient_id'), 'stale_daily_metrics', ['patient_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_stale_daily_metrics_patient_id'), table_name='stale_daily_metrics')
+    op.drop_table('stale_daily_metrics')
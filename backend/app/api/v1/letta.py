@@ -4,18 +4,20 @@ Handles Letta agent management and long-term memory
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from datetime import datetime
 
-from app.core.dependencies import get_current_user, get_db
+from app.core.dependencies import get_current_user, get_async_db
 from app.models.caregiver import Caregiver
 from app.models.patient import Patient
 from app.models.conversation import Conversation
 from app.models.relationship import PatientCaregiverRelationship
 from app.services.letta_service import letta_service
+from app.services.ai_orchestrator import ai_orchestrator
 
 router = APIRouter()
 
@@ -74,14 +76,14 @@ class GenerateInsightResponse(BaseModel):
 
 # ===== HELPER FUNCTIONS =====
 
-def verify_patient_access(
+async def verify_patient_access(
     patient_id: UUID,
     caregiver: Caregiver,
-    db: Session
+    db: AsyncSession
 ) -> Patient:
     """Verify caregiver has access to patient and return patient"""
     # Check patient exists
-    patient = db.query(Patient).filter(Patient.id == patient_id).first()
+    patient = await db.get(Patient, patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -89,10 +91,12 @@ def verify_patient_access(
         )
 
     # Check access
-    relationship = db.query(PatientCaregiverRelationship).filter(
-        PatientCaregiverRelationship.patient_id == patient_id,
-        PatientCaregiverRelationship.caregiver_id == caregiver.id
-    ).first()
+    relationship = await db.scalar(
+        select(PatientCaregiverRelationship).where(
+            PatientCaregiverRelationship.patient_id == patient_id,
+            PatientCaregiverRelationship.caregiver_id == caregiver.id
+        ).limit(1)
+    )
 
     if not relationship:
         raise HTTPException(
@@ -109,7 +113,7 @@ def verify_patient_access(
 async def create_letta_agent(
     request: CreateAgentRequest,
     current_user: Caregiver = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a Letta AI agent for a patient
@@ -123,7 +127,7 @@ async def create_letta_agent(
     Once created, the agent will be used automatically in voice interactions.
     """
     # Verify access
-    patient = verify_patient_access(request.patient_id, current_user, db)
+    patient = await verify_patient_access(request.patient_id, current_user, db)
 
     # Check if agent already exists
     if patient.letta_agent_id:
@@ -161,7 +165,8 @@ async def create_letta_agent(
 
     # Update patient record
     patient.letta_agent_id = agent_id
-    db.commit()
+    await db.commit()
+    ai_orchestrator.invalidate_patient(str(patient.id))
 
     return CreateAgentResponse(
         patient_id=request.patient_id,
@@ -175,13 +180,13 @@ async def create_letta_agent(
 async def get_agent_status(
     patient_id: UUID,
     current_user: Caregiver = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Check if a patient has a Letta agent and get its status
     """
     # Verify access
-    patient = verify_patient_access(patient_id, current_user, db)
+    patient = await verify_patient_access(patient_id, current_user, db)
 
     return AgentStatusResponse(
         patient_id=patient_id,
@@ -196,7 +201,7 @@ async def sync_conversations_to_letta(
     request: SyncConversationsRequest,
     background_tasks: BackgroundTasks,
     current_user: Caregiver = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Sync past conversations to Letta agent for memory building
@@ -208,7 +213,7 @@ async def sync_conversations_to_letta(
     The sync happens in the background to avoid blocking the API.
     """
     # Verify access
-    patient = verify_patient_access(request.patient_id, current_user, db)
+    patient = await verify_patient_access(request.patient_id, current_user, db)
 
     # Check if agent exists
     if not patient.letta_agent_id:
@@ -218,9 +223,13 @@ async def sync_conversations_to_letta(
         )
 
     # Get recent conversations
-    conversations = db.query(Conversation).filter(
-        Conversation.patient_id == request.patient_id
-    ).order_by(Conversation.created_at.desc()).limit(request.limit).all()
+    result = await db.execute(
+        select(Conversation)
+        .where(Conversation.patient_id == request.patient_id)
+        .order_by(Conversation.created_at.desc())
+        .limit(request.limit)
+    )
+    conversations = result.scalars().all()
 
     if not conversations:
         return SyncConversationsResponse(
@@ -260,7 +269,7 @@ async def sync_conversations_to_letta(
 async def generate_letta_insight(
     request: GenerateInsightRequest,
     current_user: Caregiver = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generate an AI-powered insight using Letta's long-term memory
@@ -274,7 +283,7 @@ async def generate_letta_insight(
     The insight is generated by analyzing long-term memory, not just recent data.
     """
     # Verify access
-    patient = verify_patient_access(request.patient_id, current_user, db)
+    patient = await verify_patient_access(request.patient_id, current_user, db)
 
     # Check if agent exists
     if not patient.letta_agent_id:
@@ -284,9 +293,13 @@ async def generate_letta_insight(
         )
 
     # Get recent conversations for context
-    recent_conversations = db.query(Conversation).filter(
-        Conversation.patient_id == request.patient_id
-    ).order_by(Conversation.created_at.desc()).limit(20).all()
+    result = await db.execute(
+        select(Conversation)
+        .where(Conversation.patient_id == request.patient_id)
+        .order_by(Conversation.created_at.desc())
+        .limit(20)
+    )
+    recent_conversations = result.scalars().all()
 
     conversation_data = [
         {
@@ -322,7 +335,7 @@ async def generate_letta_insight(
 @router.post("/agents/bulk-create")
 async def bulk_create_agents(
     current_user: Caregiver = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create Letta agents for all patients that don't have one
@@ -330,17 +343,19 @@ async def bulk_create_agents(
     Admin/bulk operation to initialize agents for existing patients.
     """
     # Get all patients the caregiver has access to
-    relationships = db.query(PatientCaregiverRelationship).filter(
-        PatientCaregiverRelationship.caregiver_id == current_user.id
-    ).all()
-
-    patient_ids = [rel.patient_id for rel in relationships]
+    patient_ids = (await db.scalars(
+        select(PatientCaregiverRelationship.patient_id).where(
+            PatientCaregiverRelationship.caregiver_id == current_user.id
+        )
+    )).all()
 
     # Get patients without agents
-    patients_without_agents = db.query(Patient).filter(
-        Patient.id.in_(patient_ids),
-        Patient.letta_agent_id.is_(None)
-    ).all()
+    patients_without_agents = (await db.scalars(
+        select(Patient).where(
+            Patient.id.in_(patient_ids),
+            Patient.letta_agent_id.is_(None)
+        )
+    )).all()
 
     results = []
     for patient in patients_without_agents:
@@ -374,7 +389,11 @@ async def bulk_create_agents(
                 "status": "failed"
             })
 
-    db.commit()
+    await db.commit()
+
+    for result in results:
+        if result["status"] == "created":
+            ai_orchestrator.invalidate_patient(result["patient_id"])
 
     return {
         "total_patients": len(patients_without_agents),
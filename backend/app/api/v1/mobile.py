@@ -4,13 +4,13 @@ Handles device setup and token registration
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, date
 from uuid import UUID
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db
 from app.models.patient import Patient
 from app.models.schedule import Schedule
 from app.models.reminder import Reminder
@@ -26,9 +26,9 @@ router = APIRouter()
 
 
 @router.post("/setup", response_model=MobileSetupResponse)
-def setup_mobile_device(
+async def setup_mobile_device(
     setup_data: MobileSetupRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Verify setup token and activate mobile device
@@ -60,7 +60,7 @@ def setup_mobile_device(
     - 400: Setup already completed
     """
     # Check if patient exists
-    patient = db.query(Patient).filter(Patient.id == setup_data.patient_id).first()
+    patient = await db.get(Patient, setup_data.patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,7 +100,7 @@ def setup_mobile_device(
     patient.setup_token = None  # Invalidate token (one-time use)
     patient.setup_token_expires = None
 
-    db.commit()
+    await db.commit()
 
     return MobileSetupResponse(
         success=True,
@@ -111,9 +111,9 @@ def setup_mobile_device(
 
 
 @router.post("/device-token", response_model=DeviceTokenResponse)
-def register_device_token(
+async def register_device_token(
     token_data: DeviceTokenRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register Firebase device token for push notifications
@@ -141,7 +141,7 @@ def register_device_token(
     - 400: Patient not setup yet
     """
     # Check if patient exists
-    patient = db.query(Patient).filter(Patient.id == token_data.patient_id).first()
+    patient = await db.get(Patient, token_data.patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -163,7 +163,7 @@ def register_device_token(
     if token_data.app_version:
         patient.app_version = token_data.app_version
 
-    db.commit()
+    await db.commit()
 
     return DeviceTokenResponse(
         success=True,
@@ -172,9 +172,9 @@ def register_device_token(
 
 
 @router.get("/patients/{patient_id}/schedules", response_model=List[ScheduleResponse])
-def get_patient_schedules(
+async def get_patient_schedules(
     patient_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all active schedules for a patient (public endpoint for mobile app)
@@ -191,7 +191,7 @@ def get_patient_schedules(
     - 404: Patient not found
     """
     # Check if patient exists
-    patient = db.query(Patient).filter(Patient.id == patient_id).first()
+    patient = await db.get(Patient, patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -199,18 +199,20 @@ def get_patient_schedules(
         )
 
     # Get all active schedules for this patient
-    schedules = db.query(Schedule).filter(
-        Schedule.patient_id == patient_id,
-        Schedule.is_active == True
-    ).order_by(Schedule.scheduled_time).all()
+    schedules = (await db.scalars(
+        select(Schedule).where(
+            Schedule.patient_id == patient_id,
+            Schedule.is_active == True
+        ).order_by(Schedule.scheduled_time)
+    )).all()
 
     return schedules
 
 
 @router.get("/patients/{patient_id}/reminders", response_model=List[ReminderResponse])
-def get_patient_reminders(
+async def get_patient_reminders(
     patient_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all pending and recent reminders for a patient (public endpoint for mobile app)
@@ -228,7 +230,7 @@ def get_patient_reminders(
     - 404: Patient not found
     """
     # Check if patient exists
-    patient = db.query(Patient).filter(Patient.id == patient_id).first()
+    patient = await db.get(Patient, patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -242,19 +244,21 @@ def get_patient_reminders(
     # 1. All pending/sent/delivered reminders (regardless of date)
     # 2. All completed/missed reminders from today (for display)
     # For simplicity, just return all pending reminders (we'll filter by date on frontend if needed)
-    reminders = db.query(Reminder).filter(
-        Reminder.patient_id == patient_id,
-        Reminder.status.in_(['pending', 'sent', 'delivered'])
-    ).order_by(Reminder.due_at).all()
+    reminders = (await db.scalars(
+        select(Reminder).where(
+            Reminder.patient_id == patient_id,
+            Reminder.status.in_(['pending', 'sent', 'delivered'])
+        ).order_by(Reminder.due_at)
+    )).all()
 
     return reminders
 
 
 @router.put("/reminders/{reminder_id}/acknowledge", response_model=ReminderResponse)
-def acknowledge_reminder(
+async def acknowledge_reminder(
     reminder_id: UUID,
     ack_data: ReminderAcknowledge,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Acknowledge a reminder from the mobile app (patient)
@@ -277,7 +281,7 @@ def acknowledge_reminder(
     - 404: Reminder not found
     """
     # Get reminder
-    reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
+    reminder = await db.get(Reminder, reminder_id)
     if not reminder:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -305,7 +309,7 @@ def acknowledge_reminder(
 
     reminder.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(reminder)
+    await db.commit()
+    await db.refresh(reminder)
 
     return reminder
@@ -3,16 +3,19 @@ Patient API endpoints
 Handles patient CRUD operations and caregiver relationships
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime, timedelta
-from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+import math
 
+from app.core.config import settings
 from app.core.dependencies import get_current_user, get_db
 from app.models.caregiver import Caregiver
 from app.models.patient import Patient
 from app.models.relationship import PatientCaregiverRelationship
+from app.models.schedule import Schedule
 from app.models.activity_log import ActivityLog
 from app.schemas.patient import (
     PatientCreate,
@@ -21,10 +24,16 @@ from app.schemas.patient import (
     PatientListResponse,
     PatientWithRelationship,
     HeartbeatCreate,
+    ActivityBatchCreate,
+    ActivityBatchResponse,
     ActivityLogResponse,
     ActivityLogListResponse
 )
 from app.schemas.mobile import QRCodeGenerateResponse
+from app.services.ai_orchestrator import ai_orchestrator
+from app.jobs.inactivity_timer import inactivity_timer
+from app.services.activity_ingestion import ActivityBufferFull, activity_ingestion, insert_activity_events
+from app.utils.cache import get_cache
 import secrets
 import json
 
@@ -177,10 +186,21 @@ def update_patient(
     for field, value in update_dict.items():
         setattr(patient, field, value)
 
+    # Reminder times are computed in the patient's timezone; the reminder job
+    # recomputes schedules whose next_reminder_at is cleared
+    if "timezone" in update_dict:
+        db.query(Schedule).filter(Schedule.patient_id == patient_id).update(
+            {Schedule.next_reminder_at: None},
+            synchronize_session=False
+        )
+
     patient.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(patient)
 
+    # Voice interactions must see the new profile immediately
+    ai_orchestrator.invalidate_patient(str(patient_id), patient.letta_agent_id)
+
     return patient
 
 
@@ -224,8 +244,10 @@ def delete_patient(
         )
 
     # Delete patient (cascade will handle related records)
+    letta_agent_id = patient.letta_agent_id
     db.delete(patient)
     db.commit()
+    ai_orchestrator.invalidate_patient(str(patient_id), letta_agent_id)
 
     return None
 
@@ -351,6 +373,7 @@ def remove_caregiver_from_patient(
 def record_patient_activity(
     patient_id: UUID,
     activity_data: HeartbeatCreate,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
@@ -368,6 +391,12 @@ def record_patient_activity(
     **Authentication**: This endpoint is public (called from patient mobile app)
     but requires valid patient_id
 
+    **Buffered ingestion**: With ACTIVITY_INGESTION_MODE=buffered, heartbeats
+    (and the other ACTIVITY_BUFFERED_TYPES) are accepted with **202** and written
+    in batches within ACTIVITY_FLUSH_INTERVAL_SECONDS. When the buffer is full the
+    endpoint returns 503 with Retry-After. Other activity types are written
+    immediately (201).
+
     **Example request:**
     ```json
     {
@@ -384,6 +413,12 @@ def record_patient_activity(
     }
     ```
     """
+    if (
+        settings.ACTIVITY_INGESTION_MODE == "buffered"
+        and activity_data.activity_type in settings.activity_buffered_types_list
+    ):
+        return _buffer_patient_activity(patient_id, activity_data, response, db)
+
     # Check if patient exists
     patient = db.query(Patient).filter(Patient.id == patient_id).first()
     if not patient:
@@ -414,12 +449,143 @@ def record_patient_activity(
     if activity_data.activity_type == "heartbeat":
         patient.last_heartbeat_at = now
 
+    # Inactivity is measured from the last heartbeat, falling back to last activity
+    last_activity = patient.last_heartbeat_at or now
+
     db.commit()
     db.refresh(activity_log)
 
+    # Re-arm the patient's inactivity deadline
+    inactivity_timer.touch(patient_id, last_activity)
+
     return activity_log
 
 
+@router.post("/{patient_id}/activity/batch", response_model=ActivityBatchResponse, status_code=status.HTTP_201_CREATED)
+def record_patient_activity_batch(
+    patient_id: UUID,
+    batch_data: ActivityBatchCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Record a batch of activity events (e.g. replayed after the device was offline)
+
+    Accepts up to 500 events of any type accepted by the heartbeat endpoint, each
+    with the time it happened on the device (`logged_at`, ISO 8601; times
+    without an offset are UTC, future times are clamped to now). All events are
+    inserted in one statement and the patient's last_active_at/last_heartbeat_at
+    move to the latest event times.
+
+    **Authentication**: This endpoint is public (called from patient mobile app)
+    but requires valid patient_id
+
+    **Example request:**
+    ```json
+    {
+      "events": [
+        {"activity_type": "app_open", "logged_at": "2025-10-24T09:58:00Z"},
+        {"activity_type": "heartbeat", "battery_level": 84, "logged_at": "2025-10-24T10:00:00Z"},
+        {"activity_type": "location_update", "latitude": 37.7749, "longitude": -122.4194, "logged_at": "2025-10-24T10:05:00Z"}
+      ]
+    }
+    ```
+    """
+    # Check if patient exists
+    if db.query(Patient.id).filter(Patient.id == patient_id).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Patient not found"
+        )
+
+    now = datetime.utcnow()
+    events = []
+    for event in batch_data.events:
+        logged_at = event.logged_at or now
+        if logged_at.tzinfo is not None:
+            logged_at = logged_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+        events.append({
+            "id": uuid4(),
+            "patient_id": patient_id,
+            "activity_type": event.activity_type,
+            "details": event.details or {},
+            "device_type": event.device_type,
+            "app_version": event.app_version,
+            "latitude": event.latitude,
+            "longitude": event.longitude,
+            "battery_level": event.battery_level,
+            "logged_at": min(logged_at, now)
+        })
+
+    # Events from already rolled-up days also mark those days of the report metrics rollup stale
+    last_active_at, last_heartbeat_at = insert_activity_events(db, events)[patient_id]
+    db.commit()
+
+    # Re-arm the patient's inactivity deadline
+    inactivity_timer.touch(patient_id, last_heartbeat_at or last_active_at)
+
+    return ActivityBatchResponse(
+        patient_id=patient_id,
+        recorded=len(events),
+        last_active_at=last_active_at,
+        last_heartbeat_at=last_heartbeat_at
+    )
+
+
+def _buffer_patient_activity(
+    patient_id: UUID,
+    activity_data: HeartbeatCreate,
+    response: Response,
+    db: Session
+) -> ActivityLogResponse:
+    """
+    Accept activity into the ingestion buffer and return 202
+
+    The patient lookup is cached, so a steady stream of heartbeats does no
+    database work per request.
+    """
+    known_patients = get_cache("activity_patients", max_entries=10000, ttl_seconds=300, memory_only=True)
+    key = str(patient_id)
+
+    if known_patients.get(key) is None:
+        if db.query(Patient.id).filter(Patient.id == patient_id).first() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Patient not found"
+            )
+        known_patients.set(key, True)
+
+    event = {
+        "id": uuid4(),
+        "patient_id": patient_id,
+        "activity_type": activity_data.activity_type,
+        "details": activity_data.details or {},
+        "device_type": activity_data.device_type,
+        "app_version": activity_data.app_version,
+        "latitude": activity_data.latitude,
+        "longitude": activity_data.longitude,
+        "battery_level": activity_data.battery_level,
+        "logged_at": datetime.utcnow()
+    }
+
+    try:
+        activity_ingestion.submit(event)
+    except ActivityBufferFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Activity ingestion is busy, retry later",
+            headers={"Retry-After": str(math.ceil(settings.ACTIVITY_FLUSH_INTERVAL_SECONDS))}
+        )
+
+    # Re-arm the patient's inactivity deadline (other buffered types do not
+    # move it for patients that have heartbeats; the timer re-reads the database)
+    if activity_data.activity_type == "heartbeat":
+        inactivity_timer.touch(patient_id, event["logged_at"])
+
+    response.status_code = status.HTTP_202_ACCEPTED
+    return ActivityLogResponse(**event)
+
+
 @router.get("/{patient_id}/activity", response_model=ActivityLogListResponse)
 def get_patient_activity(
     patient_id: UUID,
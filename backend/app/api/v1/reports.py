@@ -3,9 +3,10 @@ Reports API endpoints
 Handles generation of patient reports with aggregated metrics
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import Optional
+import time
+from typing import Dict, Optional
 from uuid import UUID
 from datetime import date
 
@@ -13,17 +14,43 @@ from app.core.dependencies import get_current_user, get_db
 from app.models.caregiver import Caregiver
 from app.models.patient import Patient
 from app.models.relationship import PatientCaregiverRelationship
-from app.schemas.report import PatientReport, TimeRange
-from app.services.reports import generate_report
+from app.schemas.report import CohortReport, PatientReport, TimeRange
+from app.services.report_cache import cache_report, etag_matches, get_cached_report, report_etag
+from app.services.reports import calculate_date_range, generate_cohort_report, generate_report
 
 router = APIRouter()
 
 
+def _validate_custom_range(time_range: TimeRange, start_date: Optional[date], end_date: Optional[date]) -> None:
+    """Validate start_date/end_date of a custom time range (400 if invalid)"""
+    if time_range == TimeRange.CUSTOM or time_range.value == "custom":
+        if not start_date or not end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date and end_date are required for custom time range"
+            )
+
+        if start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date must be before or equal to end_date"
+            )
+
+
+def _server_timing(timings: Dict[str, float], *metrics: str) -> str:
+    """Server-Timing header value (metrics without a duration, then durations in ms)"""
+    return ", ".join(
+        list(metrics) + [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    )
+
+
 # ===== REPORTS ENDPOINTS =====
 
 @router.get("/patients/{patient_id}/reports", response_model=PatientReport)
 def get_patient_report(
     patient_id: UUID,
+    request: Request,
+    response: Response,
     time_range: TimeRange = Query("7d", description="Time range for report: 7d, 30d, 90d, all, or custom"),
     start_date: Optional[date] = Query(None, description="Start date for custom range (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date for custom range (YYYY-MM-DD)"),
@@ -45,6 +72,15 @@ def get_patient_report(
     - Activity trends (average daily minutes, trend, daily data)
     - Mood analytics (sentiment score, distribution, trend, daily data)
 
+    **Caching:**
+    - Responses carry an `ETag`; send it back in `If-None-Match` to get a
+      `304 Not Modified` while the patient's report data is unchanged
+
+    **Debugging:**
+    - The `Server-Timing` response header has the report cache status, the
+      duration of each section (sections are calculated concurrently) and of
+      the whole report
+
     **Permissions:**
     - Requires authenticated caregiver
     - Caregiver must have access to the patient
@@ -69,29 +105,102 @@ def get_patient_report(
             detail="Access denied to this patient"
         )
 
-    # Validate custom date range
-    if time_range == TimeRange.CUSTOM or time_range.value == "custom":
-        if not start_date or not end_date:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="start_date and end_date are required for custom time range"
-            )
+    _validate_custom_range(time_range, start_date, end_date)
 
-        if start_date > end_date:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="start_date must be before or equal to end_date"
+    # Generate report
+    try:
+        start = time.perf_counter()
+        start_dt, end_dt = calculate_date_range(time_range, start_date, end_date)
+
+        # Unchanged report data - the client's copy (or the cached report) is current
+        etag = report_etag(patient, time_range, start_dt, end_dt)
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+        timings: Dict[str, float] = {}
+        report = get_cached_report(etag)
+        cache_status = "hit" if report is not None else "miss"
+        if report is None:
+            report = generate_report(
+                db=db,
+                patient_id=patient_id,
+                time_range=time_range,
+                start_date=start_date,
+                end_date=end_date,
+                timings=timings
             )
+            cache_report(etag, report)
+
+        timings["total"] = time.perf_counter() - start
+        response.headers.update(cache_headers)
+        response.headers["Server-Timing"] = _server_timing(timings, f"cache;desc={cache_status}")
+        return report
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating report: {str(e)}"
+        )
+
+
+@router.get("/reports/cohort", response_model=CohortReport)
+def get_cohort_report(
+    response: Response,
+    time_range: TimeRange = Query("7d", description="Time range for report: 7d, 30d, 90d, all, or custom"),
+    start_date: Optional[date] = Query(None, description="Start date for custom range (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date for custom range (YYYY-MM-DD)"),
+    current_user: Caregiver = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get report summaries for all of the current caregiver's patients
+
+    One request for the dashboard home page instead of one report per patient:
+    each metric section is one grouped query for all patients together.
+
+    **Per Patient:**
+    - Medication adherence rate and trend
+    - Average daily activity minutes and trend
+    - Average sentiment score, distribution and trend
+    - Sparklines: one value per day from start_date to end_date, or per week
+      (sparkline_days = 7) for ranges over 90 days (adherence rate, average
+      daily activity minutes, sentiment score; null = no data)
+
+    **Permissions:**
+    - Requires authenticated caregiver
+    - Includes only patients linked to the caregiver
+    """
+    _validate_custom_range(time_range, start_date, end_date)
+
+    # Patients through relationships (same order as the patient list)
+    patients = db.query(Patient).join(
+        PatientCaregiverRelationship,
+        Patient.id == PatientCaregiverRelationship.patient_id
+    ).filter(
+        PatientCaregiverRelationship.caregiver_id == current_user.id
+    ).order_by(
+        Patient.last_name,
+        Patient.first_name
+    ).all()
 
-    # Generate report
     try:
-        report = generate_report(
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        report = generate_cohort_report(
             db=db,
-            patient_id=patient_id,
+            patients=patients,
             time_range=time_range,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            timings=timings
         )
+        timings["total"] = time.perf_counter() - start
+        response.headers["Server-Timing"] = _server_timing(timings)
         return report
     except ValueError as e:
         raise HTTPException(
@@ -101,5 +210,5 @@ def get_patient_report(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating report: {str(e)}"
+            detail=f"Error generating cohort report: {str(e)}"
         )
@@ -15,6 +15,7 @@ from app.models.patient import Patient
 from app.models.schedule import Schedule
 from app.models.reminder import Reminder
 from app.models.relationship import PatientCaregiverRelationship
+from app.services.recurrence import next_reminder_at
 from app.schemas.schedule import (
     ScheduleCreate,
     ScheduleUpdate,
@@ -77,6 +78,7 @@ def create_schedule(
         days_of_week=schedule_data.days_of_week,
         reminder_advance_minutes=schedule_data.reminder_advance_minutes
     )
+    new_schedule.next_reminder_at = next_reminder_at(new_schedule, datetime.utcnow(), patient.timezone)
 
     db.add(new_schedule)
     db.commit()
@@ -191,6 +193,8 @@ def update_schedule(
     for field, value in update_dict.items():
         setattr(schedule, field, value)
 
+    # Timing may have changed - the reminder job reads only next_reminder_at
+    schedule.next_reminder_at = next_reminder_at(schedule, datetime.utcnow(), schedule.patient.timezone)
     schedule.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(schedule)
@@ -4,12 +4,16 @@ Handles real-time voice conversations with AI
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from uuid import UUID
+import json
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_db, get_async_db
+from app.database.session import AsyncSessionLocal
 from app.services.ai_orchestrator import ai_orchestrator
 from app.models.patient import Patient
 
@@ -33,6 +37,7 @@ class VoiceInteractionResponse(BaseModel):
     health_mentions: List[str]
     urgency_level: str
     alert_created: bool
+    analysis_pending: bool = Field(False, description="True while sentiment/urgency analysis runs in the background")
     response_time: float
     similar_conversations_found: int
 
@@ -53,7 +58,7 @@ class DailySummaryTriggerRequest(BaseModel):
 @router.post("/interact", response_model=VoiceInteractionResponse)
 async def voice_interaction(
     request: VoiceInteractionRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Process voice interaction with complete AI pipeline
@@ -72,9 +77,8 @@ async def voice_interaction(
 
     Returns AI response text to be converted to speech by the mobile app.
     """
-    # Verify patient exists
-    patient = db.query(Patient).filter(Patient.id == request.patient_id).first()
-    if not patient:
+    # Verify patient exists (also warms the patient context store)
+    if not await ai_orchestrator.get_patient_state(str(request.patient_id), db):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient not found"
@@ -101,15 +105,61 @@ async def voice_interaction(
         health_mentions=result["health_mentions"],
         urgency_level=result["urgency_level"],
         alert_created=result["alert_created"],
+        analysis_pending=result.get("analysis_pending", False),
         response_time=result["response_time"],
         similar_conversations_found=result["similar_conversations_found"]
     )
 
 
+@router.post("/interact/stream")
+async def voice_interaction_stream(
+    request: VoiceInteractionRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Streaming variant of /interact using Server-Sent Events
+
+    Sends each sentence of the AI response as soon as Claude generates it, so the
+    mobile app can start TTS on the first sentence while analysis, database save
+    and Chroma indexing finish on the server.
+
+    Events:
+    - `sentence`: `{"text": "..."}` - next sentence to speak
+    - `done`: same fields as the /interact response
+    - `error`: `{"error": "...", "ai_response": "..."}` - fallback text to speak
+    """
+    # Verify patient exists (also warms the patient context store)
+    if not await ai_orchestrator.get_patient_state(str(request.patient_id), db):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Patient not found"
+        )
+
+    async def event_stream():
+        # The stream outlives this request handler, so it uses its own session
+        async with AsyncSessionLocal() as stream_db:
+            async for event in ai_orchestrator.stream_voice_interaction(
+                patient_id=str(request.patient_id),
+                patient_message=request.message,
+                db=stream_db,
+                conversation_type=request.conversation_type
+            ):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering so sentences arrive immediately
+        }
+    )
+
+
 @router.post("/initialize-agent", status_code=status.HTTP_200_OK)
 async def initialize_patient_agent(
     request: InitializePatientAgentRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Initialize Letta AI agent for a patient
@@ -118,7 +168,7 @@ async def initialize_patient_agent(
     Creates a persistent Letta agent that maintains long-term memory.
     """
     # Verify patient exists
-    patient = db.query(Patient).filter(Patient.id == request.patient_id).first()
+    patient = await db.get(Patient, request.patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -140,7 +190,7 @@ async def initialize_patient_agent(
     )
 
     if success:
-        db.refresh(patient)
+        await db.refresh(patient)
         return {
             "message": "Letta agent initialized successfully",
             "agent_id": patient.letta_agent_id,
@@ -258,7 +308,7 @@ async def get_chroma_stats():
 @router.get("/patients/{patient_id}/conversation-analytics", status_code=status.HTTP_200_OK)
 async def get_patient_conversation_analytics(
     patient_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get analytics about a patient's conversations from Chroma
@@ -268,7 +318,7 @@ async def get_patient_conversation_analytics(
     from app.services.chroma_service import chroma_service
 
     # Verify patient exists
-    patient = db.query(Patient).filter(Patient.id == patient_id).first()
+    patient = await db.get(Patient, patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -4,7 +4,7 @@ Loads environment variables from .env file
 """
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -19,12 +19,32 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with asyncpg/aiosqlite
+    DB_POOL_SIZE: int = 10  # Persistent connections per engine (sync and async) per worker
+    DB_MAX_OVERFLOW: int = 20
 
     # AI Services
     CLAUDE_API_KEY: str = ""
     LETTA_API_KEY: str = ""
     LETTA_PROJECT_ID: str = ""
     LETTA_BASE_URL: str = "https://api.letta.com"
+    CLAUDE_COMBINED_ANALYSIS: bool = True  # Reply + analysis in one Claude call
+    CLAUDE_PROMPT_CACHING: bool = True  # Mark system prompt for provider-side caching
+    CLAUDE_TIMEOUT_SECONDS: float = 30.0
+    CLAUDE_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    CLAUDE_MAX_RETRIES: int = 2
+    CLAUDE_MAX_CONCURRENCY: int = 16  # In-flight Claude calls per worker
+    CLAUDE_MAX_CONNECTIONS: int = 20
+    LETTA_TIMEOUT_SECONDS: float = 30.0
+    LETTA_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LETTA_MAX_CONNECTIONS: int = 20
+    LETTA_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LETTA_HTTP2: bool = False  # Requires the h2 package
+    LETTA_MAX_RETRIES: int = 3  # Retries on 429/5xx and connection errors (POSTs: only 429/503 and unsent requests)
+    LETTA_RETRY_BASE_SECONDS: float = 0.5
+    LETTA_RETRY_MAX_SECONDS: float = 8.0
+    LETTA_MEMORY_BATCH_SIZE: int = 10  # Utterances per write-behind Letta update
+    LETTA_MEMORY_FLUSH_INTERVAL_SECONDS: float = 30.0
 
     # Chroma Vector Database (REQUIRED for prize)
     CHROMA_HOST: str = "localhost"
@@ -39,6 +59,8 @@ class Settings(BaseSettings):
     # Firebase (Push Notifications)
     FIREBASE_SERVER_KEY: str = ""
     FIREBASE_CREDENTIALS_PATH: str = "./firebase-credentials.json"
+    PUSH_BATCH_SIZE: int = 500  # Messages per FCM send_each call (FCM maximum is 500)
+    PUSH_MAX_CONCURRENT_BATCHES: int = 4
 
     # JWT Settings
     JWT_SECRET_KEY: str
@@ -53,6 +75,38 @@ class Settings(BaseSettings):
     REMINDER_CHECK_INTERVAL_SECONDS: int = 60
     MONITORING_CHECK_INTERVAL_SECONDS: int = 1800
     SUMMARY_GENERATION_HOUR: int = 0
+    ROLLUP_RECOMPUTE_DAYS: int = 3  # Completed days re-rolled up each hour (late writes)
+    ROLLUP_REFRESH_INTERVAL_SECONDS: int = 60  # How often rolled-up days marked stale by late writes are recomputed
+    REPORT_SECTION_WORKERS: int = 0  # Threads (and pooled connections) for report sections (0 = half of DB_POOL_SIZE)
+    REPORT_CACHE_TTL_SECONDS: int = 3600  # Reports are also invalidated by patient data_version
+    REPORT_CACHE_MAX_ENTRIES: int = 1000
+
+    # Post-Response Work Queue (voice analysis, Chroma indexing, alerts)
+    POST_RESPONSE_QUEUE_DIR: str = "./queue_data/post_response"
+    POST_RESPONSE_WORKERS: int = 2
+    POST_RESPONSE_MAX_RETRIES: int = 5
+    POST_RESPONSE_RETRY_BASE_SECONDS: float = 2.0
+    POST_RESPONSE_FAILED_RETENTION_DAYS: float = 14  # Failed jobs are kept this long for inspection
+
+    # Activity Ingestion (buffered = heartbeats are accepted with 202 and written in batches)
+    ACTIVITY_INGESTION_MODE: str = "buffered"  # buffered, sync
+    ACTIVITY_BUFFERED_TYPES: str = "heartbeat,location_update,battery_update"  # Comma-separated
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 2.0
+    ACTIVITY_FLUSH_BATCH_SIZE: int = 1000  # Rows per multi-row INSERT (flushes early when reached)
+    ACTIVITY_BUFFER_MAX_SIZE: int = 10000  # Reject with 503 beyond this many waiting events
+    ACTIVITY_DURABILITY: str = "memory"  # memory, journal
+    ACTIVITY_JOURNAL_DIR: str = "./queue_data/activity"
+
+    # Caching (memory = per worker, redis = shared via a Redis-compatible server)
+    CACHE_BACKEND: str = "memory"  # memory, redis
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_REDIS_TIMEOUT_SECONDS: float = 0.2
+    CACHE_KEY_PREFIX: str = "elda"
+    LETTA_CONTEXT_CACHE_TTL_SECONDS: int = 300
+    LETTA_CONTEXT_CACHE_MAX_ENTRIES: int = 1000
+    PATIENT_CONTEXT_CACHE_TTL_SECONDS: int = 600
+    PATIENT_CONTEXT_CACHE_MAX_ENTRIES: int = 1000
+    CONVERSATION_HISTORY_TURNS: int = 5  # Recent turns sent to Claude
 
     # API Response Time Targets (for monitoring)
     VOICE_RESPONSE_TARGET_SECONDS: int = 5
@@ -75,6 +129,11 @@ class Settings(BaseSettings):
         """Check if running in development"""
         return self.APP_ENV == "development"
 
+    @property
+    def activity_buffered_types_list(self) -> List[str]:
+        """Parse buffered activity types from comma-separated string"""
+        return [activity_type.strip() for activity_type in self.ACTIVITY_BUFFERED_TYPES.split(",") if activity_type.strip()]
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Convert CORS_ORIGINS string to list"""
@@ -8,7 +8,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.core.security import decode_access_token
-from app.database.session import get_db
+from app.database.session import get_db, get_async_db
 
 # Security scheme for JWT authentication
 security = HTTPBearer()
@@ -5,8 +5,9 @@ Monitors heartbeat timestamps and creates alerts when patients are inactive
 
 import logging
 from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import Select, and_, case, exists, func, insert, select
 
 from app.database.session import SessionLocal
 from app.models.patient import Patient
@@ -20,152 +21,185 @@ INACTIVITY_WARNING_HOURS = 2      # Warning alert after 2 hours
 INACTIVITY_HIGH_HOURS = 4          # High severity after 4 hours
 INACTIVITY_CRITICAL_HOURS = 6      # Critical severity after 6 hours
 
+# Existing unacknowledged alerts younger than this suppress a new one
+ALERT_DEDUPE_HOURS = 24
+
+
+def last_activity_column():
+    """Last activity column (prefer last_heartbeat_at, fallback to last_active_at)"""
+    return func.coalesce(Patient.last_heartbeat_at, Patient.last_active_at)
+
+
+def _inactivity_bucket(now: datetime):
+    """
+    SQL expression classifying a patient by inactivity duration
+
+    Returns:
+        CASE expression: "no_activity", "critical", "high", "medium" or "active"
+    """
+    last_activity = last_activity_column()
+    return case(
+        (last_activity.is_(None), "no_activity"),
+        (last_activity <= now - timedelta(hours=INACTIVITY_CRITICAL_HOURS), "critical"),
+        (last_activity <= now - timedelta(hours=INACTIVITY_HIGH_HOURS), "high"),
+        (last_activity <= now - timedelta(hours=INACTIVITY_WARNING_HOURS), "medium"),
+        else_="active"
+    )
+
+
+def _inactivity_alert(patient: Patient, last_activity: datetime, severity: str, now: datetime) -> Dict[str, Any]:
+    """
+    Build an inactivity alert row for bulk insert
+
+    Args:
+        patient: Inactive patient
+        last_activity: Patient's last activity (naive UTC)
+        severity: "medium", "high" or "critical"
+        now: Current time (naive UTC)
+
+    Returns:
+        Column values for insert(Alert)
+    """
+    inactive_hours = (now - last_activity).total_seconds() / 3600
+
+    message = (
+        f"{patient.display_name} has been inactive for {inactive_hours:.1f} hours. "
+        f"Last activity: {last_activity.strftime('%Y-%m-%d %H:%M:%S UTC')}."
+    )
+    if severity == "critical":
+        message += " This requires immediate attention."
+    elif severity == "high":
+        message += " Please check on the patient."
+
+    # Create recommended action
+    recommended_action = "Please check on the patient"
+    if severity == "critical" and patient.emergency_contact_name:
+        recommended_action = (
+            f"URGENT: Contact {patient.emergency_contact_name} "
+            f"at {patient.emergency_contact_phone} immediately."
+        )
+    elif severity == "high":
+        recommended_action = "Please call the patient or visit them soon."
+
+    return {
+        "patient_id": patient.id,
+        "alert_type": "inactivity",
+        "severity": severity,
+        "title": f"Patient Inactivity: {patient.display_name}",
+        "description": message,
+        "recommended_action": recommended_action,
+        "triggered_by": "inactivity_detector",
+        "created_at": now
+    }
+
+
+def alert_inactive_patients(
+    db: Session,
+    now: datetime,
+    patient_ids: Optional[Iterable[Any]] = None
+) -> List[Tuple[Patient, datetime, str]]:
+    """
+    Create inactivity alerts for inactive patients (without committing)
+
+    Classifies patients by last activity in one query. Patients that already
+    have an unacknowledged inactivity alert at the same severity (from the last
+    24 hours) are excluded by an anti-join, so only one alert is created per
+    patient per threshold. New alerts are bulk inserted.
+
+    Args:
+        db: Database session
+        now: Current time (naive UTC)
+        patient_ids: Only check these patients (default: all active patients)
+
+    Returns:
+        (patient, last activity, severity) for each alert created
+    """
+    inactive_patients = [tuple(row) for row in db.execute(inactive_patients_query(now, patient_ids)).all()]
+
+    if inactive_patients:
+        db.execute(insert(Alert), [
+            _inactivity_alert(patient, patient_last_activity, patient_severity, now)
+            for patient, patient_last_activity, patient_severity in inactive_patients
+        ])
+
+    return inactive_patients
+
+
+def inactive_patients_query(now: datetime, patient_ids: Optional[Iterable[Any]] = None) -> Select:
+    """
+    Inactive patients without an open alert at their current severity
+
+    Args:
+        now: Current time (naive UTC)
+        patient_ids: Only these patients (default: all active patients)
+
+    Columns: Patient, last activity, severity
+    """
+    last_activity = last_activity_column()
+    severity = _inactivity_bucket(now)
+
+    open_alert_exists = exists().where(
+        and_(
+            Alert.patient_id == Patient.id,
+            Alert.alert_type == "inactivity",
+            Alert.severity == severity,
+            Alert.acknowledged_at.is_(None),  # Only check unacknowledged
+            Alert.created_at >= now - timedelta(hours=ALERT_DEDUPE_HOURS)
+        )
+    )
+
+    query = select(Patient, last_activity, severity).where(
+        Patient.is_active == True,
+        last_activity <= now - timedelta(hours=INACTIVITY_WARNING_HOURS),
+        ~open_alert_exists
+    )
+    if patient_ids is not None:
+        query = query.where(Patient.id.in_(list(patient_ids)))
+    return query
+
+
+def log_inactivity_alerts(created: List[Tuple[Patient, datetime, str]], now: datetime) -> None:
+    """Log alerts created by alert_inactive_patients (after commit)"""
+    for patient, last_activity, severity in created:
+        inactive_hours = (now - last_activity).total_seconds() / 3600
+        logger.warning(
+            f"Created {severity} inactivity alert for patient {patient.display_name} "
+            f"({patient.id}): {inactive_hours:.1f} hours inactive"
+        )
+
+        # For critical alerts, log emergency contact info
+        if severity == "critical" and patient.emergency_contact_name:
+            logger.critical(
+                f"CRITICAL: Patient {patient.display_name} inactive for {inactive_hours:.1f} hours. "
+                f"Emergency contact: {patient.emergency_contact_name} "
+                f"({patient.emergency_contact_phone})"
+            )
+
 
 def detect_patient_inactivity():
     """
-    Check for inactive patients and create alerts
+    Check all active patients for inactivity and create alerts
 
-    Checks all active patients for recent heartbeat activity.
-    Creates alerts based on inactivity duration:
+    Full scan of all patients in one query:
     - 2 hours: Warning alert
     - 4 hours: High severity alert
     - 6 hours: Critical alert (escalate to emergency contact)
 
-    Only creates one alert per patient per threshold to avoid spam.
+    Routine detection is event-driven (see app.jobs.inactivity_timer); this
+    is kept for manual runs and ad-hoc checks.
     """
-    db = SessionLocal()
+    # Patients are still read for logging after the commit
+    db = SessionLocal(expire_on_commit=False)
 
     try:
         logger.info("Starting inactivity detection job")
 
         now = datetime.utcnow()
-
-        # Define inactivity thresholds
-        warning_threshold = now - timedelta(hours=INACTIVITY_WARNING_HOURS)
-        high_threshold = now - timedelta(hours=INACTIVITY_HIGH_HOURS)
-        critical_threshold = now - timedelta(hours=INACTIVITY_CRITICAL_HOURS)
-
-        # Get all active patients
-        active_patients = db.query(Patient).filter(
-            Patient.is_active == True
-        ).all()
-
-        alerts_created = 0
-        patients_checked = 0
-
-        for patient in active_patients:
-            try:
-                patients_checked += 1
-
-                # Get last activity (prefer last_heartbeat_at, fallback to last_active_at)
-                last_activity = patient.last_heartbeat_at or patient.last_active_at
-
-                # Skip if no activity recorded yet (new patient)
-                if not last_activity:
-                    logger.debug(f"Patient {patient.id} has no activity recorded yet, skipping")
-                    continue
-
-                # Check inactivity duration
-                inactive_duration = now - last_activity
-                inactive_hours = inactive_duration.total_seconds() / 3600
-
-                # Determine severity based on duration
-                severity = None
-                alert_type = "inactivity"
-                message = None
-
-                if last_activity <= critical_threshold:
-                    severity = "critical"
-                    message = (
-                        f"{patient.display_name} has been inactive for {inactive_hours:.1f} hours. "
-                        f"Last activity: {last_activity.strftime('%Y-%m-%d %H:%M:%S UTC')}. "
-                        f"This requires immediate attention."
-                    )
-                elif last_activity <= high_threshold:
-                    severity = "high"
-                    message = (
-                        f"{patient.display_name} has been inactive for {inactive_hours:.1f} hours. "
-                        f"Last activity: {last_activity.strftime('%Y-%m-%d %H:%M:%S UTC')}. "
-                        f"Please check on the patient."
-                    )
-                elif last_activity <= warning_threshold:
-                    severity = "medium"
-                    message = (
-                        f"{patient.display_name} has been inactive for {inactive_hours:.1f} hours. "
-                        f"Last activity: {last_activity.strftime('%Y-%m-%d %H:%M:%S UTC')}."
-                    )
-
-                # If patient is inactive, check if alert already exists
-                if severity:
-                    # Check for existing unacknowledged inactivity alert
-                    existing_alert = db.query(Alert).filter(
-                        and_(
-                            Alert.patient_id == patient.id,
-                            Alert.alert_type == "inactivity",
-                            Alert.severity == severity,
-                            Alert.acknowledged_at.is_(None),  # Only check unacknowledged
-                            Alert.created_at >= now - timedelta(hours=24)  # Within last 24 hours
-                        )
-                    ).first()
-
-                    if existing_alert:
-                        logger.debug(
-                            f"Inactivity alert already exists for patient {patient.id} "
-                            f"at severity {severity}"
-                        )
-                        continue
-
-                    # Create recommended action
-                    recommended_action = "Please check on the patient"
-                    if severity == "critical" and patient.emergency_contact_name:
-                        recommended_action = (
-                            f"URGENT: Contact {patient.emergency_contact_name} "
-                            f"at {patient.emergency_contact_phone} immediately."
-                        )
-                    elif severity == "high":
-                        recommended_action = "Please call the patient or visit them soon."
-
-                    # Create new alert
-                    new_alert = Alert(
-                        patient_id=patient.id,
-                        alert_type=alert_type,
-                        severity=severity,
-                        title=f"Patient Inactivity: {patient.display_name}",
-                        description=message,
-                        recommended_action=recommended_action,
-                        triggered_by="inactivity_detector"
-                    )
-
-                    db.add(new_alert)
-                    alerts_created += 1
-
-                    logger.warning(
-                        f"Created {severity} inactivity alert for patient {patient.display_name} "
-                        f"({patient.id}): {inactive_hours:.1f} hours inactive"
-                    )
-
-                    # For critical alerts, log emergency contact info
-                    if severity == "critical" and patient.emergency_contact_name:
-                        logger.critical(
-                            f"CRITICAL: Patient {patient.display_name} inactive for {inactive_hours:.1f} hours. "
-                            f"Emergency contact: {patient.emergency_contact_name} "
-                            f"({patient.emergency_contact_phone})"
-                        )
-
-            except Exception as e:
-                logger.error(
-                    f"Error checking inactivity for patient {patient.id}: {e}",
-                    exc_info=True
-                )
-                continue
-
-        # Commit all new alerts
+        created = alert_inactive_patients(db, now)
         db.commit()
 
-        logger.info(
-            f"Inactivity detection completed: "
-            f"Checked {patients_checked} patients, created {alerts_created} alerts"
-        )
+        log_inactivity_alerts(created, now)
+        logger.info(f"Inactivity detection completed: created {len(created)} alerts")
 
     except Exception as e:
         logger.error(f"Error in inactivity detection job: {e}", exc_info=True)
@@ -188,12 +222,7 @@ def update_patient_heartbeat_timestamp(patient_id: str, db: Session):
         patient = db.query(Patient).filter(Patient.id == patient_id).first()
         if patient:
             # Get the most recent heartbeat
-            latest_heartbeat = db.query(ActivityLog).filter(
-                and_(
-                    ActivityLog.patient_id == patient_id,
-                    ActivityLog.activity_type == "heartbeat"
-                )
-            ).order_by(ActivityLog.logged_at.desc()).first()
+            latest_heartbeat = db.execute(latest_heartbeat_query(patient_id)).scalars().first()
 
             if latest_heartbeat:
                 patient.last_heartbeat_at = latest_heartbeat.logged_at
@@ -207,50 +236,49 @@ def update_patient_heartbeat_timestamp(patient_id: str, db: Session):
         db.rollback()
 
 
+def latest_heartbeat_query(patient_id: Any) -> Select:
+    """Most recent heartbeat of a patient"""
+    return (
+        select(ActivityLog)
+        .where(
+            ActivityLog.patient_id == patient_id,
+            ActivityLog.activity_type == "heartbeat"
+        )
+        .order_by(ActivityLog.logged_at.desc())
+        .limit(1)
+    )
+
+
 def get_inactivity_statistics():
     """
     Get statistics about patient inactivity
 
+    Counts active patients per inactivity bucket with one GROUP BY query.
+
     Returns:
         dict: Statistics about inactive patients
     """
     db = SessionLocal()
 
     try:
-        now = datetime.utcnow()
-        warning_threshold = now - timedelta(hours=INACTIVITY_WARNING_HOURS)
-        high_threshold = now - timedelta(hours=INACTIVITY_HIGH_HOURS)
-        critical_threshold = now - timedelta(hours=INACTIVITY_CRITICAL_HOURS)
-
-        # Get all active patients
-        active_patients = db.query(Patient).filter(
-            Patient.is_active == True
-        ).all()
-
-        stats = {
-            "total_patients": len(active_patients),
-            "active": 0,
-            "warning": 0,
-            "high": 0,
-            "critical": 0,
-            "no_activity": 0
-        }
+        bucket = _inactivity_bucket(datetime.utcnow()).label("bucket")
+
+        counts = dict(
+            db.execute(
+                select(bucket, func.count())
+                .where(Patient.is_active == True)
+                .group_by(bucket)
+            ).all()
+        )
 
-        for patient in active_patients:
-            last_activity = patient.last_heartbeat_at or patient.last_active_at
-
-            if not last_activity:
-                stats["no_activity"] += 1
-            elif last_activity <= critical_threshold:
-                stats["critical"] += 1
-            elif last_activity <= high_threshold:
-                stats["high"] += 1
-            elif last_activity <= warning_threshold:
-                stats["warning"] += 1
-            else:
-                stats["active"] += 1
-
-        return stats
+        return {
+            "total_patients": sum(counts.values()),
+            "active": counts.get("active", 0),
+            "warning": counts.get("medium", 0),
+            "high": counts.get("high", 0),
+            "critical": counts.get("critical", 0),
+            "no_activity": counts.get("no_activity", 0)
+        }
 
     except Exception as e:
         logger.error(f"Error getting inactivity statistics: {e}")
@@ -0,0 +1,274 @@
+"""
+Inactivity Timer
+Event-driven inactivity detection with a per-patient deadline timer wheel
+
+Every patient with recorded activity has one armed deadline: the next
+inactivity threshold (2h, 4h, 6h after their last activity). Heartbeats
+re-arm the deadline, which moves the patient to a new wheel slot in O(1), so
+nothing scans all patients. When a slot's time is reached its patients are
+checked against the database in one query (alert_inactive_patients) and
+re-armed at their next threshold.
+
+The wheel is rebuilt from the database when the app starts. Patients whose
+threshold passed while the app was down fire on the first tick; existing
+unacknowledged alerts are not duplicated. Firing re-reads last activity from
+the database, so a heartbeat handled by another worker process only delays
+the check instead of producing a false alert.
+"""
+
+import logging
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+
+from app.database.session import SessionLocal
+from app.jobs.inactivity_detector import (
+    INACTIVITY_CRITICAL_HOURS,
+    INACTIVITY_HIGH_HOURS,
+    INACTIVITY_WARNING_HOURS,
+    alert_inactive_patients,
+    last_activity_column,
+    log_inactivity_alerts
+)
+from app.models.patient import Patient
+
+logger = logging.getLogger(__name__)
+
+THRESHOLDS = [
+    timedelta(hours=INACTIVITY_WARNING_HOURS),
+    timedelta(hours=INACTIVITY_HIGH_HOURS),
+    timedelta(hours=INACTIVITY_CRITICAL_HOURS),
+]
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def next_deadline(last_activity: datetime, after: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Get the first inactivity threshold of a patient after a moment
+
+    Args:
+        last_activity: Patient's last activity (naive UTC)
+        after: Only thresholds strictly after this time (default: the first threshold)
+
+    Returns:
+        Deadline (naive UTC), or None once the critical threshold has passed
+    """
+    for threshold in THRESHOLDS:
+        deadline = last_activity + threshold
+        if after is None or deadline > after:
+            return deadline
+    return None
+
+
+class InactivityTimerWheel:
+    """
+    Hashed timer wheel of inactivity deadlines keyed by patient
+
+    Slots are absolute tick numbers (deadline / tick_seconds, rounded up), so
+    deadlines any distance ahead share one level and re-arming is a set move.
+
+    Usage:
+        inactivity_timer.touch(patient_id, last_activity)
+    """
+
+    def __init__(self, tick_seconds: float = 1.0):
+        """Initialize an empty wheel (the tick thread is started by start())"""
+        self.tick_seconds = tick_seconds
+
+        self._slots: Dict[int, Set[str]] = {}
+        self._armed: Dict[str, int] = {}
+        self._cursor: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"rearmed": 0, "fired": 0, "alerts_created": 0, "rebuilt": 0}
+
+    def touch(self, patient_id: Any, last_activity: Optional[datetime]) -> None:
+        """
+        Re-arm a patient's deadline after activity
+
+        Args:
+            patient_id: Patient UUID
+            last_activity: Patient's last activity (naive UTC)
+        """
+        if last_activity is None:
+            return
+
+        with self._lock:
+            self._arm(str(patient_id), next_deadline(last_activity))
+            self._stats["rearmed"] += 1
+
+    def rebuild(self) -> int:
+        """
+        Arm every active patient from the database
+
+        Returns:
+            Number of patients armed
+        """
+        last_activity = last_activity_column()
+
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Patient.id, last_activity).where(
+                    Patient.is_active == True,
+                    last_activity.isnot(None)
+                )
+            ).all()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._slots.clear()
+            self._armed.clear()
+            for patient_id, patient_last_activity in rows:
+                self._arm(str(patient_id), next_deadline(patient_last_activity))
+            self._stats["rebuilt"] += 1
+
+        logger.info(f"Inactivity timer rebuilt with {len(rows)} patients")
+        return len(rows)
+
+    def advance(self, now: Optional[datetime] = None) -> int:
+        """
+        Fire all deadlines up to now
+
+        Args:
+            now: Current time (naive UTC, default utcnow)
+
+        Returns:
+            Number of patients checked
+        """
+        now = now or datetime.utcnow()
+        current = self._tick(now, math.floor)
+
+        with self._lock:
+            if self._cursor is None or current - self._cursor > len(self._slots):
+                # First tick (slots may be in the past) or after a long pause
+                slots = [slot for slot in self._slots if slot <= current]
+            else:
+                slots = [slot for slot in range(self._cursor + 1, current + 1) if slot in self._slots]
+
+            due: List[str] = []
+            for slot in slots:
+                for patient_id in self._slots.pop(slot):
+                    del self._armed[patient_id]
+                    due.append(patient_id)
+            self._cursor = current
+
+        if due:
+            self._fire(due, now)
+        return len(due)
+
+    def start(self) -> None:
+        """Rebuild from the database and start the tick thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="inactivity-timer", daemon=True)
+            self._thread.start()
+            logger.info(f"Inactivity timer started (tick {self.tick_seconds}s)")
+
+    def stop(self) -> None:
+        """Stop the tick thread"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            logger.info("Inactivity timer stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters and the number of armed patients"""
+        with self._lock:
+            next_slot = min(self._slots) if self._slots else None
+            return {
+                **self._stats,
+                "armed_patients": len(self._armed),
+                "next_deadline": str(EPOCH + timedelta(seconds=next_slot * self.tick_seconds)) if next_slot is not None else None,
+                "running": self._thread is not None
+            }
+
+    def _arm(self, patient_id: str, deadline: Optional[datetime]) -> None:
+        """Move a patient to the slot of a deadline, or disarm it (lock held)"""
+        old_slot = self._armed.pop(patient_id, None)
+        if old_slot is not None:
+            patients = self._slots[old_slot]
+            patients.discard(patient_id)
+            if not patients:
+                del self._slots[old_slot]
+
+        if deadline is None:
+            return
+
+        slot = self._tick(deadline, math.ceil)
+        if self._cursor is not None and slot <= self._cursor:
+            # Already due - fire on the next tick
+            slot = self._cursor + 1
+
+        self._slots.setdefault(slot, set()).add(patient_id)
+        self._armed[patient_id] = slot
+
+    def _tick(self, moment: datetime, rounding) -> int:
+        """Tick number of a moment"""
+        return int(rounding((moment - EPOCH).total_seconds() / self.tick_seconds))
+
+    def _fire(self, patient_ids: Iterable[str], now: datetime) -> None:
+        """Create alerts for due patients and re-arm them at their next threshold"""
+        patient_ids = list(patient_ids)
+        last_activity = last_activity_column()
+
+        # Patients are still read for logging after the commit
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            created = alert_inactive_patients(db, now, patient_ids)
+            db.commit()
+
+            # Re-read last activity (it may have moved on in another process)
+            current = db.execute(
+                select(Patient.id, last_activity).where(
+                    Patient.id.in_(patient_ids),
+                    Patient.is_active == True,
+                    last_activity.isnot(None)
+                )
+            ).all()
+        except Exception as e:
+            logger.error(f"Error checking {len(patient_ids)} inactivity deadlines: {e}", exc_info=True)
+            db.rollback()
+            # Retry in a minute
+            with self._lock:
+                for patient_id in patient_ids:
+                    if patient_id not in self._armed:
+                        self._arm(patient_id, now + timedelta(minutes=1))
+            return
+        finally:
+            db.close()
+
+        log_inactivity_alerts(created, now)
+
+        with self._lock:
+            for patient_id, patient_last_activity in current:
+                patient_id = str(patient_id)
+                # A heartbeat re-armed it while the check was running
+                if patient_id not in self._armed:
+                    self._arm(patient_id, next_deadline(patient_last_activity, after=now))
+            self._stats["fired"] += len(patient_ids)
+            self._stats["alerts_created"] += len(created)
+
+    def _run(self) -> None:
+        """Rebuild, then advance the wheel once per tick"""
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.error(f"Error rebuilding inactivity timer: {e}", exc_info=True)
+
+        while not self._stop.wait(self.tick_seconds):
+            try:
+                self.advance()
+            except Exception as e:
+                logger.error(f"Error advancing inactivity timer: {e}", exc_info=True)
+
+
+# Global instance
+inactivity_timer = InactivityTimerWheel()
@@ -0,0 +1,264 @@
+"""
+Background job for the daily report metrics rollup
+Maintains patient_daily_metrics so reports read one precomputed row per day
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+from uuid import UUID, uuid4
+
+from sqlalchemy import Connection, delete, event, insert, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.activity_log import ActivityLog
+from app.models.conversation import Conversation
+from app.models.patient_daily_metrics import PatientDailyMetrics
+from app.models.reminder import Reminder
+from app.models.schedule import Schedule
+from app.models.stale_daily_metrics import StaleDailyMetrics
+from app.services.report_cache import bump_data_version
+from app.services.reports import (
+    activity_daily_query,
+    get_rollup_watermark,
+    medication_daily_query,
+    mood_daily_query
+)
+
+logger = logging.getLogger(__name__)
+
+# Timestamp that decides the rollup day of each source row
+ROLLUP_DAY_ATTRIBUTES = {
+    Reminder: "due_at",
+    Conversation: "created_at",
+    ActivityLog: "logged_at",
+}
+
+# Rollup columns filled from each section's daily query (in query column order)
+SECTION_COLUMNS = [
+    (medication_daily_query, ["reminders_total", "reminders_completed"]),
+    (activity_daily_query, ["interactions", "activity_minutes"]),
+    (mood_daily_query, ["conversations", "sentiment_score_sum", "positive_conversations", "negative_conversations"]),
+]
+
+
+def rollup_daily_metrics(
+    db: Union[Session, Connection],
+    first_day: Optional[date],
+    last_day: date,
+    patient_ids: Optional[List[UUID]] = None
+) -> None:
+    """
+    Recompute patient_daily_metrics rows for a range of days (without committing)
+
+    Deletes the rows in the range and re-inserts them with one
+    INSERT ... SELECT ... GROUP BY per report section.
+
+    Args:
+        db: Database session (or connection)
+        first_day: First day to recompute (None = all history)
+        last_day: Last day to recompute (inclusive)
+        patient_ids: Only recompute these patients (default: all patients)
+    """
+    start_dt = datetime.combine(first_day, datetime.min.time()) if first_day else None
+    end_dt = datetime.combine(last_day, datetime.max.time())
+
+    stale = delete(PatientDailyMetrics).where(PatientDailyMetrics.day <= last_day)
+    if first_day is not None:
+        stale = stale.where(PatientDailyMetrics.day >= first_day)
+    if patient_ids is not None:
+        stale = stale.where(PatientDailyMetrics.patient_id.in_(patient_ids))
+    db.execute(stale)
+
+    for daily_query, columns in SECTION_COLUMNS:
+        statement = pg_insert(PatientDailyMetrics).from_select(
+            ["patient_id", "day", *columns],
+            daily_query(start_dt, end_dt, patient_ids).order_by(None)
+        )
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[PatientDailyMetrics.patient_id, PatientDailyMetrics.day],
+            set_={
+                **{column: statement.excluded[column] for column in columns},
+                "computed_at": datetime.utcnow()
+            }
+        ))
+
+
+def mark_days_stale(db: Union[Session, Connection], first_days: Dict[UUID, Optional[date]]) -> None:
+    """
+    Record patients' rolled-up days that late writes made stale (without committing)
+
+    Called when data for past days is written: activity replayed by a device
+    that was offline, a reminder acknowledged or marked missed after
+    midnight, a conversation analysed after the rollup ran. The days are
+    recomputed by refresh_stale_daily_metrics shortly after, off the
+    writer's transaction. Today is never rolled up, so same-day writes
+    (almost all) record nothing.
+
+    Args:
+        db: Database session (or its connection, during a flush)
+        first_days: Patient UUID -> earliest day that changed (None = all history)
+    """
+    today = datetime.utcnow().date()
+    stale = [
+        {"patient_id": patient_id, "first_day": day, "created_at": datetime.utcnow()}
+        for patient_id, day in first_days.items()
+        if day is None or day < today
+    ]
+    if stale:
+        db.execute(insert(StaleDailyMetrics), [{"id": uuid4(), **row} for row in stale])
+
+
+def _changed_days(instance, attribute: str) -> List[date]:
+    """Days of a flushed row's timestamp, before and after the flush"""
+    history = inspect(instance).attrs[attribute].history
+    return [value.date() for value in (*history.deleted, getattr(instance, attribute)) if value is not None]
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_flushed_days(session: Session, flush_context) -> None:
+    """Mark rolled-up days of report data written through the ORM as stale"""
+    first_days: Dict[UUID, Optional[date]] = {}
+
+    def changed(patient_id: Optional[UUID], day: Optional[date]) -> None:
+        if patient_id is None:
+            return
+        if patient_id not in first_days:
+            first_days[patient_id] = day
+        elif first_days[patient_id] is not None:
+            first_days[patient_id] = None if day is None else min(first_days[patient_id], day)
+
+    modified = [instance for instance in session.dirty if session.is_modified(instance, include_collections=False)]
+    for instance in (*session.new, *session.deleted, *modified):
+        if isinstance(instance, Schedule):
+            # Its type decides which reminders count as medication, on any day
+            # (a new schedule has no reminders yet)
+            if instance in session.deleted or (
+                instance not in session.new and inspect(instance).attrs.type.history.has_changes()
+            ):
+                changed(instance.patient_id, None)
+            continue
+
+        attribute = ROLLUP_DAY_ATTRIBUTES.get(type(instance))
+        if attribute is not None:
+            for day in _changed_days(instance, attribute):
+                changed(instance.patient_id, day)
+
+    if first_days:
+        # Plain SQL on the flush's connection (the session is mid-flush)
+        mark_days_stale(session.connection(), first_days)
+
+
+def _rolled_up_days(db: Session, first_day: date, last_day: date) -> Dict[Tuple[UUID, date], tuple]:
+    """Rollup values per (patient_id, day) for a range of days"""
+    columns = [getattr(PatientDailyMetrics, column) for _, section_columns in SECTION_COLUMNS for column in section_columns]
+    rows = db.execute(
+        select(PatientDailyMetrics.patient_id, PatientDailyMetrics.day, *columns)
+        .where(PatientDailyMetrics.day >= first_day, PatientDailyMetrics.day <= last_day)
+    ).all()
+    return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+
+def compact_daily_metrics():
+    """
+    Roll up completed days into patient_daily_metrics
+
+    Recomputes the last ROLLUP_RECOMPUTE_DAYS days before today (so late
+    writes such as reminder acknowledgements after midnight are picked up),
+    extended back to the current watermark if the job has not run for a
+    while. The first run backfills all history.
+
+    Patients whose already rolled-up days change get their data_version
+    bumped, so reports cached from the old rows are not served again.
+    """
+    db = SessionLocal()
+
+    try:
+        logger.info("Starting daily metrics rollup job")
+
+        yesterday = datetime.utcnow().date() - timedelta(days=1)
+        rollup_through = get_rollup_watermark(db)
+
+        if rollup_through is None:
+            first_day = None
+        else:
+            first_day = min(
+                rollup_through + timedelta(days=1),
+                yesterday - timedelta(days=settings.ROLLUP_RECOMPUTE_DAYS - 1)
+            )
+
+        # Days after the old watermark were served live, so only earlier days can go stale
+        before = _rolled_up_days(db, first_day, rollup_through) if rollup_through is not None else {}
+
+        rollup_daily_metrics(db, first_day, yesterday)
+
+        if before:
+            after = _rolled_up_days(db, first_day, rollup_through)
+            changed = {patient_id for (patient_id, _), _ in before.items() ^ after.items()}
+            bump_data_version(db, changed)
+            if changed:
+                logger.info(f"Daily metrics rollup changed rolled-up days of {len(changed)} patients")
+
+        db.commit()
+
+        logger.info(
+            f"Daily metrics rollup completed for {first_day or 'all history'} through {yesterday}"
+        )
+
+    except Exception as e:
+        logger.error(f"Error in daily metrics rollup job: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def refresh_stale_daily_metrics():
+    """
+    Recompute rolled-up days recorded as stale by late writes (see mark_days_stale)
+
+    Each patient is recomputed once, from their earliest stale day through
+    the rollup watermark; later days are computed live. Their data_version
+    is bumped, so reports cached from the old rows are not served again.
+    """
+    db = SessionLocal()
+
+    try:
+        marks = db.execute(select(StaleDailyMetrics.id, StaleDailyMetrics.patient_id, StaleDailyMetrics.first_day)).all()
+        if not marks:
+            return
+
+        first_days: Dict[UUID, Optional[date]] = {}
+        for _, patient_id, day in marks:
+            if patient_id not in first_days:
+                first_days[patient_id] = day
+            elif first_days[patient_id] is not None:
+                first_days[patient_id] = None if day is None else min(first_days[patient_id], day)
+
+        rollup_through = get_rollup_watermark(db)
+        stale = {
+            patient_id: day for patient_id, day in first_days.items()
+            if rollup_through is not None and (day is None or day <= rollup_through)
+        }
+
+        # Patients sharing a first day are recomputed together
+        patients_by_day: Dict[Optional[date], List[UUID]] = {}
+        for patient_id, day in stale.items():
+            patients_by_day.setdefault(day, []).append(patient_id)
+        for first_day, patient_ids in patients_by_day.items():
+            rollup_daily_metrics(db, first_day, rollup_through, patient_ids)
+
+        bump_data_version(db, stale)
+        db.execute(delete(StaleDailyMetrics).where(StaleDailyMetrics.id.in_([mark_id for mark_id, _, _ in marks])))
+        db.commit()
+
+        if stale:
+            logger.info(f"Refreshed stale rolled-up days of {len(stale)} patients")
+
+    except Exception as e:
+        logger.error(f"Error in stale daily metrics refresh job: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
@@ -4,16 +4,21 @@ Runs every minute to check for upcoming scheduled items
 """
 
 import logging
-import asyncio
-from datetime import datetime, timedelta, time as datetime_time
-from sqlalchemy.orm import Session
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Set, Tuple
+from sqlalchemy import Select, Update, insert, select, update
+from sqlalchemy.orm import Session, joinedload
 
 from app.database.session import SessionLocal
 from app.models.schedule import Schedule
 from app.models.reminder import Reminder
 from app.models.patient import Patient
 from app.models.alert import Alert
-from app.services.communication.firebase_service import firebase_service
+from app.jobs.metrics_rollup import mark_days_stale
+from app.services.communication.notification_dispatcher import notification_dispatcher
+from app.services.recurrence import local_day, next_reminder_at, to_local
+from app.services.report_cache import bump_data_version
 
 logger = logging.getLogger(__name__)
 
@@ -22,205 +27,315 @@ def generate_reminders_from_schedules():
     """
     Generate reminders for upcoming scheduled items
 
-    Checks all active schedules and creates reminders for items due within the next hour
+    Creates reminders for active schedules whose next reminder time
+    (Schedule.next_reminder_at, UTC) falls within the next hour. Fire times are
+    computed in each patient's timezone by app.services.recurrence. Work per
+    tick is proportional to the number of due schedules, not the total:
+    1. Indexed range scan for due schedules, joined with their patients
+    2. One query for reminders already created on the same local days
+    3. One bulk insert for the new reminders
+    4. One bulk update advancing next_reminder_at
     """
-    db = SessionLocal()
+    # Rows are still read after commit to send notifications
+    db = SessionLocal(expire_on_commit=False)
 
     try:
         logger.info("Starting reminder generation job")
 
-        # Get current time
-        now = datetime.now()
-        current_time = now.time()
-        current_weekday = now.weekday()  # 0 = Monday, 6 = Sunday
-
-        # Look ahead window (1 hour)
-        look_ahead_window = now + timedelta(hours=1)
-
-        # Get all active schedules
-        active_schedules = db.query(Schedule).filter(
-            Schedule.is_active == True
-        ).all()
-
-        reminders_created = 0
-
-        for schedule in active_schedules:
-            try:
-                # Check if schedule applies today
-                if not _schedule_applies_today(schedule, current_weekday):
-                    continue
-
-                # Calculate when reminder should be sent
-                scheduled_datetime = _combine_date_and_time(now.date(), schedule.scheduled_time)
-                reminder_datetime = scheduled_datetime - timedelta(minutes=schedule.reminder_advance_minutes)
-
-                # Check if reminder should be created (within the next hour)
-                if now <= reminder_datetime <= look_ahead_window:
-                    # Check if reminder already exists for this schedule today
-                    existing_reminder = db.query(Reminder).filter(
-                        Reminder.schedule_id == schedule.id,
-                        Reminder.due_at >= now.replace(hour=0, minute=0, second=0, microsecond=0),
-                        Reminder.due_at < now.replace(hour=23, minute=59, second=59, microsecond=999999)
-                    ).first()
-
-                    if not existing_reminder:
-                        # Create new reminder
-                        new_reminder = Reminder(
-                            patient_id=schedule.patient_id,
-                            schedule_id=schedule.id,
-                            title=schedule.title,
-                            description=schedule.description,
-                            due_at=reminder_datetime
-                        )
-
-                        db.add(new_reminder)
-                        db.flush()  # Flush to get the reminder ID
-                        reminders_created += 1
-
-                        logger.info(
-                            f"Created reminder for patient {schedule.patient_id}: "
-                            f"{schedule.title} at {reminder_datetime}"
-                        )
-
-                        # Send push notification if patient has device token
-                        patient = db.query(Patient).filter(Patient.id == schedule.patient_id).first()
-                        if patient and patient.device_token:
-                            _send_reminder_notification(
-                                patient=patient,
-                                reminder=new_reminder,
-                                schedule=schedule
-                            )
-
-            except Exception as e:
-                logger.error(f"Error processing schedule {schedule.id}: {str(e)}", exc_info=True)
-                continue
-
-        # Commit all reminders
+        now = datetime.utcnow()  # Use UTC to match database timestamps
+        _initialize_next_reminder_times(db, now)
+        reminders = _create_due_reminders(db, now)
         db.commit()
 
-        logger.info(f"Reminder generation job complete. Created {reminders_created} reminders")
+        logger.info(f"Reminder generation job complete. Created {len(reminders)} reminders")
 
     except Exception as e:
         logger.error(f"Error in reminder generation job: {str(e)}", exc_info=True)
         db.rollback()
+        return
 
     finally:
         db.close()
 
+    # Notify after commit so devices never get a reminder that was not saved
+    notification_dispatcher.send_reminders([
+        _reminder_notification(patient, reminder, schedule)
+        for patient, reminder, schedule in reminders
+        if patient.device_token
+    ])
 
-def check_and_mark_missed_reminders():
+
+def _initialize_next_reminder_times(db: Session, now: datetime) -> int:
     """
-    Check for reminders that are past due and mark them as missed
+    Set next_reminder_at for active schedules that do not have one yet
+
+    Covers schedules created before the column existed or inserted directly
+    (seeds, scripts). Uses the next_reminder_at index, so it is cheap once
+    every schedule is initialized.
+
+    Returns:
+        Number of schedules initialized
     """
-    db = SessionLocal()
+    schedules = db.execute(
+        select(Schedule, Patient.timezone)
+        .join(Patient, Patient.id == Schedule.patient_id)
+        .where(
+            Schedule.is_active == True,
+            Schedule.next_reminder_at.is_(None)
+        )
+    ).all()
 
-    try:
-        logger.info("Checking for missed reminders")
+    updates = [
+        {"id": schedule.id, "next_reminder_at": next_reminder_at(schedule, now, timezone_name)}
+        for schedule, timezone_name in schedules
+    ]
+    updates = [update for update in updates if update["next_reminder_at"] is not None]
 
-        now = datetime.utcnow()  # Use UTC to match database timestamps
+    if updates:
+        db.execute(update(Schedule), updates)
+        logger.info(f"Initialized next reminder time for {len(updates)} schedules")
 
-        # Get pending reminders that are past due (more than 30 minutes late)
-        late_threshold = now - timedelta(minutes=30)
+    return len(updates)
 
-        missed_reminders = db.query(Reminder).filter(
-            Reminder.status == "pending",
-            Reminder.due_at < late_threshold
-        ).all()
 
-        missed_count = 0
+def _create_due_reminders(db: Session, now: datetime) -> List[Tuple[Patient, Reminder, Schedule]]:
+    """
+    Insert reminders for schedules due within the next hour and advance them
 
-        for reminder in missed_reminders:
-            reminder.status = "missed"
-            missed_count += 1
-            logger.warning(f"Marked reminder {reminder.id} as missed for patient {reminder.patient_id}")
+    Args:
+        db: Database session (caller commits)
+        now: Current time (naive UTC)
 
-        db.commit()
+    Returns:
+        (patient, reminder, schedule) for each reminder created
+    """
+    look_ahead_window = now + timedelta(hours=1)
+
+    due_schedules = db.execute(
+        select(Schedule, Patient)
+        .join(Patient, Patient.id == Schedule.patient_id)
+        .where(
+            Schedule.is_active == True,
+            Schedule.next_reminder_at <= look_ahead_window
+        )
+    ).all()
+
+    if not due_schedules:
+        return []
+
+    reminded_days = _reminded_local_days(db, due_schedules)
+
+    created = []
+    advances = []
+    for schedule, patient in due_schedules:
+        reminder_datetime = schedule.next_reminder_at
+        reminder_day = local_day(reminder_datetime, patient.timezone)
+
+        # Occurrences that passed while the job was not running are skipped, and
+        # a schedule edited after today's reminder was created is not reminded twice
+        if reminder_datetime >= now and (schedule.id, reminder_day) not in reminded_days:
+            reminder = Reminder(
+                id=uuid.uuid4(),
+                patient_id=schedule.patient_id,
+                schedule_id=schedule.id,
+                title=schedule.title,
+                message=schedule.description,  # Reminder has no description column
+                due_at=reminder_datetime,
+                retry_count=0
+            )
+            created.append((patient, reminder, schedule))
 
-        logger.info(f"Marked {missed_count} reminders as missed")
+            logger.info(
+                f"Created reminder for patient {schedule.patient_id}: "
+                f"{schedule.title} at {reminder_datetime}"
+            )
 
-    except Exception as e:
-        logger.error(f"Error checking missed reminders: {str(e)}", exc_info=True)
-        db.rollback()
+        advances.append({
+            "id": schedule.id,
+            "next_reminder_at": next_reminder_at(
+                schedule,
+                max(now, reminder_datetime + timedelta(minutes=1)),
+                patient.timezone
+            )
+        })
 
-    finally:
-        db.close()
+    if created:
+        db.execute(insert(Reminder), [
+            {
+                "id": reminder.id,
+                "patient_id": reminder.patient_id,
+                "schedule_id": reminder.schedule_id,
+                "title": reminder.title,
+                "message": reminder.message,
+                "due_at": reminder.due_at
+            }
+            for _, reminder, _ in created
+        ])
+        bump_data_version(db, (reminder.patient_id for _, reminder, _ in created))
 
+    db.execute(update(Schedule), advances)
 
-def _schedule_applies_today(schedule: Schedule, current_weekday: int) -> bool:
+    return created
+
+
+def _reminded_local_days(db: Session, due_schedules) -> Set[Tuple[uuid.UUID, date]]:
     """
-    Check if a schedule applies to the current day
+    Get (schedule_id, patient-local day) for reminders already created around the due times
 
     Args:
-        schedule: Schedule object
-        current_weekday: Current day of week (0 = Monday, 6 = Sunday)
+        db: Database session
+        due_schedules: (schedule, patient) rows from the due query
 
     Returns:
-        bool: True if schedule applies today
+        Set of (schedule_id, local day) pairs
+    """
+    timezones = {schedule.id: patient.timezone for schedule, patient in due_schedules}
+    due_times = [schedule.next_reminder_at for schedule, _ in due_schedules]
+
+    existing = db.execute(reminded_query(list(timezones), min(due_times), max(due_times))).all()
+
+    return {
+        (schedule_id, local_day(due_at, timezones[schedule_id]))
+        for schedule_id, due_at in existing
+    }
+
+
+def reminded_query(schedule_ids: List[uuid.UUID], first_due: datetime, last_due: datetime) -> Select:
+    """
+    Reminders of the given schedules around a span of due times
+
+    A local day spans at most +/-14h around UTC, so one day either side is enough.
+
+    Columns: schedule_id, due_at
+    """
+    return select(Reminder.schedule_id, Reminder.due_at).where(
+        Reminder.schedule_id.in_(schedule_ids),
+        Reminder.due_at >= first_due - timedelta(days=1),
+        Reminder.due_at < last_due + timedelta(days=1)
+    )
+
+
+def missed_reminders_update(now: datetime) -> Update:
+    """
+    Mark pending reminders more than 30 minutes late as missed
+
+    Returns: id, patient_id, due_at of each reminder marked
+    """
+    return (
+        update(Reminder)
+        .where(
+            Reminder.status == "pending",
+            Reminder.due_at < now - timedelta(minutes=30)
+        )
+        .values(status="missed")
+        .returning(Reminder.id, Reminder.patient_id, Reminder.due_at)
+    )
+
+
+def exhausted_reminders_update(now: datetime) -> Update:
+    """
+    Mark unacknowledged reminders that used up their retries as missed
+
+    Returns: id, patient_id, due_at of each reminder marked
+    """
+    return (
+        update(Reminder)
+        .where(*_unacknowledged(now), Reminder.retry_count >= Reminder.max_retries)
+        .values(status="missed")
+        .returning(Reminder.id, Reminder.patient_id, Reminder.due_at)
+    )
+
+
+def retried_reminders_update(now: datetime) -> Update:
     """
-    if schedule.recurrence_pattern == "daily":
-        return True
-    elif schedule.recurrence_pattern == "weekly":
-        return current_weekday in schedule.days_of_week
-    elif schedule.recurrence_pattern == "custom":
-        return current_weekday in schedule.days_of_week
+    Count one more retry for unacknowledged reminders with retries left
+
+    Returns: id, patient_id, due_at of each reminder to resend
+    """
+    return (
+        update(Reminder)
+        .where(*_unacknowledged(now), Reminder.retry_count < Reminder.max_retries)
+        .values(retry_count=Reminder.retry_count + 1)
+        .returning(Reminder.id, Reminder.patient_id, Reminder.due_at)
+    )
+
+
+def _unacknowledged(now: datetime) -> list:
+    """Conditions for pending reminders more than 15 minutes past due"""
+    return [
+        Reminder.status == "pending",
+        Reminder.due_at <= now - timedelta(minutes=15)
+    ]
+
+
+def check_and_mark_missed_reminders():
+    """
+    Check for reminders that are past due and mark them as missed
+
+    One UPDATE ... RETURNING, so nothing is loaded into the session however
+    large the backlog of late reminders is.
+    """
+    db = SessionLocal()
+
+    try:
+        logger.info("Checking for missed reminders")
+
+        now = datetime.utcnow()  # Use UTC to match database timestamps
+
+        # Pending reminders that are past due (more than 30 minutes late)
+        missed_reminders = db.execute(
+            missed_reminders_update(now),
+            execution_options={"synchronize_session": False}
+        ).all()
+
+        # Bulk UPDATE bypasses the session's flush hooks
+        bump_data_version(db, (patient_id for _, patient_id, _ in missed_reminders))
+        mark_days_stale(db, _first_due_days(missed_reminders))
+        db.commit()
 
-    return False
+        for reminder_id, patient_id, _ in missed_reminders:
+            logger.warning(f"Marked reminder {reminder_id} as missed for patient {patient_id}")
 
+        logger.info(f"Marked {len(missed_reminders)} reminders as missed")
 
-def _combine_date_and_time(date, time):
-    """Combine date and time objects into datetime"""
-    return datetime.combine(date, time)
+    except Exception as e:
+        logger.error(f"Error checking missed reminders: {str(e)}", exc_info=True)
+        db.rollback()
+
+    finally:
+        db.close()
 
 
-def _send_reminder_notification(patient: Patient, reminder: Reminder, schedule: Schedule, is_retry: bool = False):
+def _reminder_notification(patient: Patient, reminder: Reminder, schedule: Schedule, is_retry: bool = False) -> Dict[str, Any]:
     """
-    Send push notification for a reminder
+    Build the push notification for a reminder (sent by the notification dispatcher)
 
     Args:
         patient: Patient object with device_token
         reminder: Reminder object
         schedule: Schedule object
         is_retry: If True, includes voice_check_in flag for proactive check-in
-    """
-    try:
-        # Format notification message
-        speak_text = _format_reminder_message(schedule, reminder)
-
-        # Send notification using Firebase service
-        # Run async function in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        # Add voice check-in flag for retry notifications
-        extra_data = {}
-        if is_retry:
-            extra_data['voice_check_in'] = 'true'
-            extra_data['retry_count'] = str(reminder.retry_count)
-            logger.info(f"Sending retry notification with voice check-in flag (retry {reminder.retry_count})")
-
-        success = loop.run_until_complete(
-            firebase_service.send_reminder(
-                device_token=patient.device_token,
-                reminder_id=str(reminder.id),
-                speak_text=speak_text,
-                reminder_type=schedule.type,
-                title=schedule.title,
-                due_at=reminder.due_at.isoformat(),
-                scheduled_time=schedule.scheduled_time.strftime("%H:%M"),
-                requires_response=True,
-                **extra_data
-            )
-        )
 
-        loop.close()
+    Returns:
+        Keyword arguments for firebase_service.send_reminder
+    """
+    notification = {
+        "device_token": patient.device_token,
+        "reminder_id": str(reminder.id),
+        "speak_text": _format_reminder_message(schedule, reminder),
+        "reminder_type": schedule.type,
+        "title": schedule.title,
+        "due_at": reminder.due_at.isoformat(),
+        "scheduled_time": schedule.scheduled_time.strftime("%H:%M"),
+        "requires_response": True
+    }
 
-        if success:
-            logger.info(f"Push notification sent for reminder {reminder.id}")
-        else:
-            logger.warning(f"Failed to send push notification for reminder {reminder.id}")
+    # Add voice check-in flag for retry notifications
+    if is_retry:
+        notification["voice_check_in"] = "true"
+        notification["retry_count"] = str(reminder.retry_count)
 
-    except Exception as e:
-        logger.error(f"Error sending reminder notification: {e}", exc_info=True)
+    return notification
 
 
 def _format_reminder_message(schedule: Schedule, reminder: Reminder) -> str:
@@ -267,6 +382,11 @@ def retry_unacknowledged_reminders():
     - If retry_count >= max_retries:
       - Create MEDIUM alert for caregiver
       - Update reminder status to "missed"
+
+    Both transitions are single UPDATE ... RETURNING statements; patients and
+    schedules are loaded in one query for just the rows that need a push or an
+    alert. Exhausted reminders are handled first so a reminder that reaches
+    max_retries in this run gets its alert on the next run, as before.
     """
     db = SessionLocal()
 
@@ -274,90 +394,66 @@ def retry_unacknowledged_reminders():
         logger.info("Checking for unacknowledged reminders to retry")
 
         now = datetime.utcnow()  # Use UTC to match database timestamps
-        retry_threshold = now - timedelta(minutes=15)
 
-        # Get pending reminders that are past the retry threshold
-        unacknowledged_reminders = db.query(Reminder).filter(
-            Reminder.status == "pending",
-            Reminder.due_at <= retry_threshold
+        # Max retries reached - mark missed and alert the caregiver
+        exhausted_rows = db.execute(
+            exhausted_reminders_update(now),
+            execution_options={"synchronize_session": False}
         ).all()
 
-        retried_count = 0
-        alerts_created = 0
+        # Retries left - increment retry_count and resend
+        retried_rows = db.execute(
+            retried_reminders_update(now),
+            execution_options={"synchronize_session": False}
+        ).all()
 
-        for reminder in unacknowledged_reminders:
-            try:
-                # Check if reminder can be retried
-                if reminder.can_retry:
-                    # Increment retry count
-                    reminder.retry_count += 1
+        # Bulk UPDATEs bypass the session's flush hooks
+        bump_data_version(db, (patient_id for _, patient_id, _ in exhausted_rows + retried_rows))
+        mark_days_stale(db, _first_due_days(exhausted_rows + retried_rows))
 
-                    logger.info(
-                        f"Retrying reminder {reminder.id} for patient {reminder.patient_id} "
-                        f"(attempt {reminder.retry_count}/{reminder.max_retries})"
-                    )
+        exhausted_ids = [reminder_id for reminder_id, _, _ in exhausted_rows]
+        retried_ids = [reminder_id for reminder_id, _, _ in retried_rows]
 
-                    # Get patient and schedule for notification
-                    patient = db.query(Patient).filter(Patient.id == reminder.patient_id).first()
-                    schedule = db.query(Schedule).filter(Schedule.id == reminder.schedule_id).first()
-
-                    # Resend notification if patient has device token
-                    if patient and patient.device_token and schedule:
-                        _send_reminder_notification(patient, reminder, schedule, is_retry=True)
-                        retried_count += 1
-                    else:
-                        logger.warning(
-                            f"Cannot retry reminder {reminder.id}: "
-                            f"patient or schedule not found, or no device token"
-                        )
+        rows = _load_reminders_with_patient_and_schedule(db, exhausted_ids + retried_ids)
+        exhausted = set(exhausted_ids)
 
+        alerts_created = 0
+        notifications = []
+
+        for reminder in rows:
+            patient, schedule = reminder.patient, reminder.schedule
+
+            if reminder.id in exhausted:
+                logger.warning(
+                    f"Reminder {reminder.id} reached max retries. Creating alert for caregiver."
+                )
+
+                if patient and schedule:
+                    db.add(_unacknowledged_reminder_alert(patient, reminder, schedule))
+                    alerts_created += 1
+                    logger.info(f"Created MEDIUM alert for unacknowledged reminder {reminder.id}")
+
+            else:
+                logger.info(
+                    f"Retrying reminder {reminder.id} for patient {reminder.patient_id} "
+                    f"(attempt {reminder.retry_count}/{reminder.max_retries})"
+                )
+
+                # Resend notification if patient has device token
+                if patient and patient.device_token and schedule:
+                    notifications.append(_reminder_notification(patient, reminder, schedule, is_retry=True))
                 else:
-                    # Max retries reached - create alert for caregiver
-                    if reminder.retry_count >= reminder.max_retries:
-                        logger.warning(
-                            f"Reminder {reminder.id} reached max retries. Creating alert for caregiver."
-                        )
-
-                        # Update reminder status to missed
-                        reminder.status = "missed"
-
-                        # Create alert for caregiver
-                        schedule = db.query(Schedule).filter(Schedule.id == reminder.schedule_id).first()
-                        patient = db.query(Patient).filter(Patient.id == reminder.patient_id).first()
-
-                        if patient and schedule:
-                            alert = Alert(
-                                patient_id=reminder.patient_id,
-                                alert_type="missed_medications" if schedule.type == "medication" else "missed_reminder",
-                                severity="medium",
-                                title=f"Unacknowledged reminder: {reminder.title}",
-                                description=(
-                                    f"{patient.full_name} has not acknowledged the reminder for "
-                                    f"{reminder.title} (due at {reminder.due_at.strftime('%I:%M %p')}). "
-                                    f"The system sent {reminder.retry_count} reminders with no response."
-                                ),
-                                recommended_action=(
-                                    f"Please contact {patient.preferred_name or patient.full_name} to check if they "
-                                    f"completed the task and ensure they are okay."
-                                ),
-                                triggered_by="reminder_retry_limit",
-                                status="active"
-                            )
-
-                            db.add(alert)
-                            alerts_created += 1
-
-                            logger.info(f"Created MEDIUM alert for unacknowledged reminder {reminder.id}")
-
-            except Exception as e:
-                logger.error(f"Error processing reminder {reminder.id}: {str(e)}", exc_info=True)
-                continue
-
-        # Commit all changes
+                    logger.warning(
+                        f"Cannot retry reminder {reminder.id}: "
+                        f"patient or schedule not found, or no device token"
+                    )
+
+        # Commit all changes, then resend in batches
         db.commit()
+        notification_dispatcher.send_reminders(notifications)
 
         logger.info(
-            f"Retry job complete. Retried {retried_count} reminders, "
+            f"Retry job complete. Retried {len(notifications)} reminders, "
             f"created {alerts_created} alerts"
         )
 
@@ -367,3 +463,44 @@ def retry_unacknowledged_reminders():
 
     finally:
         db.close()
+
+
+def _first_due_days(rows) -> Dict[uuid.UUID, date]:
+    """Earliest due day per patient of (id, patient_id, due_at) rows"""
+    first_days: Dict[uuid.UUID, date] = {}
+    for _, patient_id, due_at in rows:
+        first_days[patient_id] = min(first_days.get(patient_id, due_at.date()), due_at.date())
+    return first_days
+
+
+def _load_reminders_with_patient_and_schedule(db: Session, reminder_ids: List[uuid.UUID]) -> List[Reminder]:
+    """Load reminders with their patient and schedule in one query"""
+    if not reminder_ids:
+        return []
+
+    return db.execute(
+        select(Reminder)
+        .options(joinedload(Reminder.patient), joinedload(Reminder.schedule))
+        .where(Reminder.id.in_(reminder_ids))
+    ).scalars().all()
+
+
+def _unacknowledged_reminder_alert(patient: Patient, reminder: Reminder, schedule: Schedule) -> Alert:
+    """Build the MEDIUM caregiver alert for a reminder that ran out of retries"""
+    return Alert(
+        patient_id=reminder.patient_id,
+        alert_type="missed_medications" if schedule.type == "medication" else "missed_reminder",
+        severity="medium",
+        title=f"Unacknowledged reminder: {reminder.title}",
+        description=(
+            f"{patient.full_name} has not acknowledged the reminder for "
+            f"{reminder.title} (due at {to_local(reminder.due_at, patient.timezone).strftime('%I:%M %p')}). "
+            f"The system sent {reminder.retry_count} reminders with no response."
+        ),
+        recommended_action=(
+            f"Please contact {patient.preferred_name or patient.full_name} to check if they "
+            f"completed the task and ensure they are okay."
+        ),
+        triggered_by="reminder_retry_limit",
+        status="active"
+    )
@@ -14,11 +14,11 @@ from app.jobs.reminder_generator import (
     check_and_mark_missed_reminders,
     retry_unacknowledged_reminders
 )
+from app.jobs.metrics_rollup import compact_daily_metrics, refresh_stale_daily_metrics
 from app.jobs.summary_generator import (
     generate_daily_summaries,
     generate_weekly_insights
 )
-from app.jobs.inactivity_detector import detect_patient_inactivity
 
 logger = logging.getLogger(__name__)
 
@@ -76,12 +76,25 @@ def init_scheduler():
     )
 
     # ===== INACTIVITY DETECTION =====
-    # Run every 15 minutes to check for inactive patients
+    # Event-driven - see app.jobs.inactivity_timer (started with the app)
+
+    # ===== REPORT METRICS ROLLUP =====
+    # Run every hour to roll up completed days (and pick up late writes)
+    scheduler.add_job(
+        func=compact_daily_metrics,
+        trigger=CronTrigger(minute=5),
+        id="daily_metrics_rollup",
+        name="Roll up daily report metrics",
+        replace_existing=True,
+        max_instances=1
+    )
+
+    # Recompute rolled-up days made stale by late writes, off the writers' transactions
     scheduler.add_job(
-        func=detect_patient_inactivity,
-        trigger=IntervalTrigger(minutes=15),
-        id="inactivity_detection",
-        name="Detect inactive patients",
+        func=refresh_stale_daily_metrics,
+        trigger=IntervalTrigger(seconds=settings.ROLLUP_REFRESH_INTERVAL_SECONDS),
+        id="stale_daily_metrics_refresh",
+        name="Refresh stale daily report metrics",
         replace_existing=True,
         max_instances=1
     )
@@ -11,6 +11,8 @@ from app.database.session import SessionLocal
 from app.models.patient import Patient
 from app.models.daily_summary import DailySummary
 from app.services.ai_orchestrator import ai_orchestrator
+from app.services.claude_service import claude_service
+from app.services.letta_service import letta_service
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +115,9 @@ async def async_generate_daily_summaries():
 
     finally:
         db.close()
+        # Release connection pools bound to this job's event loop
+        await claude_service.aclose()
+        await letta_service.aclose()
 
 
 def generate_weekly_insights():
@@ -146,7 +151,6 @@ async def async_generate_weekly_insights():
             try:
                 from app.models.insight import PatientInsight
                 from app.models.conversation import Conversation
-                from app.services.letta_service import letta_service
 
                 # Get recent conversations (last 7 days)
                 week_ago = datetime.now() - timedelta(days=7)
@@ -214,3 +218,6 @@ async def async_generate_weekly_insights():
 
     finally:
         db.close()
+        # Release connection pools bound to this job's event loop
+        await claude_service.aclose()
+        await letta_service.aclose()
@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import logging
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from app.core.config import settings
 
@@ -43,11 +44,86 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to start scheduler: {e}")
 
+    # Rebuild inactivity deadlines and start the timer wheel
+    try:
+        from app.jobs.inactivity_timer import inactivity_timer
+        inactivity_timer.start()
+    except Exception as e:
+        logger.error(f"Failed to start inactivity timer: {e}")
+
+    # Start post-response work queue (replays jobs journaled before a restart)
+    try:
+        from app.services.post_response_queue import post_response_queue
+        await post_response_queue.start()
+    except Exception as e:
+        logger.error(f"Failed to start post-response queue: {e}")
+
+    # Start buffered activity ingestion (replays journaled events)
+    try:
+        from app.services.activity_ingestion import activity_ingestion
+        await activity_ingestion.start()
+    except Exception as e:
+        logger.error(f"Failed to start activity ingestion: {e}")
+
+    # Start write-behind Letta memory updater
+    try:
+        from app.services.letta_memory_updater import letta_memory_updater
+        await letta_memory_updater.start()
+    except Exception as e:
+        logger.error(f"Failed to start Letta memory updater: {e}")
+
     yield
 
     # Shutdown
     logger.info("Shutting down Elder Companion AI Backend")
 
+    # Let streamed voice turns finish saving (they enqueue post-response work)
+    try:
+        from app.services.ai_orchestrator import ai_orchestrator
+        await ai_orchestrator.wait_for_streamed_turns()
+    except Exception as e:
+        logger.error(f"Error waiting for streamed voice turns: {e}")
+
+    # Write buffered activity
+    try:
+        from app.services.activity_ingestion import activity_ingestion
+        await activity_ingestion.stop()
+    except Exception as e:
+        logger.error(f"Error stopping activity ingestion: {e}")
+
+    # Flush buffered Letta memory updates into the post-response queue
+    try:
+        from app.services.letta_memory_updater import letta_memory_updater
+        await letta_memory_updater.stop()
+    except Exception as e:
+        logger.error(f"Error stopping Letta memory updater: {e}")
+
+    # Drain post-response work queue
+    try:
+        from app.services.post_response_queue import post_response_queue
+        await post_response_queue.stop()
+    except Exception as e:
+        logger.error(f"Error stopping post-response queue: {e}")
+
+    # Close pooled AI service connections
+    try:
+        from app.services.claude_service import claude_service
+        await claude_service.aclose()
+    except Exception as e:
+        logger.error(f"Error closing Claude client: {e}")
+
+    try:
+        from app.services.letta_service import letta_service
+        await letta_service.aclose()
+    except Exception as e:
+        logger.error(f"Error closing Letta client: {e}")
+
+    try:
+        from app.utils.cache import aclose_caches
+        await aclose_caches()
+    except Exception as e:
+        logger.error(f"Error closing cache connections: {e}")
+
     # Shutdown background scheduler
     try:
         from app.jobs.scheduler import shutdown_scheduler
@@ -56,6 +132,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping scheduler: {e}")
 
+    # Stop inactivity timer wheel
+    try:
+        from app.jobs.inactivity_timer import inactivity_timer
+        inactivity_timer.stop()
+    except Exception as e:
+        logger.error(f"Error stopping inactivity timer: {e}")
+
+    # Wait for in-flight push notification batches
+    try:
+        from app.services.communication.notification_dispatcher import notification_dispatcher
+        notification_dispatcher.shutdown()
+    except Exception as e:
+        logger.error(f"Error stopping notification dispatcher: {e}")
+
+    # Close async database connections
+    try:
+        from app.database.session import async_engine
+        await async_engine.dispose()
+    except Exception as e:
+        logger.error(f"Error closing async database engine: {e}")
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -74,6 +171,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag"],
 )
 
 
@@ -104,6 +202,80 @@ async def scheduler_status():
     return get_scheduler_status()
 
 
+# Post-response queue status endpoint
+@app.get("/admin/post-response-queue", tags=["Admin"])
+async def post_response_queue_status():
+    """
+    Get post-response work queue counters and depth
+    """
+    from app.services.post_response_queue import post_response_queue
+    from app.services.letta_memory_updater import letta_memory_updater
+    return {
+        **post_response_queue.get_stats(),
+        "letta_memory_updater": letta_memory_updater.get_stats()
+    }
+
+
+# Push notification dispatch endpoint
+@app.get("/admin/notifications", tags=["Admin"])
+async def notification_dispatch_status():
+    """
+    Get push notification batch counters and last-batch throughput
+    """
+    from app.services.communication.notification_dispatcher import notification_dispatcher
+    return notification_dispatcher.get_stats()
+
+
+# Activity ingestion endpoint
+@app.get("/admin/activity-ingestion", tags=["Admin"])
+async def activity_ingestion_status():
+    """
+    Get buffered activity counters and buffer depth
+    """
+    from app.services.activity_ingestion import activity_ingestion
+    return activity_ingestion.get_stats()
+
+
+# Inactivity timer endpoint
+@app.get("/admin/inactivity-timer", tags=["Admin"])
+async def inactivity_timer_status():
+    """
+    Get armed inactivity deadlines and firing counters
+    """
+    from app.jobs.inactivity_timer import inactivity_timer
+    return inactivity_timer.get_stats()
+
+
+# Claude token usage endpoint
+@app.get("/admin/metrics/claude", tags=["Admin"])
+async def claude_usage_metrics():
+    """
+    Get Claude token totals and cached-token ratio per call type
+    """
+    from app.services.claude_service import claude_service
+    return claude_service.get_usage_stats()
+
+
+# Cache stats endpoint
+@app.get("/admin/cache", tags=["Admin"])
+async def cache_status():
+    """
+    Get hit/miss/eviction counters for all caches
+    """
+    from app.utils.cache import get_cache_stats
+    return get_cache_stats()
+
+
+# Latency metrics endpoint
+@app.get("/admin/metrics/latency", tags=["Admin"])
+async def latency_metrics_status(prefix: Optional[str] = None):
+    """
+    Get latency histograms for external calls (e.g. ?prefix=letta.)
+    """
+    from app.utils.metrics import latency_metrics
+    return latency_metrics.snapshot(prefix)
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
@@ -7,6 +7,7 @@ This module exports all SQLAlchemy models for:
 - Conversations and AI interactions
 - Alerts and daily summaries
 - Activity tracking and system logs
+- Daily report metrics rollup (and days waiting to be recomputed)
 """
 
 from app.models.caregiver import Caregiver
@@ -21,6 +22,8 @@ from app.models.insight import PatientInsight
 from app.models.activity_log import ActivityLog
 from app.models.system_log import SystemLog
 from app.models.note import CaregiverNote
+from app.models.patient_daily_metrics import PatientDailyMetrics
+from app.models.stale_daily_metrics import StaleDailyMetrics
 
 __all__ = [
     "Caregiver",
@@ -35,4 +38,6 @@ __all__ = [
     "ActivityLog",
     "SystemLog",
     "CaregiverNote",
+    "PatientDailyMetrics",
+    "StaleDailyMetrics",
 ]
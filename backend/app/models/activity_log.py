@@ -2,7 +2,7 @@
 ActivityLog model - Patient activity tracking
 """
 
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, JSON, Float
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, JSON, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -23,6 +23,10 @@ class ActivityLog(Base):
     - App opens/closes
     """
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # Heartbeat lookups and activity feeds per patient and type (newest first)
+        Index("ix_activity_logs_patient_id_type_logged_at", "patient_id", "activity_type", "logged_at"),
+    )
 
     # Primary Key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -2,7 +2,7 @@
 Alert model - Critical notifications for caregivers
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -23,6 +23,14 @@ class Alert(Base):
     - AI detects urgency in conversation
     """
     __tablename__ = "alerts"
+    __table_args__ = (
+        # Inactivity detector: open alerts per patient, type and severity
+        Index(
+            "ix_alerts_open_patient_type_severity_created_at",
+            "patient_id", "alert_type", "severity", "created_at",
+            postgresql_where=text("acknowledged_at IS NULL")
+        ),
+    )
 
     # Primary Key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
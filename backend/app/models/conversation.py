@@ -2,7 +2,7 @@
 Conversation model - Voice interactions between patient and AI
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, JSON, Float
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, JSON, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -23,6 +23,10 @@ class Conversation(Base):
     - Stores sentiment analysis and health mentions
     """
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Recent turns per patient (newest first via backward scan)
+        Index("ix_conversations_patient_id_created_at", "patient_id", "created_at"),
+    )
 
     # Primary Key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -2,7 +2,7 @@
 Patient model - Elderly care recipients
 """
 
-from sqlalchemy import Column, String, Date, Boolean, DateTime, ARRAY, JSON, Text
+from sqlalchemy import Column, String, Date, Boolean, DateTime, Integer, ARRAY, JSON, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -64,6 +64,9 @@ class Patient(Base):
     last_active_at = Column(DateTime, nullable=True)  # Last time patient interacted with app
     last_heartbeat_at = Column(DateTime, nullable=True)  # Last heartbeat from mobile app
 
+    # Report cache
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)  # Bumped when report data is written
+
     # Mobile Setup (QR Code)
     setup_token = Column(String(255), nullable=True)  # One-time token for device setup
     setup_token_expires = Column(DateTime, nullable=True)  # Token expiry timestamp
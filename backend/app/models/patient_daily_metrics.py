@@ -0,0 +1,49 @@
+"""
+PatientDailyMetrics model - Per-day report metrics rollup
+"""
+
+from sqlalchemy import Column, Date, DateTime, Integer, Float, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.database.base import Base
+
+
+class PatientDailyMetrics(Base):
+    """
+    PatientDailyMetrics model - One row per patient per (UTC) day with activity
+
+    Maintained by the metrics rollup job (app.jobs.metrics_rollup) for days
+    before today, so reports read precomputed days instead of raw rows.
+    Only days up to the rollup watermark (the latest rolled-up day) are
+    complete; later days are computed live.
+    """
+    __tablename__ = "patient_daily_metrics"
+
+    # Primary Key
+    patient_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("patients.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    day = Column(Date, primary_key=True, index=True)
+
+    # Medication adherence
+    reminders_total = Column(Integer, default=0, nullable=False)  # Medication reminders due that day
+    reminders_completed = Column(Integer, default=0, nullable=False)
+
+    # Activity
+    interactions = Column(Integer, default=0, nullable=False)  # Activity log rows
+    activity_minutes = Column(Integer, default=0, nullable=False)  # Estimated, see reports.ACTIVITY_MINUTES
+
+    # Mood
+    conversations = Column(Integer, default=0, nullable=False)
+    sentiment_score_sum = Column(Float, default=0.0, nullable=False)  # See reports.SENTIMENT_SCORES
+    positive_conversations = Column(Integer, default=0, nullable=False)
+    negative_conversations = Column(Integer, default=0, nullable=False)
+
+    # Timestamp
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<PatientDailyMetrics patient {self.patient_id} on {self.day}>"
@@ -2,7 +2,7 @@
 Reminder model - Individual reminder instances generated from schedules
 """
 
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -23,6 +23,12 @@ class Reminder(Base):
     - Can be retried if missed
     """
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Missed/retry jobs: pending reminders past due
+        Index("ix_reminders_pending_due_at", "due_at", postgresql_where=text("status = 'pending'")),
+        # Reminder job: reminders already created for due schedules
+        Index("ix_reminders_schedule_id_due_at", "schedule_id", "due_at"),
+    )
 
     # Primary Key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
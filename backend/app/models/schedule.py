@@ -58,6 +58,7 @@ class Schedule(Base):
 
     # Reminder Settings
     reminder_advance_minutes = Column(Integer, default=5, nullable=False)  # Remind 5 minutes before
+    next_reminder_at = Column(DateTime, nullable=True, index=True)  # Next reminder time (UTC), see app.services.recurrence
 
     # Status
     is_active = Column(Boolean, default=True, nullable=False)
@@ -0,0 +1,43 @@
+"""
+StaleDailyMetrics model - Rolled-up report days waiting to be recomputed
+"""
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+
+from app.database.base import Base
+
+
+class StaleDailyMetrics(Base):
+    """
+    StaleDailyMetrics model - A late write of report data for a past day
+
+    Recorded (in the writing transaction) by app.jobs.metrics_rollup when
+    reminders, conversations or activity logs of days before today change,
+    and consumed by the refresh_stale_daily_metrics job, which recomputes the
+    patient's rolled-up days from first_day on. Append-only, so writers never
+    contend on a row.
+    """
+    __tablename__ = "stale_daily_metrics"
+
+    # Primary Key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Foreign Keys
+    patient_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("patients.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    # Earliest changed day (NULL = all history, e.g. a schedule changed type)
+    first_day = Column(Date, nullable=True)
+
+    # Timestamp
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<StaleDailyMetrics patient {self.patient_id} from {self.first_day or 'all history'}>"
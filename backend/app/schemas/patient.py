@@ -127,6 +127,27 @@ class HeartbeatCreate(BaseModel):
     battery_level: Optional[int] = Field(None, ge=0, le=100, description="Battery level (0-100)")
 
 
+class ActivityEventCreate(HeartbeatCreate):
+    """Schema for one event in an activity batch (recorded while offline)"""
+    logged_at: Optional[datetime] = Field(
+        None,
+        description="When the event happened on the device (defaults to the time the batch is received)"
+    )
+
+
+class ActivityBatchCreate(BaseModel):
+    """Schema for recording a batch of activity events"""
+    events: List[ActivityEventCreate] = Field(..., min_length=1, max_length=500)
+
+
+class ActivityBatchResponse(BaseModel):
+    """Schema for activity batch response"""
+    patient_id: UUID
+    recorded: int
+    last_active_at: Optional[datetime]
+    last_heartbeat_at: Optional[datetime]
+
+
 class ActivityLogResponse(BaseModel):
     """Schema for activity log response"""
     id: UUID
@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime, date as date_type
 from enum import Enum
+from uuid import UUID
 
 
 # Enums for report fields
@@ -212,3 +213,63 @@ class PatientReport(BaseModel):
                 }
             }
         }
+
+
+# Cohort Report Schemas
+class PatientReportSummary(BaseModel):
+    """Report metrics of one patient with per-day (or per-week) sparklines"""
+    patient_id: UUID = Field(..., description="Patient ID")
+    first_name: str = Field(..., description="Patient first name")
+    last_name: str = Field(..., description="Patient last name")
+    preferred_name: Optional[str] = Field(None, description="What the patient likes to be called")
+    medication_adherence_rate: float = Field(..., ge=0.0, le=1.0, description="Overall adherence rate")
+    medication_trend: Trend = Field(..., description="Adherence trend direction")
+    average_daily_minutes: float = Field(..., ge=0.0, description="Average daily activity minutes")
+    activity_trend: Trend = Field(..., description="Activity trend direction")
+    average_sentiment_score: float = Field(..., ge=1.0, le=10.0, description="Average sentiment score (1-10)")
+    mood_trend: Trend = Field(..., description="Mood trend direction")
+    sentiment_distribution: SentimentDistribution = Field(..., description="Breakdown of sentiment types")
+    medication_sparkline: List[Optional[float]] = Field(
+        default_factory=list, description="Adherence rate per sparkline value (null = no medication reminders)"
+    )
+    activity_sparkline: List[int] = Field(
+        default_factory=list, description="Average activity minutes per day, per sparkline value"
+    )
+    mood_sparkline: List[Optional[float]] = Field(
+        default_factory=list, description="Average sentiment score per sparkline value (null = no conversations)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "patient_id": "6f1c2b3a-1d4e-4c8f-9a2b-3c4d5e6f7a8b",
+                "first_name": "Margaret",
+                "last_name": "Smith",
+                "preferred_name": "Maggie",
+                "medication_adherence_rate": 0.85,
+                "medication_trend": "up",
+                "average_daily_minutes": 45.0,
+                "activity_trend": "stable",
+                "average_sentiment_score": 7.2,
+                "mood_trend": "up",
+                "sentiment_distribution": {
+                    "positive": 0.65,
+                    "neutral": 0.25,
+                    "negative": 0.10
+                },
+                "medication_sparkline": [1.0, 0.667, None, 1.0, 1.0, 0.667, 1.0],
+                "activity_sparkline": [42, 35, 0, 51, 47, 38, 44],
+                "mood_sparkline": [7.0, 6.5, None, 8.0, 7.25, 5.0, 7.5]
+            }
+        }
+
+
+class CohortReport(BaseModel):
+    """Report summaries of all of a caregiver's patients"""
+    time_range: TimeRange = Field(..., description="Time range for the report")
+    start_date: date_type = Field(..., description="Start date of the report (first sparkline value)")
+    end_date: date_type = Field(..., description="End date of the report (last sparkline value)")
+    sparkline_days: int = Field(
+        1, ge=1, description="Days per sparkline value (1, or 7 for ranges over 90 days; the last may cover fewer)"
+    )
+    patients: List[PatientReportSummary] = Field(default_factory=list, description="One summary per patient")
@@ -47,6 +47,7 @@ class ScheduleResponse(ScheduleBase):
     id: UUID
     patient_id: UUID
     is_active: bool
+    next_reminder_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime]
 
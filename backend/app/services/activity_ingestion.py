@@ -0,0 +1,369 @@
+"""
+Activity Ingestion
+Buffered, write-optimized ingestion of high-volume patient activity (heartbeats)
+
+Accepted activity is appended to an in-memory buffer and the request returns
+202 immediately. The buffer is flushed every flush interval (or as soon as it
+holds a full batch) as one multi-row INSERT into activity_logs plus one
+UPDATE of patients.last_active_at/last_heartbeat_at for all patients in the
+batch.
+
+Settings:
+- ACTIVITY_INGESTION_MODE: "buffered" or "sync" (write per request, 201)
+- ACTIVITY_BUFFERED_TYPES: activity types that are buffered; everything else
+  (emergency, reminder responses...) is always written synchronously
+- ACTIVITY_BUFFER_MAX_SIZE: back-pressure - when this many events are waiting
+  (e.g. the database is down), new events are rejected with 503 + Retry-After
+- ACTIVITY_DURABILITY: "memory" (events of the current interval are lost on a
+  crash) or "journal" (events are appended to a journal file before they are
+  accepted and replayed on the next start; replays are idempotent)
+
+Journal segments are kept per process (see app.utils.journal): a worker only
+replays its own earlier segments and those of workers that are no longer
+running, never a segment another live worker is still appending to.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, cast, func, select, update, values, column
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.jobs.metrics_rollup import mark_days_stale
+from app.models.activity_log import ActivityLog
+from app.models.patient import Patient
+from app.utils.journal import claim_journals, process_dir
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityBufferFull(Exception):
+    """Raised when the buffer is at ACTIVITY_BUFFER_MAX_SIZE"""
+    pass
+
+
+class ActivityIngestionBuffer:
+    """
+    Buffers activity events and flushes them in batches
+
+    Usage:
+        activity_ingestion.submit({"patient_id": ..., "activity_type": "heartbeat", ...})
+    """
+
+    def __init__(
+        self,
+        flush_interval_seconds: float = 2.0,
+        batch_size: int = 1000,
+        max_buffer_size: int = 10000,
+        durability: str = "memory",
+        journal_dir: str = "./queue_data/activity"
+    ):
+        """Initialize empty buffer (flush loop is started by start())"""
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_size = batch_size
+        self.max_buffer_size = max_buffer_size
+        self.durability = durability
+        self.journal_dir = Path(journal_dir)
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._journal = None
+        self._journal_path: Optional[Path] = None
+        self._unflushed_journals: List[Path] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"accepted": 0, "rejected": 0, "flushed": 0, "batches": 0, "flush_errors": 0}
+
+    def submit(self, event: Dict[str, Any]) -> None:
+        """
+        Accept one activity event
+
+        Args:
+            event: ActivityLog column values, including a pre-generated id and logged_at
+
+        Raises:
+            ActivityBufferFull: If max_buffer_size events are already waiting
+        """
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer_size:
+                self._stats["rejected"] += 1
+                raise ActivityBufferFull()
+
+            if self.durability == "journal":
+                self._append_journal(event)
+
+            self._buffer.append(event)
+            self._stats["accepted"] += 1
+            full = len(self._buffer) >= self.batch_size
+
+        if full and self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def flush(self) -> int:
+        """
+        Write all buffered events to the database
+
+        On failure the events go back to the front of the buffer (their journal
+        segments are kept) and are retried on the next flush.
+
+        Returns:
+            Number of events written
+        """
+        with self._flush_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+                self._rotate_journal()
+
+            if not events:
+                return 0
+
+            written = 0
+            try:
+                for offset in range(0, len(events), self.batch_size):
+                    batch = events[offset:offset + self.batch_size]
+                    write_activity_batch(batch)
+                    written += len(batch)
+            except Exception as e:
+                logger.error(
+                    f"Error flushing {len(events) - written} buffered activity events: {e}",
+                    exc_info=True
+                )
+                with self._lock:
+                    self._buffer[:0] = events[written:]
+                    self._stats["flush_errors"] += 1
+                    self._stats["flushed"] += written
+                return written
+
+            # Everything in the closed journal segments is now in the database
+            for path in self._unflushed_journals:
+                path.unlink(missing_ok=True)
+            self._unflushed_journals = []
+
+            with self._lock:
+                self._stats["flushed"] += written
+                self._stats["batches"] += 1
+
+            logger.debug(f"Flushed {written} activity events")
+            return written
+
+    async def start(self) -> None:
+        """Replay journaled events from a previous run and start the flush loop"""
+        if self._task is not None:
+            return
+
+        if self.durability == "journal":
+            await asyncio.to_thread(self._replay_journals)
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            f"Activity ingestion started (flush interval {self.flush_interval_seconds}s, "
+            f"batch size {self.batch_size}, max buffer {self.max_buffer_size}, "
+            f"durability {self.durability})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flush loop and flush everything that is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._loop = None
+
+        flushed = await asyncio.to_thread(self.flush)
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        logger.info(f"Activity ingestion stopped ({flushed} events flushed)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters and the current buffer size"""
+        with self._lock:
+            return {
+                **self._stats,
+                "buffered": len(self._buffer),
+                "max_buffer_size": self.max_buffer_size,
+                "durability": self.durability,
+                "running": self._task is not None
+            }
+
+    async def _flush_loop(self) -> None:
+        """Flush every interval, or early when a full batch is waiting"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Error in activity flush loop: {e}", exc_info=True)
+
+    def _append_journal(self, event: Dict[str, Any]) -> None:
+        """Append one event to the current journal segment (lock held)"""
+        if self._journal is None:
+            directory = process_dir(self.journal_dir)
+            directory.mkdir(parents=True, exist_ok=True)
+            self._journal_path = directory / f"{os.getpid()}-{time.time_ns()}.jsonl"
+            self._journal = open(self._journal_path, "a", encoding="utf-8")
+
+        self._journal.write(json.dumps(event, default=str) + "\n")
+        self._journal.flush()
+
+    def _rotate_journal(self) -> None:
+        """Close the current journal segment so the next events start a new one (lock held)"""
+        if self._journal is None:
+            return
+
+        self._journal.close()
+        self._unflushed_journals.append(self._journal_path)
+        self._journal, self._journal_path = None, None
+
+    def _replay_journals(self) -> None:
+        """Write events journaled by a previous run of this worker or by workers that are gone"""
+        if not self.journal_dir.exists():
+            return
+
+        # Segments this process already writes (events submitted before start) stay put
+        with self._lock:
+            open_segments = {*self._unflushed_journals, self._journal_path}
+
+        for path in claim_journals(self.journal_dir, "*.jsonl", skip=open_segments):
+            try:
+                events = [
+                    _parse_journaled_event(json.loads(line))
+                    for line in path.read_text(encoding="utf-8").splitlines()
+                    if line.strip()
+                ]
+                for offset in range(0, len(events), self.batch_size):
+                    write_activity_batch(events[offset:offset + self.batch_size])
+                path.unlink()
+                logger.info(f"Replayed {len(events)} journaled activity events from {path.name}")
+            except Exception as e:
+                logger.error(f"Could not replay activity journal {path.name}: {e}")
+
+
+def _parse_journaled_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore column types of a journaled event"""
+    event["id"] = uuid.UUID(event["id"])
+    event["patient_id"] = uuid.UUID(event["patient_id"])
+    event["logged_at"] = datetime.fromisoformat(event["logged_at"])
+    return event
+
+
+def insert_activity_events(db: Session, events: List[Dict[str, Any]]) -> Dict[Any, Tuple[datetime, Optional[datetime]]]:
+    """
+    Insert activity events and advance the patients' activity timestamps (without committing)
+
+    One multi-row INSERT (ids are pre-generated, so replayed events are skipped)
+    and one UPDATE of patients.last_active_at/last_heartbeat_at to the latest
+    event times (also bumping data_version). Timestamps never move backwards.
+    Events on already rolled-up days mark those days of the rollup stale.
+
+    Args:
+        db: Database session
+        events: ActivityLog column values, including id and logged_at
+
+    Returns:
+        Patient ID -> (last_active_at, last_heartbeat_at) after the update
+    """
+    # render_nulls keeps events with different optional fields in one statement
+    db.execute(
+        pg_insert(ActivityLog).on_conflict_do_nothing(index_elements=[ActivityLog.id]),
+        events,
+        execution_options={"render_nulls": True}
+    )
+
+    # Latest activity and heartbeat, and earliest day, per patient
+    latest: Dict[Any, List[Optional[datetime]]] = {}
+    first_days: Dict[Any, date] = {}
+    for event in events:
+        day = event["logged_at"].date()
+        first_days[event["patient_id"]] = min(first_days.get(event["patient_id"], day), day)
+        times = latest.setdefault(event["patient_id"], [None, None])
+        if times[0] is None or event["logged_at"] > times[0]:
+            times[0] = event["logged_at"]
+        if event["activity_type"] == "heartbeat" and (times[1] is None or event["logged_at"] > times[1]):
+            times[1] = event["logged_at"]
+
+    batch = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("last_active_at", DateTime()),
+        column("last_heartbeat_at", DateTime()),
+        name="batch"
+    ).data([(patient_id, active, heartbeat) for patient_id, (active, heartbeat) in latest.items()])
+
+    # GREATEST ignores NULLs (cast: an all-NULL VALUES column would be text)
+    rows = db.execute(
+        update(Patient)
+        .where(Patient.id == batch.c.id)
+        .values(
+            last_active_at=func.greatest(Patient.last_active_at, cast(batch.c.last_active_at, DateTime)),
+            last_heartbeat_at=func.greatest(Patient.last_heartbeat_at, cast(batch.c.last_heartbeat_at, DateTime)),
+            # Invalidates cached reports (see app.services.report_cache)
+            data_version=Patient.data_version + 1
+        )
+        .returning(Patient.id, Patient.last_active_at, Patient.last_heartbeat_at)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    # Late events (offline devices, journal replay) on days read from the rollup
+    mark_days_stale(db, first_days)
+
+    return {patient_id: (last_active_at, last_heartbeat_at) for patient_id, last_active_at, last_heartbeat_at in rows}
+
+
+def write_activity_batch(events: List[Dict[str, Any]]) -> None:
+    """
+    Write a batch of buffered activity events in one transaction
+
+    Events for patients that were deleted after their events were accepted
+    are dropped.
+
+    Args:
+        events: ActivityLog column values
+    """
+    db = SessionLocal()
+    try:
+        patient_ids = {event["patient_id"] for event in events}
+        existing = set(db.execute(select(Patient.id).where(Patient.id.in_(patient_ids))).scalars())
+        if len(existing) < len(patient_ids):
+            logger.warning(f"Dropping activity for {len(patient_ids) - len(existing)} deleted patients")
+            events = [event for event in events if event["patient_id"] in existing]
+            if not events:
+                return
+
+        insert_activity_events(db, events)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Global instance
+activity_ingestion = ActivityIngestionBuffer(
+    flush_interval_seconds=settings.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    batch_size=settings.ACTIVITY_FLUSH_BATCH_SIZE,
+    max_buffer_size=settings.ACTIVITY_BUFFER_MAX_SIZE,
+    durability=settings.ACTIVITY_DURABILITY,
+    journal_dir=settings.ACTIVITY_JOURNAL_DIR
+)
@@ -3,24 +3,109 @@ AI Orchestration Service
 Coordinates Claude, Letta, and Chroma services for complete AI-powered conversations
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator, Set, Tuple
+import asyncio
 import logging
+import re
 import time
-import asyncio
+import uuid
 from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.services.claude_service import claude_service
 from app.services.letta_service import letta_service
 from app.services.chroma_service import chroma_service
+from app.services.post_response_queue import post_response_queue
+from app.services.letta_memory_updater import (
+    JOB_TYPE as LETTA_MEMORY_JOB,
+    format_memory_message,
+    letta_memory_updater
+)
+from app.services.patient_context_store import patient_context_store
+from app.utils.cache import get_cache
+from app.database.session import AsyncSessionLocal
 from app.models.conversation import Conversation
 from app.models.patient import Patient
 from app.models.alert import Alert
 
 logger = logging.getLogger(__name__)
 
-# Simple in-memory cache for Letta context (5 minute TTL)
-_letta_context_cache: Dict[str, tuple[Dict, float]] = {}
+# Hot lookups on the voice path (bounded LRU + TTL, see app.utils.cache)
+_letta_context_cache = get_cache(
+    "letta_context",
+    max_entries=settings.LETTA_CONTEXT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LETTA_CONTEXT_CACHE_TTL_SECONDS
+)
+
+# Sentence boundary: terminal punctuation (optionally followed by closing quotes) then whitespace
+_SENTENCE_BOUNDARY = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+')
+
+
+# Phrases that create a critical alert synchronously, before Claude is even called
+EMERGENCY_KEYWORDS = (
+    "chest pain",
+    "heart attack",
+    "can't breathe",
+    "cannot breathe",
+    "can't breath",
+    "trouble breathing",
+    "i fell",
+    "i've fallen",
+    "i have fallen",
+    "fallen down",
+    "can't get up",
+    "stroke",
+    "bleeding",
+    "passed out",
+    "fainted",
+    "call 911",
+    "ambulance",
+)
+
+
+def _detect_emergency(patient_message: str, conversation_type: str) -> Optional[str]:
+    """
+    Keyword fast-path for emergencies
+
+    Returns:
+        The matched keyword (or "emergency" for emergency conversations), else None
+    """
+    if conversation_type == "emergency":
+        return "emergency"
+
+    message = patient_message.lower().replace("’", "'")
+    for keyword in EMERGENCY_KEYWORDS:
+        if keyword in message:
+            return keyword
+
+    return None
+
+
+def _split_complete_sentences(text: str) -> Tuple[List[str], str]:
+    """
+    Split streamed text into complete sentences and the trailing partial sentence
+
+    Returns:
+        (complete_sentences, remainder)
+    """
+    parts = _SENTENCE_BOUNDARY.split(text)
+    remainder = parts.pop()
+    sentences = [part.strip() for part in parts if part.strip()]
+    return sentences, remainder
+
+
+def _stream_error_event(error: Exception) -> Dict[str, Any]:
+    """Streaming error event with fallback text to speak"""
+    return {
+        "event": "error",
+        "data": {
+            "error": str(error),
+            "ai_response": "I'm having some trouble right now. Let me alert your caregiver to help."
+        }
+    }
 
 
 class AIOrchestrator:
@@ -34,27 +119,41 @@ class AIOrchestrator:
         self.claude = claude_service
         self.letta = letta_service
         self.chroma = chroma_service
+
+        # Streamed turns still being generated or saved (see _stream_turn)
+        self._streamed_turns: Set[asyncio.Task] = set()
+
+        # Letta context cache keys with a refresh queued by this worker (see _gather_context)
+        self._letta_refreshes: Set[str] = set()
+
+        # Work that runs after the reply has been returned
+        post_response_queue.register("analyze_conversation", self._run_conversation_analysis)
+        post_response_queue.register("index_conversation", self._run_conversation_indexing)
+        post_response_queue.register(LETTA_MEMORY_JOB, self._run_letta_memory_update)
+
         logger.info("AI Orchestrator initialized")
 
     async def process_voice_interaction(
         self,
         patient_id: str,
         patient_message: str,
-        db: Session,
+        db: AsyncSession,
         conversation_type: str = "spontaneous"
     ) -> Dict[str, Any]:
         """
         Complete AI-powered voice interaction pipeline
 
-        Pipeline:
-        1. Get patient context from database
-        2. Search Chroma for similar past conversations
-        3. Get Letta memory context
-        4. Send to Claude for response generation
-        5. Update Letta memory
-        6. Store in Chroma for future semantic search
-        7. Save to database
-        8. Check for alerts
+        Critical path (before the reply is returned):
+        1. Patient context + recent turns from the in-memory store (two small checking reads when warm)
+        2. Emergency keyword fast-path - critical alert created synchronously
+        3. Cached Letta memory context + Chroma search for similar past conversations
+        4. Send to Claude for response generation (and analysis, in combined mode)
+        5. Save conversation to database
+
+        Post-response (queued, retried on failure):
+        6. Extract sentiment/urgency/health mentions (if not done in step 4) and create alerts
+        7. Store in Chroma for future semantic search
+        8. Update Letta memory (utterances batched per agent)
 
         Args:
             patient_id: Patient UUID
@@ -66,207 +165,596 @@ class AIOrchestrator:
             Dict containing:
             - ai_response: Text to speak back
             - conversation_id: Created conversation ID
-            - urgency_level: Detected urgency
-            - alert_created: Whether an alert was created
+            - urgency_level: Urgency known at response time (fast-path only)
+            - alert_created: Whether an emergency alert was created
+            - analysis_pending: True while analysis runs in the background
             - response_time: Processing time in seconds
         """
         start_time = time.time()
         timing_log = {}
 
         try:
-            # 1. Get patient context
-            step_start = time.time()
-            patient = db.query(Patient).filter(Patient.id == patient_id).first()
-            if not patient:
-                logger.error(f"Patient {patient_id} not found")
+            # 1. Patient context + recent turns (in memory, checked against the database)
+            patient_state = await self._load_patient_state(patient_id, db, timing_log)
+            if patient_state is None:
                 return {
                     "ai_response": "I'm having trouble accessing your information. Please contact your caregiver.",
                     "error": "Patient not found",
                     "response_time": time.time() - start_time
                 }
 
-            patient_context = self._build_patient_context(patient)
-            timing_log["patient_context"] = round(time.time() - step_start, 3)
-            logger.info(f"[Timing] Patient context: {timing_log['patient_context']}s")
-
-            # 2 & 3. PARALLEL: Search Chroma + Get Letta context
-            step_start = time.time()
+            # 2. Emergency fast-path
+            emergency_alert_created = await self._create_emergency_alert(
+                patient_id=patient_id,
+                patient_message=patient_message,
+                conversation_type=conversation_type,
+                db=db,
+                timing_log=timing_log
+            )
 
-            # Check Letta cache first (5 min TTL)
-            cache_key = f"{patient_id}_{patient.letta_agent_id}"
-            letta_context = {}
-            use_cache = False
-
-            if cache_key in _letta_context_cache:
-                cached_data, cache_time = _letta_context_cache[cache_key]
-                if time.time() - cache_time < 300:  # 5 minutes
-                    letta_context = cached_data
-                    use_cache = True
-                    logger.info(f"[Cache HIT] Using cached Letta context for {patient_id}")
-                else:
-                    # Cache expired, remove it
-                    del _letta_context_cache[cache_key]
-                    logger.info(f"[Cache EXPIRED] Refreshing Letta context for {patient_id}")
-
-            # Run Chroma and Letta in parallel (if not cached)
-            if patient.letta_agent_id and not use_cache:
-                chroma_task = self.chroma.search_similar_conversations(
-                    patient_id=str(patient_id),
-                    query_message=patient_message,
-                    n_results=2  # Reduced from 3 to 2 for performance
-                )
-                letta_task = self.letta.send_message_to_agent(
-                    agent_id=patient.letta_agent_id,
-                    message=f"Patient said: {patient_message}",
-                    conversation_context={"type": conversation_type}
-                )
+            # 3. Letta context (cached) + Chroma search
+            context = await self._gather_context(
+                patient_id=patient_id,
+                patient_message=patient_message,
+                patient_state=patient_state,
+                timing_log=timing_log
+            )
 
-                # Execute in parallel
-                similar_conversations, letta_result = await asyncio.gather(chroma_task, letta_task)
-                letta_context = letta_result.get("memory_context", {})
-
-                # Cache the Letta context
-                _letta_context_cache[cache_key] = (letta_context, time.time())
-            elif not patient.letta_agent_id:
-                # No Letta agent, only run Chroma
-                similar_conversations = await self.chroma.search_similar_conversations(
-                    patient_id=str(patient_id),
-                    query_message=patient_message,
-                    n_results=2
+            # 4. Generate AI response with Claude - reply and analysis in one call
+            # when combined mode is on, otherwise reply only with analysis deferred
+            step_start = time.time()
+            if settings.CLAUDE_COMBINED_ANALYSIS:
+                claude_result = await self.claude.analyze_conversation(
+                    patient_message=patient_message,
+                    patient_context=context["patient_context"],
+                    conversation_history=context["conversation_history"]
                 )
             else:
-                # Using cached Letta, only run Chroma
-                similar_conversations = await self.chroma.search_similar_conversations(
-                    patient_id=str(patient_id),
-                    query_message=patient_message,
-                    n_results=2
+                claude_result = await self.claude.generate_response(
+                    patient_message=patient_message,
+                    patient_context=context["patient_context"],
+                    conversation_history=context["conversation_history"]
                 )
+            timing_log["claude_response"] = round(time.time() - step_start, 3)
+            logger.info(f"[Timing] Claude response: {timing_log['claude_response']}s")
 
-            timing_log["parallel_fetch"] = round(time.time() - step_start, 3)
-            logger.info(f"[Timing] Parallel fetch (Chroma + Letta): {timing_log['parallel_fetch']}s (cached: {use_cache})")
+            # 5. Save, then queue analysis/indexing
+            return await self._persist_interaction(
+                patient_id=patient_id,
+                patient_message=patient_message,
+                conversation_type=conversation_type,
+                context=context,
+                claude_result=claude_result,
+                emergency_alert_created=emergency_alert_created,
+                db=db,
+                start_time=start_time,
+                timing_log=timing_log
+            )
 
-            # 4. Get recent conversation history for Claude
-            step_start = time.time()
-            recent_conversations = db.query(Conversation).filter(
-                Conversation.patient_id == patient_id
-            ).order_by(Conversation.created_at.desc()).limit(5).all()
+        except Exception as e:
+            logger.error(f"Error in voice interaction pipeline: {str(e)}", exc_info=True)
+            await db.rollback()
 
-            conversation_history = [
-                {
-                    "patient_message": conv.patient_message,
-                    "ai_response": conv.ai_response
+            return {
+                "ai_response": "I'm having some trouble right now. Let me alert your caregiver to help.",
+                "error": str(e),
+                "response_time": time.time() - start_time,
+                "success": False
+            }
+
+    async def stream_voice_interaction(
+        self,
+        patient_id: str,
+        patient_message: str,
+        db: AsyncSession,
+        conversation_type: str = "spontaneous"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of process_voice_interaction
+
+        Yields the AI response sentence by sentence as Claude generates it, so the
+        mobile app can start TTS on the first sentence. The conversation is saved
+        after the last sentence is generated; analysis, alerts and Chroma indexing
+        are queued exactly as in process_voice_interaction(). Generating and
+        saving run in their own task with their own session (see _stream_turn),
+        so the turn is kept even if the client disconnects before `done`.
+
+        Yields events of the form {"event": <name>, "data": <dict>}:
+        - sentence: {"text": ...} for each complete sentence of the response
+        - done: same payload as process_voice_interaction()
+        - error: {"error": ..., "ai_response": fallback text}
+        """
+        start_time = time.time()
+        timing_log = {}
+
+        try:
+            patient_state = await self._load_patient_state(patient_id, db, timing_log)
+            if patient_state is None:
+                yield {
+                    "event": "error",
+                    "data": {
+                        "error": "Patient not found",
+                        "ai_response": "I'm having trouble accessing your information. Please contact your caregiver."
+                    }
                 }
-                for conv in reversed(recent_conversations)  # Oldest to newest
-            ]
-            timing_log["conversation_history"] = round(time.time() - step_start, 3)
-            logger.info(f"[Timing] Conversation history fetch: {timing_log['conversation_history']}s")
+                return
 
-            # 5. Generate AI response with Claude
-            step_start = time.time()
-            claude_result = await self.claude.analyze_conversation(
+            emergency_alert_created = await self._create_emergency_alert(
+                patient_id=patient_id,
                 patient_message=patient_message,
-                patient_context=patient_context,
-                conversation_history=conversation_history
+                conversation_type=conversation_type,
+                db=db,
+                timing_log=timing_log
             )
 
-            ai_response = claude_result.get("ai_response", "")
-            sentiment = claude_result.get("sentiment", "neutral")
-            health_mentions = claude_result.get("health_mentions", [])
-            urgency_level = claude_result.get("urgency_level", "none")
-            analysis = claude_result.get("analysis", "")
-
-            timing_log["claude_analysis"] = round(time.time() - step_start, 3)
-            logger.info(f"[Timing] Claude analysis: {timing_log['claude_analysis']}s")
+            context = await self._gather_context(
+                patient_id=patient_id,
+                patient_message=patient_message,
+                patient_state=patient_state,
+                timing_log=timing_log
+            )
 
-            # 6. Create conversation record
-            step_start = time.time()
-            new_conversation = Conversation(
+            events: asyncio.Queue = asyncio.Queue()
+            turn = asyncio.create_task(self._stream_turn(
                 patient_id=patient_id,
                 patient_message=patient_message,
-                ai_response=ai_response,
                 conversation_type=conversation_type,
-                letta_context=letta_context,
-                chroma_similar_conversations=similar_conversations,
-                claude_analysis={"detailed_analysis": analysis},
-                sentiment=sentiment,
-                health_mentions=health_mentions,
-                urgency_level=urgency_level,
-                response_time_seconds=time.time() - start_time
-            )
+                context=context,
+                emergency_alert_created=emergency_alert_created,
+                start_time=start_time,
+                timing_log=timing_log,
+                events=events
+            ))
+            self._streamed_turns.add(turn)
+            turn.add_done_callback(self._streamed_turns.discard)
+
+            while (event := await events.get()) is not None:
+                yield event
 
-            db.add(new_conversation)
-            db.flush()  # Get conversation ID
-            timing_log["db_save"] = round(time.time() - step_start, 3)
-            logger.info(f"[Timing] Database save: {timing_log['db_save']}s")
+        except Exception as e:
+            logger.error(f"Error in streaming voice interaction pipeline: {str(e)}", exc_info=True)
+            await db.rollback()
 
-            # 7. Add to Chroma for future semantic search
+            yield _stream_error_event(e)
+
+    async def _stream_turn(
+        self,
+        patient_id: str,
+        patient_message: str,
+        conversation_type: str,
+        context: Dict[str, Any],
+        emergency_alert_created: bool,
+        start_time: float,
+        timing_log: Dict[str, float],
+        events: asyncio.Queue
+    ) -> None:
+        """
+        Stream Claude's response into sentence events, then save the turn
+
+        Runs as its own task so that a disconnecting client (which closes
+        stream_voice_interaction) does not stop the turn from being saved and
+        analysed. Puts sentence events, then done or error, then None.
+        """
+        try:
+            # Stream Claude's response, emitting each sentence as soon as it is complete
             step_start = time.time()
-            await self.chroma.add_conversation(
-                conversation_id=str(new_conversation.id),
-                patient_id=str(patient_id),
+            response_parts: List[str] = []
+            pending_text = ""
+
+            async for delta in self.claude.stream_response(
                 patient_message=patient_message,
-                ai_response=ai_response,
-                metadata={
-                    "sentiment": sentiment,
-                    "health_mentions": health_mentions,
-                    "urgency_level": urgency_level
-                }
+                patient_context=context["patient_context"],
+                conversation_history=context["conversation_history"]
+            ):
+                response_parts.append(delta)
+                sentences, pending_text = _split_complete_sentences(pending_text + delta)
+
+                for sentence in sentences:
+                    if "first_sentence" not in timing_log:
+                        timing_log["first_sentence"] = round(time.time() - start_time, 3)
+                        logger.info(f"[Timing] First sentence ready: {timing_log['first_sentence']}s")
+                    events.put_nowait({"event": "sentence", "data": {"text": sentence}})
+
+            if pending_text.strip():
+                if "first_sentence" not in timing_log:
+                    timing_log["first_sentence"] = round(time.time() - start_time, 3)
+                events.put_nowait({"event": "sentence", "data": {"text": pending_text.strip()}})
+
+            ai_response = "".join(response_parts).strip()
+            timing_log["claude_stream"] = round(time.time() - step_start, 3)
+            logger.info(f"[Timing] Claude stream: {timing_log['claude_stream']}s")
+
+            # The request's session may already be closed by a disconnect
+            async with AsyncSessionLocal() as db:
+                result = await self._persist_interaction(
+                    patient_id=patient_id,
+                    patient_message=patient_message,
+                    conversation_type=conversation_type,
+                    context=context,
+                    claude_result={"ai_response": ai_response},
+                    emergency_alert_created=emergency_alert_created,
+                    db=db,
+                    start_time=start_time,
+                    timing_log=timing_log
+                )
+            result["first_sentence_time"] = timing_log.get("first_sentence")
+
+            events.put_nowait({"event": "done", "data": result})
+
+        except Exception as e:
+            logger.error(f"Error in streaming voice interaction pipeline: {str(e)}", exc_info=True)
+            events.put_nowait(_stream_error_event(e))
+
+        finally:
+            events.put_nowait(None)
+
+    async def wait_for_streamed_turns(self) -> None:
+        """Wait until streamed turns in progress are saved (on shutdown)"""
+        if self._streamed_turns:
+            await asyncio.gather(*self._streamed_turns, return_exceptions=True)
+
+    async def get_patient_state(self, patient_id: str, db: AsyncSession) -> Optional[Dict[str, Any]]:
+        """
+        Get the patient's in-memory voice state (context + recent turns)
+
+        Reloads from the database when the patient is not in memory or their
+        profile, Letta agent or recent turns changed (see patient_context_store).
+
+        Returns:
+            The patient context store entry, or None if the patient does not exist
+        """
+        return await patient_context_store.get(patient_id, db, self._build_patient_context)
+
+    async def _load_patient_state(
+        self,
+        patient_id: str,
+        db: AsyncSession,
+        timing_log: Dict[str, float]
+    ) -> Optional[Dict[str, Any]]:
+        """get_patient_state() with timing"""
+        step_start = time.time()
+        patient_state = await self.get_patient_state(patient_id, db)
+        if patient_state is None:
+            logger.error(f"Patient {patient_id} not found")
+
+        timing_log["patient_context"] = round(time.time() - step_start, 3)
+        logger.info(f"[Timing] Patient context: {timing_log['patient_context']}s")
+        return patient_state
+
+    async def _gather_context(
+        self,
+        patient_id: str,
+        patient_message: str,
+        patient_state: Dict[str, Any],
+        timing_log: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """
+        Collect everything Claude needs before generating a response
+
+        Returns a dict with patient_context, letta_agent_id, letta_context,
+        refresh_letta_context, similar_conversations and conversation_history.
+        """
+        letta_agent_id = patient_state["letta_agent_id"]
+
+        # Letta memory context - cache only. Letta is never called on the voice
+        # path; the memory updater refreshes this cache when it flushes utterances.
+        # On a miss (restart, TTL expiry, invalidation) this turn's utterance is
+        # flushed right away instead of waiting for a full batch, so the context
+        # is back for the following turns.
+        cache_key = f"{patient_id}_{letta_agent_id}"
+        letta_context = await _letta_context_cache.aget(cache_key)
+        refresh_letta_context = (
+            letta_context is None
+            and letta_agent_id is not None
+            and cache_key not in self._letta_refreshes
+        )
+        if letta_context:
+            logger.info(f"[Cache HIT] Using cached Letta context for {patient_id}")
+        elif refresh_letta_context:
+            logger.info(f"[Cache MISS] Letta context for {patient_id} will be refreshed after this turn")
+
+        # Search Chroma for similar past conversations
+        step_start = time.time()
+        similar_conversations = await self.chroma.search_similar_conversations(
+            patient_id=str(patient_id),
+            query_message=patient_message,
+            n_results=2  # Reduced from 3 to 2 for performance
+        )
+
+        timing_log["chroma_search"] = round(time.time() - step_start, 3)
+        logger.info(f"[Timing] Chroma search: {timing_log['chroma_search']}s")
+
+        return {
+            "patient_context": patient_state["patient_context"],
+            "letta_agent_id": letta_agent_id,
+            "letta_context": letta_context or {},
+            "refresh_letta_context": refresh_letta_context,
+            "similar_conversations": similar_conversations,
+            # Recent turns come from the in-memory ring buffer
+            "conversation_history": patient_context_store.get_history(patient_state)
+        }
+
+    async def _create_emergency_alert(
+        self,
+        patient_id: str,
+        patient_message: str,
+        conversation_type: str,
+        db: AsyncSession,
+        timing_log: Dict[str, float]
+    ) -> bool:
+        """
+        Emergency keyword fast-path
+
+        Creates and commits a critical alert before any AI call so it is never
+        delayed by Claude, Letta or the post-response queue.
+
+        Returns:
+            bool: Whether an alert was created
+        """
+        keyword = _detect_emergency(patient_message, conversation_type)
+        if not keyword:
+            return False
+
+        step_start = time.time()
+        alert = Alert(
+            patient_id=patient_id,
+            alert_type="emergency",
+            severity="critical",
+            title="Emergency Detected",
+            description=f"Patient said: {patient_message[:200]}",
+            recommended_action="Contact the patient immediately. If you cannot reach them, call their emergency contact or emergency services.",
+            triggered_by="emergency_keyword"
+        )
+        db.add(alert)
+        await db.commit()
+
+        timing_log["emergency_alert"] = round(time.time() - step_start, 3)
+        logger.critical(
+            f"Emergency alert created for patient {patient_id} "
+            f"(matched '{keyword}') in {timing_log['emergency_alert']}s"
+        )
+        return True
+
+    async def _persist_interaction(
+        self,
+        patient_id: str,
+        patient_message: str,
+        conversation_type: str,
+        context: Dict[str, Any],
+        claude_result: Dict[str, Any],
+        emergency_alert_created: bool,
+        db: AsyncSession,
+        start_time: float,
+        timing_log: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """
+        Save the conversation and queue post-response work
+
+        If claude_result already contains analysis (sentiment etc.) it is stored
+        directly; otherwise the conversation is saved with analysis pending and
+        the analysis job fills it in.
+
+        Returns the voice interaction result dict.
+        """
+        ai_response = claude_result.get("ai_response", "")
+        analysis_pending = "sentiment" not in claude_result
+        urgency_level = claude_result.get("urgency_level", "none")
+        if emergency_alert_created:
+            urgency_level = "critical"
+        similar_conversations = context["similar_conversations"]
+
+        # Save conversation record
+        step_start = time.time()
+        new_conversation = Conversation(
+            patient_id=patient_id,
+            patient_message=patient_message,
+            ai_response=ai_response,
+            conversation_type=conversation_type,
+            letta_context=context["letta_context"],
+            chroma_similar_conversations=similar_conversations,
+            claude_analysis={
+                "status": "pending" if analysis_pending else "complete",
+                "detailed_analysis": claude_result.get("analysis", ""),
+                "analysis_mode": claude_result.get("analysis_mode"),
+                "emergency_alert_created": emergency_alert_created
+            },
+            sentiment=None if analysis_pending else claude_result.get("sentiment", "neutral"),
+            health_mentions=claude_result.get("health_mentions", []),
+            urgency_level=urgency_level,
+            response_time_seconds=time.time() - start_time
+        )
+
+        db.add(new_conversation)
+        await db.commit()
+        timing_log["db_save"] = round(time.time() - step_start, 3)
+
+        # Keep the in-memory history current for the next turn
+        patient_context_store.append_turn(patient_id, new_conversation.id, patient_message, ai_response)
+        logger.info(f"[Timing] Database save: {timing_log['db_save']}s")
+
+        # Analysis, alerts and Chroma indexing run after the reply is returned
+        # Jobs are journaled to disk, so they carry IDs only - never patient data
+        post_response_queue.enqueue("analyze_conversation", {
+            "conversation_id": str(new_conversation.id),
+            "patient_id": str(patient_id)
+        })
+
+        # Letta learns about every utterance, batched off the request path
+        if context["letta_agent_id"]:
+            if context["refresh_letta_context"]:
+                self._letta_refreshes.add(f"{patient_id}_{context['letta_agent_id']}")
+            letta_memory_updater.record(
+                agent_id=context["letta_agent_id"],
+                patient_id=str(patient_id),
+                conversation_id=str(new_conversation.id),
+                flush_now=context["refresh_letta_context"]
             )
-            timing_log["chroma_store"] = round(time.time() - step_start, 3)
-            logger.info(f"[Timing] Chroma storage: {timing_log['chroma_store']}s")
 
-            # 8. Check if alert should be created
-            alert_created = False
-            if urgency_level in ["high", "critical"]:
+        response_time = time.time() - start_time
+
+        # Log complete timing breakdown
+        logger.info(f"[Timing SUMMARY] Total: {response_time:.3f}s | Breakdown: " +
+                   f"Emergency: {timing_log.get('emergency_alert', 0)}s, " +
+                   f"Context: {timing_log.get('patient_context', 0)}s, " +
+                   f"Chroma: {timing_log.get('chroma_search', 0)}s, " +
+                   f"Claude: {timing_log.get('claude_response', timing_log.get('claude_stream', 0))}s, " +
+                   f"DB: {timing_log.get('db_save', 0)}s")
+        logger.info(f"Voice interaction processed for patient {patient_id} in {response_time:.2f}s")
+
+        return {
+            "ai_response": ai_response,
+            "conversation_id": str(new_conversation.id),
+            "sentiment": claude_result.get("sentiment", "neutral"),
+            "health_mentions": claude_result.get("health_mentions", []),
+            "urgency_level": urgency_level,
+            "alert_created": emergency_alert_created,
+            "analysis_pending": analysis_pending,
+            "response_time": response_time,
+            "similar_conversations_found": len(similar_conversations),
+            "success": True
+        }
+
+    async def _run_conversation_analysis(self, payload: Dict[str, Any]) -> None:
+        """
+        Post-response job: analyze a saved conversation and create alerts
+
+        Raises on failure so the queue retries the job.
+        """
+        async with AsyncSessionLocal() as db:
+            conversation = await db.get(Conversation, payload["conversation_id"])
+            if not conversation:
+                logger.warning(f"Conversation {payload['conversation_id']} no longer exists, skipping analysis")
+                return
+
+            claude_analysis = dict(conversation.claude_analysis or {})
+
+            if claude_analysis.get("status") == "pending":
+                patient = await db.get(Patient, conversation.patient_id)
+                analysis = await self.claude.analyze_exchange(
+                    patient_message=conversation.patient_message,
+                    ai_response=conversation.ai_response,
+                    patient_context=self._build_patient_context(patient),
+                    raise_errors=True
+                )
+
+                conversation.sentiment = analysis["sentiment"]
+                conversation.health_mentions = analysis["health_mentions"]
+                # Never downgrade an emergency detected by the keyword fast-path
+                if conversation.urgency_level != "critical":
+                    conversation.urgency_level = analysis["urgency_level"]
+                claude_analysis["detailed_analysis"] = analysis["analysis"]
+                claude_analysis["status"] = "complete"
+
+            urgency_level = conversation.urgency_level
+            if (
+                urgency_level in ["high", "critical"]
+                and not claude_analysis.get("emergency_alert_created")
+                and not claude_analysis.get("alert_created")
+            ):
                 alert = Alert(
-                    patient_id=patient_id,
-                    related_conversation_id=new_conversation.id,
+                    patient_id=conversation.patient_id,
                     alert_type="health_concern" if urgency_level == "high" else "emergency",
                     severity=urgency_level,
                     title=f"{'Emergency' if urgency_level == 'critical' else 'Health Concern'} Detected",
-                    message=f"Patient mentioned: {patient_message[:200]}",
-                    ai_recommendation=analysis
+                    description=f"Patient mentioned: {conversation.patient_message[:200]}",
+                    recommended_action=claude_analysis.get("detailed_analysis") or None,
+                    triggered_by="ai_analysis"
                 )
                 db.add(alert)
-                alert_created = True
-                logger.warning(f"Alert created for patient {patient_id} - urgency: {urgency_level}")
-
-            db.commit()
+                claude_analysis["alert_created"] = True
+                logger.warning(f"Alert created for patient {conversation.patient_id} - urgency: {urgency_level}")
 
-            response_time = time.time() - start_time
+            conversation.claude_analysis = claude_analysis
+            await db.commit()
 
-            # Log complete timing breakdown
-            logger.info(f"[Timing SUMMARY] Total: {response_time:.3f}s | Breakdown: " +
-                       f"Context: {timing_log.get('patient_context', 0)}s, " +
-                       f"Parallel(Letta+Chroma): {timing_log.get('parallel_fetch', 0)}s, " +
-                       f"History: {timing_log.get('conversation_history', 0)}s, " +
-                       f"Claude: {timing_log.get('claude_analysis', 0)}s, " +
-                       f"DB: {timing_log.get('db_save', 0)}s, " +
-                       f"Chroma: {timing_log.get('chroma_store', 0)}s")
-            logger.info(f"Voice interaction processed for patient {patient_id} in {response_time:.2f}s")
+            post_response_queue.enqueue("index_conversation", {
+                "conversation_id": str(conversation.id),
+                "patient_id": str(conversation.patient_id)
+            })
 
-            return {
-                "ai_response": ai_response,
-                "conversation_id": str(new_conversation.id),
-                "sentiment": sentiment,
-                "health_mentions": health_mentions,
-                "urgency_level": urgency_level,
-                "alert_created": alert_created,
-                "response_time": response_time,
-                "similar_conversations_found": len(similar_conversations),
-                "success": True
+    async def _run_letta_memory_update(self, payload: Dict[str, Any]) -> None:
+        """
+        Post-response job: send a batch of utterances to the patient's Letta agent
+
+        The batch names the conversations; their messages are read from the
+        database when the job runs. Refreshes the cached Letta context used by the voice path (batches are
+        flushed early when that context is missing). The queue is
+        the only retry layer for these messages: the client does not retry, and
+        the job raises (so the queue retries it) only when Letta cannot have
+        received the message - a retry after e.g. a read timeout could store
+        the batch twice.
+        """
+        agent_id = payload["agent_id"]
+        cache_key = f"{payload['patient_id']}_{agent_id}"
+        try:
+            # Batches journaled by older versions still carry the messages
+            utterances = payload.get("utterances") or await self._load_utterances(payload["conversation_ids"])
+            if not utterances:
+                logger.info(f"Conversations of Letta batch for agent {agent_id} no longer exist, skipping")
+                return
+
+            result = await self.letta.send_message_to_agent(
+                agent_id=agent_id,
+                message=format_memory_message(utterances),
+                retry=False
+            )
+        finally:
+            # A later cache miss may queue the next refresh
+            self._letta_refreshes.discard(cache_key)
+
+        if not result.get("success"):
+            error = f"Letta memory update failed for agent {agent_id}: {result.get('error', 'unknown error')}"
+            if result.get("retryable"):
+                raise RuntimeError(error)
+            logger.error(f"{error} (not retried, the message may have been received)")
+            return
+
+        await _letta_context_cache.aset(cache_key, result.get("memory_context", {}))
+
+    async def _load_utterances(self, conversation_ids: List[str]) -> List[Dict[str, Any]]:
+        """Patient messages of the given conversations, oldest first (deleted ones are skipped)"""
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(Conversation.patient_message, Conversation.conversation_type, Conversation.created_at)
+                .where(Conversation.id.in_([uuid.UUID(conversation_id) for conversation_id in conversation_ids]))
+                .order_by(Conversation.created_at)
+            )).all()
+
+        return [
+            {
+                "message": row.patient_message,
+                "conversation_type": row.conversation_type,
+                "at": row.created_at.isoformat()
             }
+            for row in rows
+        ]
 
-        except Exception as e:
-            logger.error(f"Error in voice interaction pipeline: {str(e)}", exc_info=True)
-            db.rollback()
+    async def _run_conversation_indexing(self, payload: Dict[str, Any]) -> None:
+        """
+        Post-response job: add a conversation to Chroma for semantic search
 
-            return {
-                "ai_response": "I'm having some trouble right now. Let me alert your caregiver to help.",
-                "error": str(e),
-                "response_time": time.time() - start_time,
-                "success": False
+        Raises on failure so the queue retries the job.
+        """
+        async with AsyncSessionLocal() as db:
+            conversation = await db.get(Conversation, payload["conversation_id"])
+        if not conversation:
+            logger.warning(f"Conversation {payload['conversation_id']} no longer exists, skipping indexing")
+            return
+
+        success = await self.chroma.add_conversation(
+            conversation_id=str(conversation.id),
+            patient_id=str(conversation.patient_id),
+            patient_message=conversation.patient_message,
+            ai_response=conversation.ai_response,
+            metadata={
+                "sentiment": conversation.sentiment or "neutral",
+                "health_mentions": conversation.health_mentions or [],
+                "urgency_level": conversation.urgency_level
             }
+        )
+
+        if not success:
+            raise RuntimeError(f"Chroma indexing failed for conversation {payload['conversation_id']}")
 
     async def generate_daily_summary_for_patient(
         self,
@@ -384,7 +872,7 @@ class AIOrchestrator:
     async def initialize_patient_agent(
         self,
         patient_id: str,
-        db: Session
+        db: AsyncSession
     ) -> bool:
         """
         Initialize Letta agent for a new patient
@@ -397,7 +885,7 @@ class AIOrchestrator:
             bool: Success status
         """
         try:
-            patient = db.query(Patient).filter(Patient.id == patient_id).first()
+            patient = await db.get(Patient, patient_id)
             if not patient:
                 return False
 
@@ -418,7 +906,8 @@ class AIOrchestrator:
             if agent_id:
                 # Update patient record
                 patient.letta_agent_id = agent_id
-                db.commit()
+                await db.commit()
+                self.invalidate_patient(str(patient_id))
                 logger.info(f"Created Letta agent {agent_id} for patient {patient_id}")
                 return True
             else:
@@ -427,9 +916,25 @@ class AIOrchestrator:
 
         except Exception as e:
             logger.error(f"Error initializing patient agent: {str(e)}", exc_info=True)
-            db.rollback()
+            await db.rollback()
             return False
 
+    def invalidate_patient(self, patient_id: str, letta_agent_id: Optional[str] = None) -> None:
+        """
+        Drop cached context for a patient after their profile or Letta agent changes
+
+        The patient context entry is only dropped in this worker; other workers
+        notice the change on their next lookup (see patient_context_store). Passing letta_agent_id deletes from the shared
+        cache with a blocking call, so only sync endpoints pass it.
+
+        Args:
+            patient_id: Patient UUID
+            letta_agent_id: Agent whose cached Letta context should also be dropped
+        """
+        patient_context_store.invalidate(str(patient_id))
+        if letta_agent_id:
+            _letta_context_cache.delete(f"{patient_id}_{letta_agent_id}")
+
     def _build_patient_context(self, patient: Patient) -> Dict[str, Any]:
         """Build patient context dictionary for AI services"""
         return {
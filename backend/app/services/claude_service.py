@@ -4,13 +4,102 @@ Handles real-time conversation understanding and analysis
 """
 
 import anthropic
-from typing import Dict, Any, List, Optional
+import asyncio
+import hashlib
+import httpx
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator
 import logging
 
 from app.core.config import settings
+from app.utils.cache import get_cache
+from app.utils.loop_local import LoopLocal
+from app.utils.metrics import latency_metrics
 
 logger = logging.getLogger(__name__)
 
+SENTIMENTS = ("positive", "neutral", "concerned", "distressed")
+URGENCY_LEVELS = ("none", "low", "medium", "high", "critical")
+
+# Forced tool call that returns the spoken reply and the analysis in one round trip
+RESPOND_TOOL = {
+    "name": "respond_to_patient",
+    "description": "Give the spoken reply to the patient together with an analysis of their message for caregivers.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "response": {
+                "type": "string",
+                "description": "What to say back to the patient (2-3 short sentences)"
+            },
+            "sentiment": {
+                "type": "string",
+                "enum": list(SENTIMENTS),
+                "description": "Overall sentiment of the patient's message"
+            },
+            "health_mentions": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Specific health topics mentioned, e.g. [\"knee pain\", \"medication side effects\"]"
+            },
+            "urgency_level": {
+                "type": "string",
+                "enum": list(URGENCY_LEVELS),
+                "description": (
+                    "critical: emergency, severe pain, falls, chest pain, breathing issues; "
+                    "high: significant health concerns, missed medications, severe discomfort; "
+                    "medium: moderate concerns, mild symptoms, questions about care; "
+                    "low: minor issues, general questions; "
+                    "none: social conversation, positive interactions"
+                )
+            },
+            "detailed_analysis": {
+                "type": "string",
+                "description": "Brief analysis for the caregiver (2-3 sentences)"
+            }
+        },
+        "required": ["response", "sentiment", "health_mentions", "urgency_level", "detailed_analysis"]
+    }
+}
+
+
+# Static part of the companion system prompt - identical for every patient, so it
+# ends in the shared prompt-cache breakpoint. Together with the tools it is below
+# the provider's minimum cacheable prefix (1024 tokens on Sonnet), so it is only
+# cached once the instructions grow past that - cache_control is ignored until then
+ROLE_INSTRUCTIONS = """You are a compassionate AI companion for elderly care named Elda.
+
+Your role:
+1. Be warm, patient, and conversational
+2. Use simple, clear language
+3. Remember their medical conditions and medications
+4. Listen for health concerns, pain, or distress
+5. Encourage medication adherence and healthy habits
+6. Provide companionship and emotional support
+7. Alert caregivers if you detect emergencies or serious concerns
+8. Keep responses brief and easy to understand (2-3 sentences max)
+
+Important:
+- NEVER provide medical advice or diagnose conditions
+- If they mention severe pain, falls, breathing issues, or chest pain, acknowledge their concern and say you're alerting their caregiver
+- Be conversational and natural, like a caring friend
+- Use their personal context to make conversations meaningful
+
+Details about the person you are speaking with follow.
+"""
+
+COMBINED_INSTRUCTIONS = """
+Always answer by calling the respond_to_patient tool. Put exactly what you would say to the patient in "response", and your assessment of their message in the other fields.
+"""
+
+
+def profile_hash(patient_context: Dict[str, Any]) -> str:
+    """Version hash of a patient context (changes whenever any profile field changes)"""
+    canonical = json.dumps(patient_context, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
 
 class ClaudeService:
     """
@@ -20,23 +109,141 @@ class ClaudeService:
 
     def __init__(self):
         """Initialize Claude client"""
-        self.client = anthropic.Anthropic(api_key=settings.CLAUDE_API_KEY)
+        # One pooled async client and concurrency limit per event loop (see LoopLocal)
+        self._clients: LoopLocal[anthropic.AsyncAnthropic] = LoopLocal(self._create_client)
+        self._semaphores: LoopLocal[asyncio.Semaphore] = LoopLocal(
+            lambda: asyncio.Semaphore(settings.CLAUDE_MAX_CONCURRENCY)
+        )
         self.model = "claude-3-5-sonnet-20241022"  # Latest Claude 3.5 Sonnet
+
+        # Rendered per-patient prompt text, keyed by profile hash
+        self._patient_prompts = get_cache(
+            "patient_system_prompt",
+            max_entries=settings.PATIENT_CONTEXT_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PATIENT_CONTEXT_CACHE_TTL_SECONDS,
+            memory_only=True
+        )
+
+        # Token usage per call type, for cached-token reporting
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._usage_lock = threading.Lock()
+
         logger.info("Claude service initialized")
 
+    @property
+    def client(self) -> anthropic.AsyncAnthropic:
+        """Async Claude client for the current event loop"""
+        return self._clients.get()
+
+    def _create_client(self) -> anthropic.AsyncAnthropic:
+        """Create an async client with a bounded keep-alive connection pool"""
+        timeout = httpx.Timeout(
+            settings.CLAUDE_TIMEOUT_SECONDS,
+            connect=settings.CLAUDE_CONNECT_TIMEOUT_SECONDS
+        )
+        return anthropic.AsyncAnthropic(
+            api_key=settings.CLAUDE_API_KEY,
+            timeout=timeout,
+            max_retries=settings.CLAUDE_MAX_RETRIES,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.CLAUDE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.CLAUDE_MAX_CONNECTIONS
+                )
+            )
+        )
+
+    async def _create_message(self, call: str, **kwargs) -> Any:
+        """
+        Call messages.create without blocking the event loop
+
+        At most CLAUDE_MAX_CONCURRENCY calls are in flight per event loop; extra
+        callers wait for a slot instead of piling onto the API.
+
+        Args:
+            call: Call type for usage/latency reporting (e.g. "generate_response")
+        """
+        async with self._semaphores.get():
+            start = time.perf_counter()
+            response = await self.client.messages.create(**kwargs)
+            self._record_usage(call, response.usage, time.perf_counter() - start)
+            return response
+
+    def _record_usage(self, call: str, usage: Any, elapsed: float) -> None:
+        """Log token usage and cached-token ratio for one call and add it to the totals"""
+        input_tokens = usage.input_tokens or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        output_tokens = usage.output_tokens or 0
+
+        total_input = input_tokens + cache_read + cache_write
+        cached_ratio = cache_read / total_input if total_input else 0.0
+
+        latency_metrics.observe(f"claude.{call}", elapsed)
+        logger.info(
+            f"[Claude usage] {call}: input={input_tokens} cache_read={cache_read} "
+            f"cache_write={cache_write} output={output_tokens} "
+            f"cached_ratio={cached_ratio:.0%} in {elapsed:.2f}s"
+        )
+
+        with self._usage_lock:
+            totals = self._usage.setdefault(call, {
+                "calls": 0,
+                "input_tokens": 0,
+                "cache_read_input_tokens": 0,
+                "cache_creation_input_tokens": 0,
+                "output_tokens": 0
+            })
+            totals["calls"] += 1
+            totals["input_tokens"] += input_tokens
+            totals["cache_read_input_tokens"] += cache_read
+            totals["cache_creation_input_tokens"] += cache_write
+            totals["output_tokens"] += output_tokens
+
+    def get_usage_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Token totals and cached-token ratio per call type (exposed at /admin/metrics/claude)"""
+        with self._usage_lock:
+            usage = {call: dict(totals) for call, totals in self._usage.items()}
+
+        for totals in usage.values():
+            total_input = (
+                totals["input_tokens"]
+                + totals["cache_read_input_tokens"]
+                + totals["cache_creation_input_tokens"]
+            )
+            totals["cached_ratio"] = round(totals["cache_read_input_tokens"] / total_input, 3) if total_input else None
+
+        return usage
+
+    async def aclose(self) -> None:
+        """Close the connection pool for the current event loop"""
+        client = self._clients.pop()
+        if client is not None:
+            await client.close()
+
     async def analyze_conversation(
         self,
         patient_message: str,
         patient_context: Dict[str, Any],
-        conversation_history: Optional[List[Dict[str, str]]] = None
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        combined: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Analyze a patient's message and generate appropriate AI response
 
+        By default the reply and the analysis come back from a single tool-use call.
+        If that call fails or returns unusable output, falls back to the reply
+        only (see generate_response) and leaves the analysis to the caller's
+        post-response work, so the fallback adds no second call to the reply.
+        With combined=False, generates the reply and then extracts the metadata
+        (two calls).
+
         Args:
             patient_message: The patient's spoken message
             patient_context: Patient information (name, medical conditions, medications, personal context)
             conversation_history: Recent conversation history for context
+            combined: Use the single-call mode (defaults to settings.CLAUDE_COMBINED_ANALYSIS)
 
         Returns:
             Dict containing:
@@ -45,34 +252,44 @@ class ClaudeService:
             - health_mentions: List of health-related topics mentioned
             - urgency_level: Urgency level (none, low, medium, high, critical)
             - analysis: Detailed analysis for caregivers
+            - analysis_mode: "combined", "two_call" or "deferred" (reply only - the
+              analysis fields are missing)
         """
+        if combined is None:
+            combined = settings.CLAUDE_COMBINED_ANALYSIS
+
+        if combined:
+            try:
+                result = await self._respond_and_analyze(
+                    patient_message=patient_message,
+                    patient_context=patient_context,
+                    conversation_history=conversation_history
+                )
+                return {
+                    **result,
+                    "analysis_mode": "combined",
+                    "response_successful": True
+                }
+
+            except Exception as e:
+                logger.warning(f"Combined Claude analysis failed, falling back to the reply only: {str(e)}")
+                result = await self.generate_response(
+                    patient_message=patient_message,
+                    patient_context=patient_context,
+                    conversation_history=conversation_history
+                )
+                return {**result, "analysis_mode": "deferred"}
+
         try:
             # Build context prompt
             system_prompt = self._build_system_prompt(patient_context)
 
             # Build conversation messages
-            messages = []
-
-            # Add conversation history if available
-            if conversation_history:
-                for conv in conversation_history[-5:]:  # Last 5 conversations for context
-                    messages.append({
-                        "role": "user",
-                        "content": conv.get("patient_message", "")
-                    })
-                    messages.append({
-                        "role": "assistant",
-                        "content": conv.get("ai_response", "")
-                    })
-
-            # Add current message
-            messages.append({
-                "role": "user",
-                "content": patient_message
-            })
+            messages = self._build_messages(patient_message, conversation_history)
 
             # Call Claude API
-            response = self.client.messages.create(
+            response = await self._create_message(
+                "generate_response",
                 model=self.model,
                 max_tokens=1024,
                 system=system_prompt,
@@ -83,7 +300,7 @@ class ClaudeService:
             ai_response = response.content[0].text
 
             # Analyze the conversation for metadata
-            analysis = await self._extract_conversation_metadata(
+            analysis = await self.analyze_exchange(
                 patient_message=patient_message,
                 ai_response=ai_response,
                 patient_context=patient_context
@@ -91,10 +308,8 @@ class ClaudeService:
 
             return {
                 "ai_response": ai_response,
-                "sentiment": analysis.get("sentiment", "neutral"),
-                "health_mentions": analysis.get("health_mentions", []),
-                "urgency_level": analysis.get("urgency_level", "none"),
-                "analysis": analysis.get("detailed_analysis", ""),
+                **analysis,
+                "analysis_mode": "two_call",
                 "response_successful": True
             }
 
@@ -106,14 +321,219 @@ class ClaudeService:
                 "health_mentions": [],
                 "urgency_level": "medium",  # Flag technical issues
                 "analysis": f"Error occurred: {str(e)}",
+                "analysis_mode": "two_call",
                 "response_successful": False
             }
 
+    async def _respond_and_analyze(
+        self,
+        patient_message: str,
+        patient_context: Dict[str, Any],
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate the reply and the analysis with one forced tool call
+
+        Raises:
+            ValueError: If the tool output is missing, truncated or invalid
+        """
+        system_prompt = self._build_system_prompt(patient_context, extra_instructions=COMBINED_INSTRUCTIONS)
+        messages = self._build_messages(patient_message, conversation_history)
+
+        response = await self._create_message(
+            "respond_and_analyze",
+            model=self.model,
+            max_tokens=1024,
+            system=system_prompt,
+            messages=messages,
+            tools=[RESPOND_TOOL],
+            tool_choice={"type": "tool", "name": RESPOND_TOOL["name"]}
+        )
+
+        if response.stop_reason == "max_tokens":
+            raise ValueError("Tool output was truncated")
+
+        tool_input = next(
+            (
+                block.input for block in response.content
+                if block.type == "tool_use" and block.name == RESPOND_TOOL["name"]
+            ),
+            None
+        )
+        if not isinstance(tool_input, dict):
+            raise ValueError("No respond_to_patient tool call in response")
+
+        return self._parse_combined_output(tool_input)
+
+    def _parse_combined_output(self, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and normalize respond_to_patient tool input
+
+        Raises:
+            ValueError: If the reply is empty or sentiment/urgency are not recognized
+        """
+        ai_response = tool_input.get("response")
+        if not isinstance(ai_response, str) or not ai_response.strip():
+            raise ValueError("Empty response in tool output")
+
+        sentiment = str(tool_input.get("sentiment", "")).strip().lower()
+        if sentiment not in SENTIMENTS:
+            raise ValueError(f"Unknown sentiment: {sentiment!r}")
+
+        urgency_level = str(tool_input.get("urgency_level", "")).strip().lower()
+        if urgency_level not in URGENCY_LEVELS:
+            raise ValueError(f"Unknown urgency level: {urgency_level!r}")
+
+        health_mentions = tool_input.get("health_mentions") or []
+        if isinstance(health_mentions, str):
+            health_mentions = [health_mentions]
+        if not isinstance(health_mentions, list):
+            raise ValueError("health_mentions is not a list")
+
+        return {
+            "ai_response": ai_response.strip(),
+            "sentiment": sentiment,
+            "health_mentions": [str(mention) for mention in health_mentions if mention],
+            "urgency_level": urgency_level,
+            "analysis": str(tool_input.get("detailed_analysis") or "")
+        }
+
+    async def generate_response(
+        self,
+        patient_message: str,
+        patient_context: Dict[str, Any],
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate the AI response only, without metadata analysis
+
+        Used on the voice critical path; analysis runs later via analyze_exchange().
+
+        Returns:
+            Dict containing:
+            - ai_response: The response to speak back to the patient
+            - response_successful: False if the fallback response was used
+        """
+        try:
+            system_prompt = self._build_system_prompt(patient_context)
+            messages = self._build_messages(patient_message, conversation_history)
+
+            response = await self._create_message(
+                "generate_response",
+                model=self.model,
+                max_tokens=1024,
+                system=system_prompt,
+                messages=messages
+            )
+
+            return {
+                "ai_response": response.content[0].text,
+                "response_successful": True
+            }
+
+        except Exception as e:
+            logger.error(f"Error generating Claude response: {str(e)}", exc_info=True)
+            return {
+                "ai_response": "I'm having trouble understanding right now. Let me get your caregiver to help.",
+                "response_successful": False,
+                "error": str(e)
+            }
+
+    async def stream_response(
+        self,
+        patient_message: str,
+        patient_context: Dict[str, Any],
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the AI response text as Claude generates it
+
+        Yields text deltas in order. Metadata analysis is not performed here;
+        call analyze_exchange() with the complete response once streaming ends.
+        The concurrency slot is released as soon as Claude finishes; deltas the
+        caller has not consumed yet are buffered.
+
+        Args:
+            patient_message: The patient's spoken message
+            patient_context: Patient information
+            conversation_history: Recent conversation history for context
+
+        Yields:
+            Text fragments of the response
+        """
+        system_prompt = self._build_system_prompt(patient_context)
+        messages = self._build_messages(patient_message, conversation_history)
+
+        deltas: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read_stream(system_prompt, messages, deltas))
+        try:
+            while (text := await deltas.get()) is not None:
+                yield text
+            await reader  # Re-raises a failed stream
+        finally:
+            reader.cancel()
+
+    async def _read_stream(
+        self,
+        system_prompt: List[Dict[str, Any]],
+        messages: List[Dict[str, str]],
+        deltas: asyncio.Queue
+    ) -> None:
+        """Read a streamed response into a queue of text deltas (None marks the end)"""
+        try:
+            async with self._semaphores.get():
+                start = time.perf_counter()
+                async with self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=1024,
+                    system=system_prompt,
+                    messages=messages
+                ) as stream:
+                    async for text in stream.text_stream:
+                        deltas.put_nowait(text)
+
+                    final_message = await stream.get_final_message()
+                self._record_usage("stream_response", final_message.usage, time.perf_counter() - start)
+        finally:
+            deltas.put_nowait(None)
+
+    async def analyze_exchange(
+        self,
+        patient_message: str,
+        ai_response: str,
+        patient_context: Dict[str, Any],
+        raise_errors: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Analyze a completed patient/AI exchange
+
+        Args:
+            raise_errors: Raise on API/parse errors instead of returning neutral defaults
+                (lets queued callers retry)
+
+        Returns:
+            Dict containing sentiment, health_mentions, urgency_level and analysis
+        """
+        analysis = await self._extract_conversation_metadata(
+            patient_message=patient_message,
+            ai_response=ai_response,
+            patient_context=patient_context,
+            raise_errors=raise_errors
+        )
+
+        return {
+            "sentiment": analysis.get("sentiment", "neutral"),
+            "health_mentions": analysis.get("health_mentions", []),
+            "urgency_level": analysis.get("urgency_level", "none"),
+            "analysis": analysis.get("detailed_analysis", "")
+        }
+
     async def _extract_conversation_metadata(
         self,
         patient_message: str,
         ai_response: str,
-        patient_context: Dict[str, Any]
+        patient_context: Dict[str, Any],
+        raise_errors: bool = False
     ) -> Dict[str, Any]:
         """
         Extract metadata from the conversation for analytics
@@ -150,7 +570,8 @@ Consider urgency_level:
 
 Return ONLY valid JSON."""
 
-            response = self.client.messages.create(
+            response = await self._create_message(
+                "extract_metadata",
                 model=self.model,
                 max_tokens=512,
                 messages=[{
@@ -174,6 +595,8 @@ Return ONLY valid JSON."""
 
         except Exception as e:
             logger.error(f"Error extracting conversation metadata: {str(e)}", exc_info=True)
+            if raise_errors:
+                raise
             return {
                 "sentiment": "neutral",
                 "health_mentions": [],
@@ -181,17 +604,78 @@ Return ONLY valid JSON."""
                 "detailed_analysis": "Unable to analyze conversation"
             }
 
-    def _build_system_prompt(self, patient_context: Dict[str, Any]) -> str:
+    def _build_messages(
+        self,
+        patient_message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> List[Dict[str, str]]:
         """
-        Build system prompt for Claude with patient context
+        Build the Claude message list from recent history plus the current message
         """
+        messages = []
+
+        # Add conversation history if available
+        if conversation_history:
+            for conv in conversation_history[-5:]:  # Last 5 conversations for context
+                messages.append({
+                    "role": "user",
+                    "content": conv.get("patient_message", "")
+                })
+                messages.append({
+                    "role": "assistant",
+                    "content": conv.get("ai_response", "")
+                })
+
+        # Add current message
+        messages.append({
+            "role": "user",
+            "content": patient_message
+        })
+
+        return messages
+
+    def _build_system_prompt(
+        self,
+        patient_context: Dict[str, Any],
+        extra_instructions: str = ""
+    ) -> List[Dict[str, Any]]:
+        """
+        Build system prompt blocks for Claude with patient context
+
+        Block 1 is the static role instructions (shared by all patients), block 2
+        the patient's profile. With CLAUDE_PROMPT_CACHING block 1 ends in the
+        single cache breakpoint: the tools and instructions are the only prefix
+        shared by every turn of every patient. The profile block is too short to
+        be worth a breakpoint of its own.
+        """
+        static_block = {"type": "text", "text": ROLE_INSTRUCTIONS + extra_instructions}
+        if settings.CLAUDE_PROMPT_CACHING:
+            static_block["cache_control"] = {"type": "ephemeral"}
+
+        return [
+            static_block,
+            {"type": "text", "text": self._render_patient_prompt(patient_context)}
+        ]
+
+    def _render_patient_prompt(self, patient_context: Dict[str, Any]) -> str:
+        """
+        Render the patient-specific part of the system prompt
+
+        Memoized by profile hash - a profile edit produces a new hash, so stale
+        prompts are never served and need no invalidation.
+        """
+        version = profile_hash(patient_context)
+        prompt = self._patient_prompts.get(version)
+        if prompt is not None:
+            return prompt
+
         patient_name = patient_context.get("preferred_name") or patient_context.get("first_name", "there")
         age = patient_context.get("age", "")
         medical_conditions = patient_context.get("medical_conditions", [])
         medications = patient_context.get("medications", [])
         personal_context = patient_context.get("personal_context", {})
 
-        prompt = f"""You are a compassionate AI companion for elderly care named Elda. You are speaking with {patient_name}"""
+        prompt = f"""You are speaking with {patient_name}"""
 
         if age:
             prompt += f", who is {age} years old"
@@ -209,23 +693,7 @@ Return ONLY valid JSON."""
             for key, value in personal_context.items():
                 prompt += f"- {key}: {value}\n"
 
-        prompt += """
-Your role:
-1. Be warm, patient, and conversational
-2. Use simple, clear language
-3. Remember their medical conditions and medications
-4. Listen for health concerns, pain, or distress
-5. Encourage medication adherence and healthy habits
-6. Provide companionship and emotional support
-7. Alert caregivers if you detect emergencies or serious concerns
-8. Keep responses brief and easy to understand (2-3 sentences max)
-
-Important:
-- NEVER provide medical advice or diagnose conditions
-- If they mention severe pain, falls, breathing issues, or chest pain, acknowledge their concern and say you're alerting their caregiver
-- Be conversational and natural, like a caring friend
-- Use their personal context to make conversations meaningful
-"""
+        self._patient_prompts.set(version, prompt)
         return prompt
 
     async def generate_daily_summary(
@@ -280,7 +748,8 @@ Provide a JSON response with:
 
 Return ONLY valid JSON."""
 
-            response = self.client.messages.create(
+            response = await self._create_message(
+                "daily_summary",
                 model=self.model,
                 max_tokens=1024,
                 messages=[{
@@ -5,11 +5,14 @@ Handles push notifications to mobile devices
 
 import logging
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# FCM limit on messages per send_each call
+FCM_MAX_BATCH_SIZE = 500
+
 
 class FirebaseService:
     """
@@ -103,37 +106,12 @@ class FirebaseService:
         try:
             from firebase_admin import messaging
 
-            # Create notification message
-            message = messaging.Message(
-                token=device_token,
-                notification=messaging.Notification(
-                    title="Reminder",
-                    body=speak_text[:100]  # Truncate for notification
-                ),
-                data={
-                    "type": "reminder",
-                    "reminder_id": reminder_id,
-                    "reminder_type": reminder_type,
-                    "speak_text": speak_text,
-                    **{k: str(v) for k, v in kwargs.items()}
-                },
-                android=messaging.AndroidConfig(
-                    priority="high",
-                    notification=messaging.AndroidNotification(
-                        sound="default",
-                        channel_id="reminders",
-                        priority="high"
-                    )
-                ),
-                apns=messaging.APNSConfig(
-                    payload=messaging.APNSPayload(
-                        aps=messaging.Aps(
-                            sound="default",
-                            content_available=True,
-                            badge=1
-                        )
-                    )
-                )
+            message = self._build_reminder_message(
+                device_token=device_token,
+                reminder_id=reminder_id,
+                speak_text=speak_text,
+                reminder_type=reminder_type,
+                **kwargs
             )
 
             # Send message
@@ -145,6 +123,88 @@ class FirebaseService:
             logger.error(f"Failed to send reminder notification: {e}")
             return False
 
+    def send_reminders_batch(self, reminders: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Send many reminder notifications in one FCM call (send_each)
+
+        Blocking - called from the notification dispatcher's thread pool.
+
+        Args:
+            reminders: Keyword arguments for send_reminder, one dict per device
+                (at most FCM_MAX_BATCH_SIZE)
+
+        Returns:
+            Per-reminder success flags, in order
+        """
+        if not self._initialized:
+            for reminder in reminders:
+                logger.info(
+                    f"[MOCKED] Would send reminder to device {reminder['device_token'][:10]}..."
+                )
+            return [True] * len(reminders)
+
+        try:
+            from firebase_admin import messaging
+
+            messages = [self._build_reminder_message(**reminder) for reminder in reminders]
+            batch_response = messaging.send_each(messages)
+
+            results = []
+            for reminder, response in zip(reminders, batch_response.responses):
+                if not response.success:
+                    logger.warning(
+                        f"Failed to send reminder {reminder['reminder_id']}: {response.exception}"
+                    )
+                results.append(response.success)
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to send reminder batch of {len(reminders)}: {e}")
+            return [False] * len(reminders)
+
+    def _build_reminder_message(
+        self,
+        device_token: str,
+        reminder_id: str,
+        speak_text: str,
+        reminder_type: str = "medication",
+        **kwargs
+    ):
+        """Build the FCM message for a reminder"""
+        from firebase_admin import messaging
+
+        return messaging.Message(
+            token=device_token,
+            notification=messaging.Notification(
+                title="Reminder",
+                body=speak_text[:100]  # Truncate for notification
+            ),
+            data={
+                "type": "reminder",
+                "reminder_id": reminder_id,
+                "reminder_type": reminder_type,
+                "speak_text": speak_text,
+                **{k: str(v) for k, v in kwargs.items()}
+            },
+            android=messaging.AndroidConfig(
+                priority="high",
+                notification=messaging.AndroidNotification(
+                    sound="default",
+                    channel_id="reminders",
+                    priority="high"
+                )
+            ),
+            apns=messaging.APNSConfig(
+                payload=messaging.APNSPayload(
+                    aps=messaging.Aps(
+                        sound="default",
+                        content_available=True,
+                        badge=1
+                    )
+                )
+            )
+        )
+
     async def send_alert(
         self,
         device_token: str,
@@ -0,0 +1,137 @@
+"""
+Notification Dispatcher
+Batched, concurrent push fan-out for the reminder jobs
+
+Reminder notifications are grouped into FCM send_each batches (up to 500
+messages per call) and the batches are sent on a persistent thread pool with
+bounded concurrency, so a tick with thousands of due reminders finishes in a
+few FCM round trips instead of one event loop and one request per reminder.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from app.core.config import settings
+from app.services.communication.firebase_service import FCM_MAX_BATCH_SIZE, firebase_service
+from app.utils.metrics import latency_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Sends reminder notifications in batches on a shared thread pool
+
+    Usage:
+        notification_dispatcher.send_reminders([
+            {"device_token": "...", "reminder_id": "...", "speak_text": "...", ...}
+        ])
+    """
+
+    def __init__(self, batch_size: int = FCM_MAX_BATCH_SIZE, max_concurrent_batches: int = 4):
+        """Initialize dispatcher (the thread pool is created on first use)"""
+        self.batch_size = max(1, min(batch_size, FCM_MAX_BATCH_SIZE))
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "sent": 0, "failed": 0, "last_batch": None}
+
+    def send_reminders(self, reminders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Send reminder notifications and wait for all batches to finish
+
+        Args:
+            reminders: Keyword arguments for firebase_service.send_reminder, one dict per device
+
+        Returns:
+            Totals for this call: sent, failed, batches, seconds
+        """
+        if not reminders:
+            return {"sent": 0, "failed": 0, "batches": 0, "seconds": 0.0}
+
+        start = time.perf_counter()
+        batches = [
+            reminders[offset:offset + self.batch_size]
+            for offset in range(0, len(reminders), self.batch_size)
+        ]
+
+        results = list(self._get_executor().map(self._send_batch, batches))
+
+        sent = sum(result["sent"] for result in results)
+        failed = sum(result["failed"] for result in results)
+        seconds = time.perf_counter() - start
+
+        logger.info(
+            f"Dispatched {len(reminders)} reminder notifications in {len(batches)} batches: "
+            f"{sent} sent, {failed} failed in {seconds:.2f}s "
+            f"({len(reminders) / seconds if seconds else 0:.0f} msg/s)"
+        )
+
+        return {"sent": sent, "failed": failed, "batches": len(batches), "seconds": round(seconds, 3)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get totals and the most recent batch's throughput"""
+        with self._lock:
+            return {
+                **self._stats,
+                "batch_size": self.batch_size,
+                "max_concurrent_batches": self.max_concurrent_batches
+            }
+
+    def shutdown(self) -> None:
+        """Wait for in-flight batches and stop the thread pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _send_batch(self, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send one batch (runs on the thread pool)"""
+        start = time.perf_counter()
+        with latency_metrics.timer("fcm.send_each"):
+            results = firebase_service.send_reminders_batch(batch)
+        seconds = time.perf_counter() - start
+
+        sent = sum(1 for success in results if success)
+        failed = len(results) - sent
+        batch_stats = {
+            "size": len(batch),
+            "sent": sent,
+            "failed": failed,
+            "seconds": round(seconds, 3),
+            "messages_per_second": round(len(batch) / seconds, 1) if seconds else None
+        }
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["sent"] += sent
+            self._stats["failed"] += failed
+            self._stats["last_batch"] = batch_stats
+
+        logger.debug(
+            f"FCM batch of {len(batch)}: {sent} sent, {failed} failed in {seconds:.2f}s "
+            f"({batch_stats['messages_per_second']} msg/s)"
+        )
+        return batch_stats
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the shared thread pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_batches,
+                    thread_name_prefix="fcm-dispatch"
+                )
+            return self._executor
+
+
+# Global instance
+notification_dispatcher = NotificationDispatcher(
+    batch_size=settings.PUSH_BATCH_SIZE,
+    max_concurrent_batches=settings.PUSH_MAX_CONCURRENT_BATCHES
+)
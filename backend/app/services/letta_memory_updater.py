@@ -0,0 +1,163 @@
+"""
+Letta Memory Updater
+Write-behind batching of patient utterances to their Letta agents
+
+Voice turns never call Letta directly. Each utterance is buffered per agent (as
+the ID of its saved conversation) and flushed as one Letta message when the
+batch is full or the flush interval has passed. Flushed batches go through the post-response queue, so they are journaled
+and retried by the queue (the Letta client does not retry them as well); on
+shutdown all buffers are flushed into the queue journal before it stops.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.post_response_queue import post_response_queue
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = "letta_memory_update"
+
+
+class LettaMemoryUpdater:
+    """
+    Buffers utterances per Letta agent and flushes them in batches
+
+    Usage:
+        letta_memory_updater.record(agent_id, patient_id, conversation_id)
+    """
+
+    def __init__(self, batch_size: int = 10, flush_interval_seconds: float = 30.0):
+        """Initialize empty buffers (flush loop is started by start())"""
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._buffers: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"recorded": 0, "batches_flushed": 0}
+
+    def record(
+        self,
+        agent_id: str,
+        patient_id: str,
+        conversation_id: str,
+        flush_now: bool = False
+    ) -> None:
+        """
+        Buffer one patient utterance (a saved conversation) for the agent
+
+        Flushes immediately when the agent's buffer reaches batch_size, or when
+        flush_now is set (used when the cached Letta context is missing, so the
+        memory update that refills it does not wait for a full batch).
+        """
+        batch = None
+        with self._lock:
+            buffer = self._buffers.setdefault(agent_id, {
+                "patient_id": str(patient_id),
+                "conversation_ids": [],
+                "first_at": time.monotonic()
+            })
+            buffer["conversation_ids"].append(str(conversation_id))
+            self._stats["recorded"] += 1
+
+            if flush_now or len(buffer["conversation_ids"]) >= self.batch_size:
+                batch = self._buffers.pop(agent_id)
+
+        if batch:
+            self._enqueue(agent_id, batch)
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Flush buffers older than the flush interval (or all buffers if force)
+
+        Returns:
+            Number of batches flushed
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            due = [
+                agent_id for agent_id, buffer in self._buffers.items()
+                if force or now - buffer["first_at"] >= self.flush_interval_seconds
+            ]
+            batches = [(agent_id, self._buffers.pop(agent_id)) for agent_id in due]
+
+        for agent_id, batch in batches:
+            self._enqueue(agent_id, batch)
+
+        return len(batches)
+
+    async def start(self) -> None:
+        """Start the periodic flush loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+            logger.info(
+                f"Letta memory updater started (batch size {self.batch_size}, "
+                f"flush interval {self.flush_interval_seconds}s)"
+            )
+
+    async def stop(self) -> None:
+        """Stop the flush loop and flush everything that is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        flushed = self.flush(force=True)
+        logger.info(f"Letta memory updater stopped ({flushed} batches flushed)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters and current buffer sizes"""
+        with self._lock:
+            buffered = sum(len(buffer["conversation_ids"]) for buffer in self._buffers.values())
+            agents = len(self._buffers)
+
+        return {
+            **self._stats,
+            "buffered_utterances": buffered,
+            "buffered_agents": agents,
+            "running": self._task is not None
+        }
+
+    async def _flush_loop(self) -> None:
+        """Check for due buffers a few times per flush interval"""
+        tick = max(0.5, self.flush_interval_seconds / 4)
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing Letta memory buffers: {e}", exc_info=True)
+
+    def _enqueue(self, agent_id: str, batch: Dict[str, Any]) -> None:
+        """Hand a batch to the post-response queue (IDs only - the job reads the messages)"""
+        post_response_queue.enqueue(JOB_TYPE, {
+            "agent_id": agent_id,
+            "patient_id": batch["patient_id"],
+            "conversation_ids": batch["conversation_ids"]
+        })
+        self._stats["batches_flushed"] += 1
+        logger.debug(f"Flushed {len(batch['conversation_ids'])} utterances for Letta agent {agent_id}")
+
+
+def format_memory_message(utterances: List[Dict[str, Any]]) -> str:
+    """Build the single Letta message for a batch of utterances"""
+    if len(utterances) == 1:
+        return f"Patient said: {utterances[0]['message']}"
+
+    lines = [f"Patient said ({len(utterances)} messages, oldest first):"]
+    for utterance in utterances:
+        lines.append(f"- [{utterance['at'][:16].replace('T', ' ')} UTC, {utterance['conversation_type']}] {utterance['message']}")
+    return "\n".join(lines)
+
+
+# Global instance
+letta_memory_updater = LettaMemoryUpdater(
+    batch_size=settings.LETTA_MEMORY_BATCH_SIZE,
+    flush_interval_seconds=settings.LETTA_MEMORY_FLUSH_INTERVAL_SECONDS
+)
@@ -4,14 +4,23 @@ Handles long-term memory, pattern recognition, and behavioral insights
 """
 
 import httpx
+import asyncio
+import random
 from typing import Dict, Any, List, Optional
 import logging
 import json
 
 from app.core.config import settings
+from app.utils.loop_local import LoopLocal
+from app.utils.metrics import latency_metrics
 
 logger = logging.getLogger(__name__)
 
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Failures where Letta never processed the request (safe to retry a POST)
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+NOT_PROCESSED_STATUSES = {429, 503}
+
 
 class LettaService:
     """
@@ -28,8 +37,132 @@ class LettaService:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # One long-lived pooled client per event loop (see LoopLocal)
+        self._clients: LoopLocal[httpx.AsyncClient] = LoopLocal(self._create_client)
         logger.info("Letta service initialized")
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client for the current event loop"""
+        return self._clients.get()
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create a keep-alive client with connection limits (HTTP/2 if enabled and available)"""
+        http2 = settings.LETTA_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("LETTA_HTTP2 is enabled but the h2 package is not installed, using HTTP/1.1")
+                http2 = False
+
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=http2,
+            timeout=httpx.Timeout(
+                settings.LETTA_TIMEOUT_SECONDS,
+                connect=settings.LETTA_CONNECT_TIMEOUT_SECONDS
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.LETTA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LETTA_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+
+    async def aclose(self) -> None:
+        """Close the connection pool for the current event loop"""
+        client = self._clients.pop()
+        if client is not None:
+            await client.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        max_retries: Optional[int] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request to Letta, retrying failures that are safe to retry
+
+        Idempotent methods are retried on 429/5xx and any connection error.
+        Other methods (POST) are only retried when Letta cannot have processed
+        the request: 429/503 and errors before the request was sent.
+        Retries use full-jitter exponential backoff (or Retry-After when given).
+        Total latency including retries is recorded under letta.<endpoint>.
+
+        Args:
+            method: HTTP method
+            path: Path relative to LETTA_BASE_URL
+            endpoint: Short endpoint name for latency metrics
+            max_retries: Retry limit (defaults to LETTA_MAX_RETRIES, 0 when the
+                caller retries itself)
+
+        Returns:
+            The final response (may still be an error status after retries)
+        """
+        if max_retries is None:
+            max_retries = settings.LETTA_MAX_RETRIES
+
+        with latency_metrics.timer(f"letta.{endpoint}"):
+            for attempt in range(max_retries + 1):
+                try:
+                    response = await self.client.request(method, path, **kwargs)
+                except httpx.TransportError as e:
+                    if attempt >= max_retries or not self.is_retry_safe(method, error=e):
+                        raise
+                    delay = self._retry_delay(attempt)
+                    logger.warning(f"Letta {endpoint} connection error, retrying in {delay:.2f}s: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status_code != 429 and response.status_code < 500:
+                    return response
+                if attempt >= max_retries or not self.is_retry_safe(method, status_code=response.status_code):
+                    return response
+
+                delay = self._retry_delay(attempt, response.headers.get("retry-after"))
+                logger.warning(f"Letta {endpoint} returned {response.status_code}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        return response
+
+    @staticmethod
+    def is_retry_safe(
+        method: str,
+        status_code: Optional[int] = None,
+        error: Optional[Exception] = None
+    ) -> bool:
+        """
+        Check whether a failed request may be sent again
+
+        Args:
+            method: HTTP method of the failed request
+            status_code: Error status, if a response was received
+            error: Exception, if no response was received
+
+        Returns:
+            True if a retry cannot apply the request twice
+        """
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        if error is not None:
+            return isinstance(error, NOT_SENT_ERRORS)
+        return status_code in NOT_PROCESSED_STATUSES
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Backoff delay for the given attempt (0-based)"""
+        if retry_after:
+            try:
+                return min(float(retry_after), settings.LETTA_RETRY_MAX_SECONDS)
+            except ValueError:
+                pass  # HTTP-date form, fall back to backoff
+
+        ceiling = min(settings.LETTA_RETRY_BASE_SECONDS * (2 ** attempt), settings.LETTA_RETRY_MAX_SECONDS)
+        return random.uniform(0, ceiling)
+
     async def create_agent_for_patient(
         self,
         patient_id: str,
@@ -46,30 +179,29 @@ class LettaService:
             agent_id: Letta agent ID
         """
         try:
-            async with httpx.AsyncClient() as client:
-                # Create agent with patient context
-                agent_data = {
-                    "name": f"patient_{patient_id}",
-                    "persona": self._build_patient_persona(patient_context),
-                    "human": self._build_caregiver_human(),
-                    "project_id": self.project_id
-                }
+            # Create agent with patient context
+            agent_data = {
+                "name": f"patient_{patient_id}",
+                "persona": self._build_patient_persona(patient_context),
+                "human": self._build_caregiver_human(),
+                "project_id": self.project_id
+            }
+
+            response = await self._request(
+                "POST",
+                "/v1/agents",
+                endpoint="create_agent",
+                json=agent_data
+            )
 
-                response = await client.post(
-                    f"{self.base_url}/v1/agents",
-                    headers=self.headers,
-                    json=agent_data,
-                    timeout=30.0
-                )
-
-                if response.status_code in [200, 201]:  # Accept both 200 OK and 201 Created
-                    agent = response.json()
-                    agent_id = agent.get("id")
-                    logger.info(f"Created Letta agent {agent_id} for patient {patient_id}")
-                    return agent_id
-                else:
-                    logger.error(f"Failed to create Letta agent: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code in [200, 201]:  # Accept both 200 OK and 201 Created
+                agent = response.json()
+                agent_id = agent.get("id")
+                logger.info(f"Created Letta agent {agent_id} for patient {patient_id}")
+                return agent_id
+            else:
+                logger.error(f"Failed to create Letta agent: {response.status_code} - {response.text}")
+                return None
 
         except Exception as e:
             logger.error(f"Error creating Letta agent: {str(e)}", exc_info=True)
@@ -79,7 +211,8 @@ class LettaService:
         self,
         agent_id: str,
         message: str,
-        conversation_context: Optional[Dict[str, Any]] = None
+        conversation_context: Optional[Dict[str, Any]] = None,
+        retry: bool = True
     ) -> Dict[str, Any]:
         """
         Send a message to Letta agent and get memory-aware response
@@ -88,48 +221,52 @@ class LettaService:
             agent_id: Letta agent ID
             message: Message to send
             conversation_context: Additional context
+            retry: Retry in the client (False when the caller retries the message)
 
         Returns:
             Dict containing:
             - letta_response: Agent's response
             - memory_context: Relevant memories retrieved
             - patterns_detected: Behavioral patterns detected
+            - retryable: On failure, whether Letta cannot have received the message
         """
         try:
-            async with httpx.AsyncClient() as client:
-                message_data = {
-                    "message": message,
-                    "stream": False
-                }
+            message_data = {
+                "message": message,
+                "stream": False
+            }
+
+            response = await self._request(
+                "POST",
+                f"/v1/agents/{agent_id}/messages",
+                endpoint="send_message",
+                max_retries=None if retry else 0,
+                json=message_data
+            )
+
+            if response.status_code == 200:
+                letta_response = response.json()
+
+                # Extract memories and patterns
+                messages = letta_response.get("messages", [])
+                memory_context = self._extract_memory_context(messages)
 
-                response = await client.post(
-                    f"{self.base_url}/v1/agents/{agent_id}/messages",
-                    headers=self.headers,
-                    json=message_data,
-                    timeout=30.0
-                )
-
-                if response.status_code == 200:
-                    letta_response = response.json()
-
-                    # Extract memories and patterns
-                    messages = letta_response.get("messages", [])
-                    memory_context = self._extract_memory_context(messages)
-
-                    return {
-                        "letta_response": letta_response,
-                        "memory_context": memory_context,
-                        "patterns_detected": [],
-                        "success": True
-                    }
-                else:
-                    logger.error(f"Failed to send message to Letta: {response.status_code}")
-                    return {
-                        "letta_response": None,
-                        "memory_context": {},
-                        "patterns_detected": [],
-                        "success": False
-                    }
+                return {
+                    "letta_response": letta_response,
+                    "memory_context": memory_context,
+                    "patterns_detected": [],
+                    "success": True
+                }
+            else:
+                logger.error(f"Failed to send message to Letta: {response.status_code}")
+                return {
+                    "letta_response": None,
+                    "memory_context": {},
+                    "patterns_detected": [],
+                    "success": False,
+                    "retryable": self.is_retry_safe("POST", status_code=response.status_code),
+                    "error": f"HTTP {response.status_code}"
+                }
 
         except Exception as e:
             logger.error(f"Error sending message to Letta: {str(e)}", exc_info=True)
@@ -138,6 +275,7 @@ class LettaService:
                 "memory_context": {},
                 "patterns_detected": [],
                 "success": False,
+                "retryable": self.is_retry_safe("POST", error=e),
                 "error": str(e)
             }
 
@@ -157,32 +295,31 @@ class LettaService:
             Dict containing insights and patterns
         """
         try:
-            async with httpx.AsyncClient() as client:
-                # Get agent memory
-                response = await client.get(
-                    f"{self.base_url}/v1/agents/{agent_id}/memory",
-                    headers=self.headers,
-                    timeout=30.0
-                )
-
-                if response.status_code == 200:
-                    memory_data = response.json()
-
-                    # Analyze patterns from memory
-                    patterns = self._analyze_memory_patterns(memory_data, analysis_type)
-
-                    return {
-                        "patterns": patterns,
-                        "memory_summary": memory_data,
-                        "success": True
-                    }
-                else:
-                    logger.error(f"Failed to get agent memory: {response.status_code}")
-                    return {
-                        "patterns": [],
-                        "memory_summary": {},
-                        "success": False
-                    }
+            # Get agent memory
+            response = await self._request(
+                "GET",
+                f"/v1/agents/{agent_id}/memory",
+                endpoint="get_memory"
+            )
+
+            if response.status_code == 200:
+                memory_data = response.json()
+
+                # Analyze patterns from memory
+                patterns = self._analyze_memory_patterns(memory_data, analysis_type)
+
+                return {
+                    "patterns": patterns,
+                    "memory_summary": memory_data,
+                    "success": True
+                }
+            else:
+                logger.error(f"Failed to get agent memory: {response.status_code}")
+                return {
+                    "patterns": [],
+                    "memory_summary": {},
+                    "success": False
+                }
 
         except Exception as e:
             logger.error(f"Error analyzing patterns: {str(e)}", exc_info=True)
@@ -0,0 +1,158 @@
+"""
+Patient Context Store
+In-memory per-patient state for the voice path: built patient context plus a ring buffer of recent turns
+
+A warm voice turn reads only the patient row and the IDs of the last N
+conversations before calling Claude. The entry is loaded from the database on
+a miss (patient row + last N conversations), kept current by the orchestrator
+as turns are saved, and invalidated when the patient's profile or Letta agent
+changes.
+
+Entries are per worker process (bounded LRU + TTL), also with CACHE_BACKEND=redis,
+so every lookup checks the entry against the database: a profile or Letta agent
+changed through another worker, or turns saved by another worker, reload it.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.conversation import Conversation
+from app.models.patient import Patient
+from app.utils.cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+
+class PatientContextStore:
+    """
+    Per-patient context and conversation ring buffer
+
+    Entry shape:
+        {
+            "patient_context": {...},        # as built by the orchestrator
+            "letta_agent_id": str | None,
+            "history": deque(maxlen=N)       # {"conversation_id", "patient_message", "ai_response"}, oldest first
+        }
+    """
+
+    def __init__(self, history_turns: int, max_patients: int, ttl_seconds: float):
+        """Initialize store (always in-process - entries hold mutable deques)"""
+        self.history_turns = history_turns
+        self._cache = get_cache(
+            "patient_context",
+            max_entries=max_patients,
+            ttl_seconds=ttl_seconds,
+            memory_only=True
+        )
+        self._lock = threading.Lock()
+
+    async def get(
+        self,
+        patient_id: str,
+        db: AsyncSession,
+        build_context: Callable[[Patient], Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the patient's entry, reloading it when the database has moved on
+
+        The entry is served when its patient context and Letta agent match
+        the patient row and its turns are the last N saved conversations.
+
+        Args:
+            patient_id: Patient UUID
+            db: Database session
+            build_context: Builds the patient context dict from a Patient row
+
+        Returns:
+            The entry, or None if the patient does not exist
+        """
+        patient = await db.get(Patient, patient_id)
+        if not patient:
+            self.invalidate(patient_id)
+            return None
+
+        patient_context = build_context(patient)
+        entry = self._cache.get(str(patient_id))
+        if (
+            entry is not None
+            and entry["patient_context"] == patient_context
+            and entry["letta_agent_id"] == patient.letta_agent_id
+        ):
+            result = await db.execute(
+                recent_conversations_query(patient_id, self.history_turns).with_only_columns(Conversation.id)
+            )
+            with self._lock:
+                cached_ids = [turn["conversation_id"] for turn in reversed(entry["history"])]
+            if result.scalars().all() == cached_ids:
+                return entry
+
+        result = await db.execute(recent_conversations_query(patient_id, self.history_turns))
+        recent_conversations = result.scalars().all()
+
+        entry = {
+            "patient_context": patient_context,
+            "letta_agent_id": patient.letta_agent_id,
+            "history": deque(
+                (
+                    {
+                        "conversation_id": conv.id,
+                        "patient_message": conv.patient_message,
+                        "ai_response": conv.ai_response
+                    }
+                    for conv in reversed(recent_conversations)  # Oldest to newest
+                ),
+                maxlen=self.history_turns
+            )
+        }
+        self._cache.set(str(patient_id), entry)
+        logger.debug(f"Loaded context for patient {patient_id} ({len(entry['history'])} turns)")
+        return entry
+
+    def get_history(self, entry: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Snapshot of the entry's recent turns, oldest first"""
+        with self._lock:
+            return [
+                {"patient_message": turn["patient_message"], "ai_response": turn["ai_response"]}
+                for turn in entry["history"]
+            ]
+
+    def append_turn(self, patient_id: str, conversation_id: Any, patient_message: str, ai_response: str) -> None:
+        """Record a saved turn (no-op if the patient is not loaded)"""
+        entry = self._cache.get(str(patient_id))
+        if entry is None:
+            return
+
+        with self._lock:
+            entry["history"].append({
+                "conversation_id": conversation_id,
+                "patient_message": patient_message,
+                "ai_response": ai_response
+            })
+
+    def invalidate(self, patient_id: str) -> None:
+        """Drop the patient's entry in this worker (other workers reload theirs on their next lookup)"""
+        self._cache.delete(str(patient_id))
+
+
+def recent_conversations_query(patient_id: Any, limit: int) -> Select:
+    """Most recent conversation turns of a patient, newest first"""
+    return (
+        select(Conversation)
+        .where(Conversation.patient_id == patient_id)
+        .order_by(Conversation.created_at.desc())
+        .limit(limit)
+    )
+
+
+# Global instance
+patient_context_store = PatientContextStore(
+    history_turns=settings.CONVERSATION_HISTORY_TURNS,
+    max_patients=settings.PATIENT_CONTEXT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PATIENT_CONTEXT_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,333 @@
+"""
+Post-Response Work Queue
+Runs follow-up work for voice interactions after the reply has been returned
+
+Jobs are journaled to disk before they are queued, so work that was accepted but
+not finished (crash, restart, deploy) is replayed the next time the queue starts.
+Failed jobs are retried with exponential backoff; jobs that exhaust their retries
+are moved to a `failed/` folder for inspection and deleted after a retention
+period.
+
+Payloads hold IDs only - handlers read patient data from the database when the
+job runs. The journal is still readable by the service account only (folders
+0700, files 0600).
+
+Every process (uvicorn worker) journals into its own `<pid>/` folder. On start a
+process replays its own folder and adopts the jobs of processes that are no
+longer running (see app.utils.journal), so a job is replayed by exactly one
+worker even when several start at once.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.utils.journal import claim_journals, fsync_dir, process_dir
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class PostResponseQueue:
+    """
+    In-process durable work queue with retries
+
+    Usage:
+        post_response_queue.register("index_conversation", handler)
+        post_response_queue.enqueue("index_conversation", {"conversation_id": "..."})
+    """
+
+    def __init__(
+        self,
+        journal_dir: str,
+        worker_count: int = 2,
+        max_retries: int = 5,
+        retry_base_seconds: float = 2.0,
+        failed_retention_days: float = 14
+    ):
+        """Initialize queue (workers are started by start())"""
+        self.journal_dir = Path(journal_dir)
+        self.failed_dir = self.journal_dir / "failed"
+        self.worker_count = worker_count
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.failed_retention_days = failed_retention_days
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List[asyncio.Task] = []
+        self._journaling: Set[asyncio.Task] = set()
+        self._stats = {"enqueued": 0, "completed": 0, "retried": 0, "failed": 0}
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        """Register the coroutine that processes jobs of the given type (payloads hold IDs only)"""
+        self._handlers[job_type] = handler
+
+    def enqueue(self, job_type: str, payload: Dict[str, Any]) -> str:
+        """
+        Journal a job and queue it for processing
+
+        Safe to call before start() - the job is journaled and picked up on start.
+        On the queue's event loop the journal write runs in a thread and the job
+        is queued once it is on disk.
+
+        Returns:
+            job_id: Unique job ID
+        """
+        job = {
+            "id": str(uuid.uuid4()),
+            "type": job_type,
+            "payload": payload,
+            "attempts": 0,
+            "created_at": time.time()
+        }
+
+        self._stats["enqueued"] += 1
+
+        if self._loop is not None and _running_loop() is self._loop:
+            task = self._loop.create_task(self._journal_and_submit(job))
+            self._journaling.add(task)
+            task.add_done_callback(self._journaling.discard)
+        else:
+            self._write_journal(job)
+            self._submit(job)
+
+        logger.debug(f"Enqueued post-response job {job['id']} ({job_type})")
+        return job["id"]
+
+    async def start(self) -> None:
+        """Start worker tasks and replay journaled jobs from a previous run"""
+        if self._workers:
+            logger.warning("Post-response queue already running")
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+
+        jobs = await asyncio.to_thread(self._claim_journals)
+        for job in jobs:
+            self._queue.put_nowait(job)
+
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+
+        logger.info(
+            f"Post-response queue started with {self.worker_count} workers "
+            f"({len(jobs)} journaled jobs replayed)"
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop workers, giving queued jobs up to `timeout` seconds to finish
+
+        Unfinished jobs stay in the journal and are replayed on the next start.
+        """
+        if not self._workers:
+            return
+
+        # Jobs still being journaled are queued once written
+        await asyncio.gather(*self._journaling, return_exceptions=True)
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Post-response queue stopped with {self._queue.qsize()} jobs pending "
+                f"(kept in journal)"
+            )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+        self._workers = []
+        self._queue = None
+        self._loop = None
+        logger.info("Post-response queue stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue counters and current depth"""
+        return {
+            **self._stats,
+            "running": bool(self._workers),
+            "pending": self._queue.qsize() if self._queue else 0
+        }
+
+    async def _journal_and_submit(self, job: Dict[str, Any]) -> None:
+        """Journal a job in a thread, then queue it"""
+        try:
+            await asyncio.to_thread(self._write_journal, job)
+        except Exception as e:
+            logger.error(f"Could not journal post-response job {job['id']} ({job['type']}): {e}")
+        self._submit(job)
+
+    def _submit(self, job: Dict[str, Any]) -> None:
+        """Put a job on the in-memory queue from any thread"""
+        if self._loop is None or self._queue is None:
+            return  # Not started - journal replay will pick it up
+
+        if _running_loop() is self._loop:
+            self._queue.put_nowait(job)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+
+    async def _worker(self, worker_id: int) -> None:
+        """Process jobs until cancelled"""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        """Run a single job, scheduling a retry or recording failure on error"""
+        handler = self._handlers.get(job["type"])
+        if handler is None:
+            logger.error(f"No handler registered for post-response job type {job['type']}")
+            await asyncio.to_thread(self._move_to_failed, job)
+            return
+
+        job["attempts"] += 1
+
+        try:
+            await handler(job["payload"])
+            await asyncio.to_thread(self._remove_journal, job)
+            self._stats["completed"] += 1
+
+        except Exception as e:
+            if job["attempts"] > self.max_retries:
+                logger.error(
+                    f"Post-response job {job['id']} ({job['type']}) failed after "
+                    f"{job['attempts']} attempts: {e}",
+                    exc_info=True
+                )
+                await asyncio.to_thread(self._move_to_failed, job)
+                self._stats["failed"] += 1
+                return
+
+            delay = self.retry_base_seconds * (2 ** (job["attempts"] - 1))
+            logger.warning(
+                f"Post-response job {job['id']} ({job['type']}) failed "
+                f"(attempt {job['attempts']}), retrying in {delay:.1f}s: {e}"
+            )
+            try:
+                await asyncio.to_thread(self._write_journal, job)
+            except Exception as journal_error:
+                logger.error(f"Could not journal post-response job {job['id']} for retry: {journal_error}")
+            self._stats["retried"] += 1
+            self._loop.call_later(delay, self._queue.put_nowait, job)
+
+    def _journal_path(self, job: Dict[str, Any]) -> Path:
+        return process_dir(self.journal_dir) / f"{job['id']}.json"
+
+    def _claim_journals(self) -> List[Dict[str, Any]]:
+        """
+        Claim the jobs of this process's folder and of dead processes (blocking)
+
+        Also restricts the journal's permissions and prunes expired failed jobs.
+
+        Returns:
+            Claimed jobs, oldest first
+        """
+        _private_dir(self.journal_dir)
+        self._prune_failed()
+
+        jobs = []
+        for path in claim_journals(self.journal_dir, "*.json"):
+            try:
+                jobs.append(json.loads(path.read_text()))
+            except Exception as e:
+                logger.error(f"Could not replay journaled job {path.name}: {e}")
+
+        return sorted(jobs, key=lambda job: job.get("created_at", 0))
+
+    def _write_journal(self, job: Dict[str, Any]) -> None:
+        """Atomically and durably write the job to the journal (blocking)"""
+        directory = process_dir(self.journal_dir)
+        _private_dir(directory)
+        path = self._journal_path(job)
+        tmp_path = path.with_suffix(".tmp")
+
+        with _open_private(tmp_path) as f:
+            f.write(json.dumps(job, default=str))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        fsync_dir(directory)
+
+    def _remove_journal(self, job: Dict[str, Any]) -> None:
+        try:
+            self._journal_path(job).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _move_to_failed(self, job: Dict[str, Any]) -> None:
+        """Keep the job for inspection (until the retention period ends) without replaying it"""
+        try:
+            _private_dir(self.failed_dir)
+            with _open_private(self.failed_dir / f"{job['id']}.json") as f:
+                f.write(json.dumps(job, default=str))
+        except Exception as e:
+            logger.error(f"Could not record failed post-response job {job['id']}: {e}")
+        self._remove_journal(job)
+
+    def _prune_failed(self) -> None:
+        """Delete failed jobs older than the retention period (blocking)"""
+        if not self.failed_dir.is_dir():
+            return
+
+        _private_dir(self.failed_dir)
+        cutoff = time.time() - self.failed_retention_days * 86400
+        pruned = 0
+        for path in self.failed_dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    pruned += 1
+                else:
+                    path.chmod(0o600)  # Recorded before permissions were restricted
+            except FileNotFoundError:
+                continue  # Pruned by another process
+
+        if pruned:
+            logger.info(f"Deleted {pruned} failed post-response jobs older than {self.failed_retention_days} days")
+
+
+def _private_dir(directory: Path) -> None:
+    """Create a folder readable by the owner only (tightens an existing one)"""
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    directory.chmod(0o700)
+
+
+def _open_private(path: Path):
+    """Open a file for writing, readable by the owner only"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    return os.fdopen(fd, "w", encoding="utf-8")
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Event loop running in the current thread, if any"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+# Global instance
+post_response_queue = PostResponseQueue(
+    journal_dir=settings.POST_RESPONSE_QUEUE_DIR,
+    worker_count=settings.POST_RESPONSE_WORKERS,
+    max_retries=settings.POST_RESPONSE_MAX_RETRIES,
+    retry_base_seconds=settings.POST_RESPONSE_RETRY_BASE_SECONDS,
+    failed_retention_days=settings.POST_RESPONSE_FAILED_RETENTION_DAYS
+)
@@ -0,0 +1,118 @@
+"""
+Schedule Recurrence
+Timezone-aware computation of when a schedule's next reminder is due
+
+Schedules are defined in the patient's local time (Patient.timezone, an IANA
+name such as "America/New_York"); everything stored and compared in the
+database is naive UTC, like the rest of the models. The next reminder time is
+stored in Schedule.next_reminder_at (set when a schedule is created or updated,
+advanced by the reminder job after each reminder), so the job only reads
+schedules that are actually due.
+
+Daylight saving time:
+- A scheduled time that does not exist on a spring-forward day (e.g. 02:30)
+  fires the same amount of time after the transition (03:30)
+- A scheduled time that occurs twice on a fall-back day fires once, at the
+  first occurrence
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.models.schedule import Schedule
+
+logger = logging.getLogger(__name__)
+
+# Far enough ahead to reach the same weekday next week
+MAX_DAYS_AHEAD = 8
+
+
+@lru_cache(maxsize=None)
+def get_zone(timezone_name: Optional[str]) -> ZoneInfo:
+    """
+    Get the zone for an IANA timezone name
+
+    Unknown or empty names fall back to UTC (logged once per name).
+    """
+    try:
+        return ZoneInfo(timezone_name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone '{timezone_name}', using UTC")
+        return ZoneInfo("UTC")
+
+
+def to_local(moment: datetime, timezone_name: Optional[str]) -> datetime:
+    """Convert a naive UTC datetime to an aware local datetime"""
+    return moment.replace(tzinfo=timezone.utc).astimezone(get_zone(timezone_name))
+
+
+def local_day(moment: datetime, timezone_name: Optional[str]) -> date:
+    """Get the patient's local calendar day for a naive UTC datetime"""
+    return to_local(moment, timezone_name).date()
+
+
+def local_to_utc(day: date, local_time, timezone_name: Optional[str]) -> datetime:
+    """
+    Get the naive UTC datetime of a wall-clock time on a local day
+
+    Nonexistent times (spring forward) are shifted forward by the gap and
+    ambiguous times (fall back) resolve to the first occurrence.
+    """
+    local = datetime.combine(day, local_time).replace(tzinfo=get_zone(timezone_name), fold=0)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def schedule_applies_on(schedule: Schedule, weekday: int) -> bool:
+    """
+    Check if a schedule applies to a day of the week
+
+    Args:
+        schedule: Schedule object
+        weekday: Local day of week (0 = Monday, 6 = Sunday)
+
+    Returns:
+        bool: True if the schedule has an occurrence on that day
+    """
+    if schedule.recurrence_pattern == "daily":
+        return True
+    elif schedule.recurrence_pattern in ("weekly", "custom"):
+        return weekday in (schedule.days_of_week or [])
+
+    return False
+
+
+def next_reminder_at(
+    schedule: Schedule,
+    after: datetime,
+    timezone_name: Optional[str] = "UTC"
+) -> Optional[datetime]:
+    """
+    Get the first reminder time at or after a moment
+
+    The reminder time of an occurrence is its scheduled local time, converted
+    to UTC, minus reminder_advance_minutes.
+
+    Args:
+        schedule: Schedule object
+        after: Earliest acceptable reminder time (naive UTC)
+        timezone_name: Patient's IANA timezone
+
+    Returns:
+        Next reminder time (naive UTC), or None if the schedule never recurs
+    """
+    advance = timedelta(minutes=schedule.reminder_advance_minutes or 0)
+    first_day = local_day(after + advance, timezone_name)
+
+    for offset in range(MAX_DAYS_AHEAD):
+        day = first_day + timedelta(days=offset)
+        if not schedule_applies_on(schedule, day.weekday()):
+            continue
+
+        reminder_at = local_to_utc(day, schedule.scheduled_time, timezone_name) - advance
+        if reminder_at >= after:
+            return reminder_at
+
+    return None
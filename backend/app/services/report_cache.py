@@ -0,0 +1,135 @@
+"""
+Report Cache
+Cached patient reports validated by a per-patient data version
+
+Every patient has a data_version that is bumped in the same transaction as
+any write of report data (reminders, conversations, activity logs and
+schedules). A report is identified by (patient, time range, start, end, data
+version): that identity is the report's ETag and its cache key. An unchanged
+report therefore costs the patient lookup the endpoint already does, and
+either a 304 or a cache hit instead of three section scans.
+
+Writes through the ORM unit of work bump the version automatically (see
+_bump_flushed_patients). Bulk INSERT/UPDATE statements bypass it and bump
+the version themselves (reminder generation, missed/retried reminders,
+activity ingestion). The metrics rollup bumps patients whose rolled-up days
+it rewrites with different values, and the stale-days refresh bumps the
+patients it recomputes after late writes.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.activity_log import ActivityLog
+from app.models.conversation import Conversation
+from app.models.patient import Patient
+from app.models.reminder import Reminder
+from app.models.schedule import Schedule
+from app.schemas.report import PatientReport, TimeRange
+from app.utils.cache import get_cache
+
+# Models whose rows feed the report sections
+REPORT_DATA_MODELS = (Reminder, Conversation, ActivityLog, Schedule)
+
+
+def bump_data_version(db: Session, patient_ids: Iterable[Any]) -> None:
+    """
+    Invalidate cached reports of patients after a write (without committing)
+
+    Args:
+        db: Database session (the version moves with the write's transaction)
+        patient_ids: Patient UUIDs whose report data changed
+    """
+    patient_ids = set(patient_ids)
+    if patient_ids:
+        db.execute(_data_version_update(patient_ids), execution_options={"synchronize_session": False})
+
+
+def _data_version_update(patient_ids: Iterable[Any]):
+    """UPDATE statement bumping the data version of patients"""
+    return (
+        update(Patient)
+        .where(Patient.id.in_(patient_ids))
+        # Not a profile change - keep updated_at
+        .values(data_version=Patient.data_version + 1, updated_at=Patient.updated_at)
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_patients(session: Session, flush_context) -> None:
+    """Bump the data version of patients whose report data was flushed"""
+    patient_ids = {
+        instance.patient_id
+        for instance in (*session.new, *session.deleted)
+        if isinstance(instance, REPORT_DATA_MODELS)
+    }
+    patient_ids.update(
+        instance.patient_id
+        for instance in session.dirty
+        if isinstance(instance, REPORT_DATA_MODELS) and session.is_modified(instance, include_collections=False)
+    )
+    patient_ids.discard(None)
+
+    if patient_ids:
+        # Plain SQL on the flush's connection (the session is mid-flush)
+        session.connection().execute(_data_version_update(patient_ids))
+
+
+def report_etag(patient: Patient, time_range: TimeRange, start_dt: datetime, end_dt: datetime) -> str:
+    """
+    Get the ETag of a patient report (also its cache key)
+
+    Args:
+        patient: Patient row (with the current data_version)
+        time_range: Requested time range
+        start_dt: Resolved range start
+        end_dt: Resolved range end
+
+    Returns:
+        Quoted strong ETag
+    """
+    time_range_value = time_range.value if isinstance(time_range, TimeRange) else time_range
+    identity = f"{patient.id}:{time_range_value}:{start_dt.date()}:{end_dt.date()}:{patient.data_version}"
+    return f'"{hashlib.sha256(identity.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison)
+
+    Args:
+        if_none_match: Header value, e.g. '"abc", W/"def"' or '*'
+        etag: Current quoted ETag
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def get_cached_report(etag: str) -> Optional[PatientReport]:
+    """Get a cached report by ETag, or None on a miss"""
+    cached = report_cache.get(etag)
+    return PatientReport.model_validate(cached) if cached is not None else None
+
+
+def cache_report(etag: str, report: PatientReport) -> None:
+    """Cache a generated report under its ETag"""
+    report_cache.set(etag, report.model_dump(mode="json"))
+
+
+# Global instance (JSON values, so it can be shared between workers via Redis)
+report_cache = get_cache(
+    "patient_reports",
+    max_entries=settings.REPORT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.REPORT_CACHE_TTL_SECONDS
+)
@@ -2,18 +2,29 @@
 Reports service - Aggregation logic for patient reports
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta, date
-from typing import Tuple, List, Dict, Optional
-from sqlalchemy import func, and_, cast, Date
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, Tuple, List, Optional
+from sqlalchemy import Date, Float, Select, case, cast, func, select, text
 from sqlalchemy.orm import Session
 from uuid import UUID
 
+from app.core.config import settings
+from app.database.session import SessionLocal
 from app.models.reminder import Reminder
 from app.models.schedule import Schedule
 from app.models.activity_log import ActivityLog
 from app.models.conversation import Conversation
+from app.models.patient import Patient
+from app.models.patient_daily_metrics import PatientDailyMetrics
 from app.schemas.report import (
+    CohortReport,
     PatientReport,
+    PatientReportSummary,
     MedicationAdherence,
     MedicationAdherenceData,
     ActivityTrends,
@@ -25,6 +36,7 @@ from app.schemas.report import (
     Trend,
     Sentiment
 )
+from app.utils.metrics import latency_metrics
 
 
 def calculate_date_range(time_range: TimeRange, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Tuple[datetime, datetime]:
@@ -102,71 +114,243 @@ def calculate_trend(daily_data: List[float]) -> Trend:
         return Trend.STABLE
 
 
+# Estimated minutes of activity per activity type (everything else counts 0)
+ACTIVITY_MINUTES = {
+    "conversation": 2,       # Assume conversations are ~2 minutes on average
+    "app_open": 5,           # Assume app usage is ~5 minutes
+    "reminder_response": 1   # Quick interaction, ~1 minute
+}
+
+# Map sentiment to score (1-10 scale, anything else counts as neutral)
+SENTIMENT_SCORES = {
+    "positive": 8.0,
+    "neutral": 5.0,
+    "negative": 3.0,
+    "concerned": 4.0,
+    "distressed": 2.0
+}
+
+# Sentiments counted as negative in the sentiment distribution
+NEGATIVE_SENTIMENTS = ["negative", "concerned", "distressed"]
+
+
+def _day(column):
+    """Day bucket of a (naive UTC) timestamp column"""
+    return cast(func.date_trunc("day", column), Date).label("day")
+
+
+def _count_where(condition):
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END)"""
+    return func.sum(case((condition, 1), else_=0))
+
+
+def _in_range(column, start_dt: Optional[datetime], end_dt: datetime) -> list:
+    """Range conditions for a timestamp column (no lower bound if start_dt is None)"""
+    conditions = [column <= end_dt]
+    if start_dt is not None:
+        conditions.append(column >= start_dt)
+    return conditions
+
+
+def medication_daily_query(start_dt: Optional[datetime], end_dt: datetime, patient_ids: Optional[List[UUID]] = None) -> Select:
+    """
+    Medication reminders per patient and day
+
+    Columns: patient_id, day, total, completed
+    """
+    day = _day(Reminder.due_at)
+    query = (
+        select(
+            Reminder.patient_id,
+            day,
+            func.count().label("total"),
+            _count_where(Reminder.status == "completed").label("completed")
+        )
+        .join(Schedule, Reminder.schedule_id == Schedule.id)
+        .where(Schedule.type == "medication", *_in_range(Reminder.due_at, start_dt, end_dt))
+        .group_by(Reminder.patient_id, day)
+        .order_by(day)
+    )
+    if patient_ids is not None:
+        query = query.where(Reminder.patient_id.in_(patient_ids))
+    return query
+
+
+def activity_daily_query(start_dt: Optional[datetime], end_dt: datetime, patient_ids: Optional[List[UUID]] = None) -> Select:
+    """
+    Activity interactions and estimated minutes (ACTIVITY_MINUTES) per patient and day
+
+    Columns: patient_id, day, interactions, minutes
+    """
+    day = _day(ActivityLog.logged_at)
+    minutes = case(ACTIVITY_MINUTES, value=ActivityLog.activity_type, else_=0)
+    query = (
+        select(
+            ActivityLog.patient_id,
+            day,
+            func.count().label("interactions"),
+            func.sum(minutes).label("minutes")
+        )
+        .where(*_in_range(ActivityLog.logged_at, start_dt, end_dt))
+        .group_by(ActivityLog.patient_id, day)
+        .order_by(day)
+    )
+    if patient_ids is not None:
+        query = query.where(ActivityLog.patient_id.in_(patient_ids))
+    return query
+
+
+def mood_daily_query(start_dt: Optional[datetime], end_dt: datetime, patient_ids: Optional[List[UUID]] = None) -> Select:
+    """
+    Conversation count, sentiment score sum (SENTIMENT_SCORES) and sentiment counts per patient and day
+
+    Columns: patient_id, day, conversations, score_sum, positive, negative
+    """
+    day = _day(Conversation.created_at)
+    score = case(SENTIMENT_SCORES, value=Conversation.sentiment, else_=SENTIMENT_SCORES["neutral"])
+    query = (
+        select(
+            Conversation.patient_id,
+            day,
+            func.count().label("conversations"),
+            cast(func.sum(score), Float).label("score_sum"),
+            _count_where(Conversation.sentiment == "positive").label("positive"),
+            _count_where(Conversation.sentiment.in_(NEGATIVE_SENTIMENTS)).label("negative")
+        )
+        .where(*_in_range(Conversation.created_at, start_dt, end_dt))
+        .group_by(Conversation.patient_id, day)
+        .order_by(day)
+    )
+    if patient_ids is not None:
+        query = query.where(Conversation.patient_id.in_(patient_ids))
+    return query
+
+
+def get_rollup_watermark(db: Session) -> Optional[date]:
+    """
+    Get the latest day in patient_daily_metrics
+
+    All days up to the watermark have been rolled up (days without any
+    activity have no row).
+    """
+    return db.execute(select(func.max(PatientDailyMetrics.day))).scalar()
+
+
+def _daily_rows(
+    db: Session,
+    patient_ids: List[UUID],
+    start_dt: datetime,
+    end_dt: datetime,
+    rollup_through: Optional[date],
+    live_query,
+    rollup_columns: list,
+    rollup_present
+) -> list:
+    """
+    Get one row per patient and day: rolled-up days from patient_daily_metrics, later days live
+
+    Args:
+        db: Database session
+        patient_ids: Patient UUIDs
+        start_dt: Start datetime
+        end_dt: End datetime
+        rollup_through: Rollup watermark (None = compute everything live)
+        live_query: medication/activity/mood_daily_query
+        rollup_columns: PatientDailyMetrics columns labeled like the live query's
+        rollup_present: Condition for days that have data for this section
+
+    Returns:
+        Rows with `patient_id` and `day` columns and the section's columns,
+        ordered by day for each patient
+    """
+    rows = []
+    live_start = start_dt
+
+    if rollup_through is not None and rollup_through >= start_dt.date():
+        rollup_end = min(rollup_through, end_dt.date())
+        rows.extend(db.execute(
+            select(PatientDailyMetrics.patient_id, PatientDailyMetrics.day, *rollup_columns)
+            .where(
+                PatientDailyMetrics.patient_id.in_(patient_ids),
+                PatientDailyMetrics.day >= start_dt.date(),
+                PatientDailyMetrics.day <= rollup_end,
+                rollup_present
+            )
+            .order_by(PatientDailyMetrics.day)
+        ).all())
+        live_start = max(start_dt, datetime.combine(rollup_end + timedelta(days=1), datetime.min.time()))
+
+    if live_start <= end_dt:
+        rows.extend(db.execute(live_query(live_start, end_dt, patient_ids)).all())
+
+    return rows
+
+
 def calculate_medication_adherence(
     db: Session,
     patient_id: UUID,
     start_dt: datetime,
-    end_dt: datetime
+    end_dt: datetime,
+    rollup_through: Optional[date] = None
 ) -> MedicationAdherence:
     """
     Calculate medication adherence metrics
 
+    Reminders are counted per day in SQL (one row per day); days up to
+    rollup_through are read from patient_daily_metrics.
+
     Args:
         db: Database session
         patient_id: Patient UUID
         start_dt: Start datetime
         end_dt: End datetime
+        rollup_through: Rollup watermark (None = compute everything live)
 
     Returns:
         MedicationAdherence object
     """
-    # Get all medication reminders in date range
-    reminders = db.query(Reminder).join(Schedule).filter(
-        and_(
-            Reminder.patient_id == patient_id,
-            Schedule.type == "medication",
-            Reminder.due_at >= start_dt,
-            Reminder.due_at <= end_dt
-        )
-    ).all()
+    return _medication_adherence(_medication_rows(db, [patient_id], start_dt, end_dt, rollup_through))
 
-    # Group by date
-    daily_adherence: Dict[date, Dict] = {}
 
-    for reminder in reminders:
-        reminder_date = reminder.due_at.date()
-
-        if reminder_date not in daily_adherence:
-            daily_adherence[reminder_date] = {
-                "total": 0,
-                "completed": 0
-            }
+def _medication_rows(
+    db: Session,
+    patient_ids: List[UUID],
+    start_dt: datetime,
+    end_dt: datetime,
+    rollup_through: Optional[date]
+) -> list:
+    """Daily medication rows (patient_id, day, total, completed) of patients"""
+    return _daily_rows(
+        db, patient_ids, start_dt, end_dt, rollup_through,
+        medication_daily_query,
+        [
+            PatientDailyMetrics.reminders_total.label("total"),
+            PatientDailyMetrics.reminders_completed.label("completed")
+        ],
+        PatientDailyMetrics.reminders_total > 0
+    )
 
-        daily_adherence[reminder_date]["total"] += 1
-        if reminder.status == "completed":
-            daily_adherence[reminder_date]["completed"] += 1
 
+def _medication_adherence(rows: list) -> MedicationAdherence:
+    """Medication adherence metrics from one patient's daily rows"""
     # Calculate daily data
     daily_data = []
     rates = []
 
-    for date_key in sorted(daily_adherence.keys()):
-        stats = daily_adherence[date_key]
-        total = stats["total"]
-        completed = stats["completed"]
-        rate = completed / total if total > 0 else 0.0
+    for row in rows:
+        rate = row.completed / row.total if row.total > 0 else 0.0
 
         daily_data.append(MedicationAdherenceData(
-            date=date_key,
+            date=row.day,
             rate=rate,
-            completed=completed,
-            total=total
+            completed=row.completed,
+            total=row.total
         ))
         rates.append(rate)
 
     # Calculate overall rate
-    total_reminders = sum(d["total"] for d in daily_adherence.values())
-    total_completed = sum(d["completed"] for d in daily_adherence.values())
+    total_reminders = sum(row.total for row in rows)
+    total_completed = sum(row.completed for row in rows)
     overall_rate = total_completed / total_reminders if total_reminders > 0 else 0.0
 
     # Calculate trend
@@ -183,67 +367,61 @@ def calculate_activity_trends(
     db: Session,
     patient_id: UUID,
     start_dt: datetime,
-    end_dt: datetime
+    end_dt: datetime,
+    rollup_through: Optional[date] = None
 ) -> ActivityTrends:
     """
     Calculate activity trends metrics
 
+    Interactions and estimated minutes (ACTIVITY_MINUTES) are summed per day
+    in SQL (one row per day); days up to rollup_through are read from
+    patient_daily_metrics.
+
     Args:
         db: Database session
         patient_id: Patient UUID
         start_dt: Start datetime
         end_dt: End datetime
+        rollup_through: Rollup watermark (None = compute everything live)
 
     Returns:
         ActivityTrends object
     """
-    # Get all activity logs in date range
-    activities = db.query(ActivityLog).filter(
-        and_(
-            ActivityLog.patient_id == patient_id,
-            ActivityLog.logged_at >= start_dt,
-            ActivityLog.logged_at <= end_dt
-        )
-    ).all()
-
-    # Group by date
-    daily_activity: Dict[date, Dict] = {}
+    return _activity_trends(_activity_rows(db, [patient_id], start_dt, end_dt, rollup_through))
 
-    for activity in activities:
-        activity_date = activity.logged_at.date()
 
-        if activity_date not in daily_activity:
-            daily_activity[activity_date] = {
-                "interactions": 0,
-                "minutes": 0
-            }
-
-        daily_activity[activity_date]["interactions"] += 1
+def _activity_rows(
+    db: Session,
+    patient_ids: List[UUID],
+    start_dt: datetime,
+    end_dt: datetime,
+    rollup_through: Optional[date]
+) -> list:
+    """Daily activity rows (patient_id, day, interactions, minutes) of patients"""
+    return _daily_rows(
+        db, patient_ids, start_dt, end_dt, rollup_through,
+        activity_daily_query,
+        [
+            PatientDailyMetrics.interactions.label("interactions"),
+            PatientDailyMetrics.activity_minutes.label("minutes")
+        ],
+        PatientDailyMetrics.interactions > 0
+    )
 
-        # Estimate activity minutes based on activity type
-        if activity.activity_type == "conversation":
-            # Assume conversations are ~2 minutes on average
-            daily_activity[activity_date]["minutes"] += 2
-        elif activity.activity_type == "app_open":
-            # Assume app usage is ~5 minutes
-            daily_activity[activity_date]["minutes"] += 5
-        elif activity.activity_type == "reminder_response":
-            # Quick interaction, ~1 minute
-            daily_activity[activity_date]["minutes"] += 1
 
+def _activity_trends(rows: list) -> ActivityTrends:
+    """Activity trends metrics from one patient's daily rows"""
     # Calculate daily data
     daily_data = []
     minutes_list = []
 
-    for date_key in sorted(daily_activity.keys()):
-        stats = daily_activity[date_key]
-
+    for row in rows:
         daily_data.append(ActivityTrendData(
-            date=date_key,
-            minutes=stats["minutes"],
-            interactions=stats["interactions"]
+            date=row.day,
+            minutes=row.minutes,
+            interactions=row.interactions
         ))
-        minutes_list.append(stats["minutes"])
+        minutes_list.append(row.minutes)
 
     # Calculate average daily minutes
     avg_minutes = sum(minutes_list) / len(minutes_list) if minutes_list else 0.0
@@ -262,73 +440,58 @@ def calculate_mood_analytics(
     db: Session,
     patient_id: UUID,
     start_dt: datetime,
-    end_dt: datetime
+    end_dt: datetime,
+    rollup_through: Optional[date] = None
 ) -> MoodAnalytics:
     """
     Calculate mood analytics metrics
 
+    Sentiment scores (SENTIMENT_SCORES) and sentiment counts are summed per
+    day in SQL (one row per day); days up to rollup_through are read from
+    patient_daily_metrics.
+
     Args:
         db: Database session
         patient_id: Patient UUID
         start_dt: Start datetime
         end_dt: End datetime
+        rollup_through: Rollup watermark (None = compute everything live)
 
     Returns:
         MoodAnalytics object
     """
-    # Get all conversations in date range
-    conversations = db.query(Conversation).filter(
-        and_(
-            Conversation.patient_id == patient_id,
-            Conversation.created_at >= start_dt,
-            Conversation.created_at <= end_dt
-        )
-    ).all()
-
-    # Map sentiment to score (1-10 scale)
-    sentiment_scores = {
-        "positive": 8.0,
-        "neutral": 5.0,
-        "negative": 3.0,
-        "concerned": 4.0,
-        "distressed": 2.0
-    }
-
-    # Count sentiment types
-    sentiment_counts = {
-        "positive": 0,
-        "neutral": 0,
-        "negative": 0
-    }
-
-    # Group by date
-    daily_mood: Dict[date, List[float]] = {}
-
-    for conv in conversations:
-        conv_date = conv.created_at.date()
-        sentiment = conv.sentiment or "neutral"
-        score = sentiment_scores.get(sentiment, 5.0)
+    return _mood_analytics(_mood_rows(db, [patient_id], start_dt, end_dt, rollup_through))
 
-        if conv_date not in daily_mood:
-            daily_mood[conv_date] = []
 
-        daily_mood[conv_date].append(score)
+def _mood_rows(
+    db: Session,
+    patient_ids: List[UUID],
+    start_dt: datetime,
+    end_dt: datetime,
+    rollup_through: Optional[date]
+) -> list:
+    """Daily mood rows (patient_id, day, conversations, score_sum, positive, negative) of patients"""
+    return _daily_rows(
+        db, patient_ids, start_dt, end_dt, rollup_through,
+        mood_daily_query,
+        [
+            PatientDailyMetrics.conversations.label("conversations"),
+            PatientDailyMetrics.sentiment_score_sum.label("score_sum"),
+            PatientDailyMetrics.positive_conversations.label("positive"),
+            PatientDailyMetrics.negative_conversations.label("negative")
+        ],
+        PatientDailyMetrics.conversations > 0
+    )
 
-        # Map to simplified sentiment for distribution
-        if sentiment in ["positive"]:
-            sentiment_counts["positive"] += 1
-        elif sentiment in ["negative", "concerned", "distressed"]:
-            sentiment_counts["negative"] += 1
-        else:
-            sentiment_counts["neutral"] += 1
 
+def _mood_analytics(rows: list) -> MoodAnalytics:
+    """Mood analytics metrics from one patient's daily rows"""
     # Calculate daily data
     daily_data = []
     all_scores = []
 
-    for date_key in sorted(daily_mood.keys()):
-        scores = daily_mood[date_key]
-        avg_score = sum(scores) / len(scores) if scores else 5.0
+    for row in rows:
+        avg_score = row.score_sum / row.conversations
 
         # Determine sentiment for the day
         if avg_score >= 7:
@@ -339,7 +502,7 @@ def calculate_mood_analytics(
             sentiment = Sentiment.NEGATIVE
 
         daily_data.append(MoodAnalyticsData(
-            date=date_key,
+            date=row.day,
             score=avg_score,
             sentiment=sentiment
         ))
@@ -349,11 +512,13 @@ def calculate_mood_analytics(
     avg_sentiment_score = sum(all_scores) / len(all_scores) if all_scores else 5.0
 
     # Calculate sentiment distribution
-    total_convs = sum(sentiment_counts.values())
+    total_convs = sum(row.conversations for row in rows)
+    positive = sum(row.positive for row in rows)
+    negative = sum(row.negative for row in rows)
     distribution = SentimentDistribution(
-        positive=sentiment_counts["positive"] / total_convs if total_convs > 0 else 0.0,
-        neutral=sentiment_counts["neutral"] / total_convs if total_convs > 0 else 0.0,
-        negative=sentiment_counts["negative"] / total_convs if total_convs > 0 else 0.0
+        positive=positive / total_convs if total_convs > 0 else 0.0,
+        neutral=(total_convs - positive - negative) / total_convs if total_convs > 0 else 0.0,
+        negative=negative / total_convs if total_convs > 0 else 0.0
     )
 
     # Calculate trend
@@ -367,22 +532,136 @@ def calculate_mood_analytics(
     )
 
 
+# Report sections (independent, so they run concurrently on separate connections)
+REPORT_SECTIONS = {
+    "medication_adherence": calculate_medication_adherence,
+    "activity_trends": calculate_activity_trends,
+    "mood_analytics": calculate_mood_analytics,
+}
+
+
+def _section_workers() -> int:
+    """Section threads: REPORT_SECTION_WORKERS, by default half the DB pool (the rest serves requests and jobs)"""
+    workers = settings.REPORT_SECTION_WORKERS or settings.DB_POOL_SIZE // 2
+    return max(1, min(workers, settings.DB_POOL_SIZE))
+
+
+_section_executor = ThreadPoolExecutor(
+    max_workers=_section_workers(),
+    thread_name_prefix="report-section"
+)
+# Idle section threads - reports only hand sections to threads that are free
+_section_slots = threading.BoundedSemaphore(_section_workers())
+
+
+# Cohort report sections: (daily rows of many patients, metrics from one patient's rows)
+COHORT_SECTIONS = {
+    "medication_adherence": (_medication_rows, _medication_adherence),
+    "activity_trends": (_activity_rows, _activity_trends),
+    "mood_analytics": (_mood_rows, _mood_analytics),
+}
+
+
+@contextmanager
+def _report_snapshot(db: Session) -> Iterator[Tuple[Session, Optional[str]]]:
+    """
+    Open a session on a repeatable-read snapshot for one report
+
+    Yields:
+        (session, snapshot ID) - on PostgreSQL the snapshot is exported so
+        section threads read exactly the same data (None on other databases)
+    """
+    with SessionLocal(bind=db.get_bind()) as snapshot_db:
+        snapshot = None
+        if snapshot_db.get_bind().dialect.name == "postgresql":
+            snapshot_db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            snapshot = snapshot_db.execute(text("SELECT pg_export_snapshot()")).scalar()
+        yield snapshot_db, snapshot
+
+
+def _run_sections(
+    db: Session,
+    snapshot: Optional[str],
+    jobs: Dict[str, Tuple[str, Callable, tuple]],
+    timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Run report sections concurrently on one snapshot
+
+    The calling thread runs the first section on `db`. The others go to idle
+    section threads, or also run on the calling thread when none is idle, so
+    a report never queues behind other reports and uses at most
+    len(jobs) - 1 section threads.
+
+    Args:
+        db: Snapshot session from _report_snapshot
+        snapshot: Its exported snapshot ID
+        jobs: Section name -> (latency metric, calculate(db, *args), args)
+        timings: If given, filled with seconds per section
+
+    Returns:
+        Section name -> result
+    """
+    futures = {}
+    local = []
+    for index, (section, (metric, calculate, args)) in enumerate(jobs.items()):
+        if index > 0 and _section_slots.acquire(blocking=False):
+            future = _section_executor.submit(_run_section, db.get_bind(), snapshot, metric, calculate, *args)
+            future.add_done_callback(lambda _: _section_slots.release())
+            futures[section] = future
+        else:
+            local.append(section)
+
+    results = {
+        section: _timed_section(jobs[section][0], jobs[section][1], db, *jobs[section][2])
+        for section in local
+    }
+    results.update((section, future.result()) for section, future in futures.items())
+
+    if timings is not None:
+        timings.update((section, seconds) for section, (_, seconds) in results.items())
+    return {section: result for section, (result, _) in results.items()}
+
+
+def _run_section(bind, snapshot: Optional[str], metric: str, calculate: Callable, *args) -> Tuple[Any, float]:
+    """Run calculate(db, *args) on its own session reading the report's snapshot (section threads)"""
+    with SessionLocal(bind=bind) as db:
+        if snapshot is not None:
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            db.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot}'"))
+        return _timed_section(metric, calculate, db, *args)
+
+
+def _timed_section(metric: str, calculate: Callable, db: Session, *args) -> Tuple[Any, float]:
+    """Run calculate(db, *args), returning the result and its duration"""
+    start = time.perf_counter()
+    with latency_metrics.timer(metric):
+        result = calculate(db, *args)
+    return result, time.perf_counter() - start
+
+
 def generate_report(
     db: Session,
     patient_id: UUID,
     time_range: TimeRange = "7d",
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
+    end_date: Optional[date] = None,
+    timings: Optional[Dict[str, float]] = None
 ) -> PatientReport:
     """
     Generate a comprehensive patient report
 
+    The three sections are calculated concurrently (see _run_sections), so
+    report latency is about that of the slowest section. All sections read
+    one database snapshot.
+
     Args:
-        db: Database session
+        db: Database session (its engine serves the report's own connections)
         patient_id: Patient UUID
         time_range: One of "7d", "30d", "90d", "all", "custom"
         start_date: Start date for custom range
         end_date: End date for custom range
+        timings: If given, filled with seconds per section
 
     Returns:
         PatientReport object with all metrics
@@ -390,16 +669,151 @@ def generate_report(
     # Calculate date range
     start_dt, end_dt = calculate_date_range(time_range, start_date, end_date)
 
-    # Calculate all metrics
-    medication_adherence = calculate_medication_adherence(db, patient_id, start_dt, end_dt)
-    activity_trends = calculate_activity_trends(db, patient_id, start_dt, end_dt)
-    mood_analytics = calculate_mood_analytics(db, patient_id, start_dt, end_dt)
+    with _report_snapshot(db) as (snapshot_db, snapshot):
+        # Days up to the watermark are precomputed, later days (today) are computed live
+        rollup_through = get_rollup_watermark(snapshot_db)
+
+        # Calculate all metrics
+        sections = _run_sections(snapshot_db, snapshot, {
+            section: (f"report.{section}", calculate, (patient_id, start_dt, end_dt, rollup_through))
+            for section, calculate in REPORT_SECTIONS.items()
+        }, timings)
 
     return PatientReport(
         time_range=time_range,
         start_date=start_dt.date(),
         end_date=end_dt.date(),
-        medication_adherence=medication_adherence,
-        activity_trends=activity_trends,
-        mood_analytics=mood_analytics
+        **sections
+    )
+
+
+# Ranges longer than this get one sparkline value per week instead of per day
+SPARKLINE_DAILY_MAX_DAYS = 90
+
+
+def _sparkline_days(days: int) -> int:
+    """Days per sparkline value for a report range of `days` days"""
+    return 1 if days <= SPARKLINE_DAILY_MAX_DAYS else 7
+
+
+def _sparkline(daily_data: list, start_day: date, days: int, bucket_days: int, value: Callable) -> list:
+    """
+    Series of one value per bucket of bucket_days days from a section's daily data
+
+    Args:
+        daily_data: The section's daily points
+        start_day: First day of the first bucket (index 0)
+        days: Days in the report range (the last bucket may be shorter)
+        bucket_days: Days per bucket
+        value: value(points, bucket_length) aggregates the points of one bucket (possibly none)
+
+    Returns:
+        Dense list of bucket values
+    """
+    buckets = [[] for _ in range(-(-days // bucket_days))]
+    for point in daily_data:
+        buckets[(point.date - start_day).days // bucket_days].append(point)
+
+    return [
+        value(points, min(bucket_days, days - index * bucket_days))
+        for index, points in enumerate(buckets)
+    ]
+
+
+def _adherence_value(points: List[MedicationAdherenceData], bucket_length: int) -> Optional[float]:
+    """Adherence rate of a bucket (None without medication reminders)"""
+    total = sum(point.total for point in points)
+    return round(sum(point.completed for point in points) / total, 3) if total else None
+
+
+def _activity_value(points: List[ActivityTrendData], bucket_length: int) -> int:
+    """Average activity minutes per day of a bucket (days without activity count as 0)"""
+    return round(sum(point.minutes for point in points) / bucket_length)
+
+
+def _mood_value(points: List[MoodAnalyticsData], bucket_length: int) -> Optional[float]:
+    """Average daily sentiment score of a bucket (None without conversations)"""
+    return round(sum(point.score for point in points) / len(points), 2) if points else None
+
+
+def generate_cohort_report(
+    db: Session,
+    patients: List[Patient],
+    time_range: TimeRange = "7d",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    timings: Optional[Dict[str, float]] = None
+) -> CohortReport:
+    """
+    Generate report summaries for many patients at once
+
+    Each section is one grouped query (per patient and day) for all patients
+    together, run concurrently like generate_report, so the cost does not
+    grow with round trips per patient. Metrics are built from the same daily
+    rows as the single-patient report. Sparklines have one value per day, or
+    per week for ranges over SPARKLINE_DAILY_MAX_DAYS days.
+
+    Args:
+        db: Database session
+        patients: Patients to include (in output order)
+        time_range: One of "7d", "30d", "90d", "all", "custom"
+        start_date: Start date for custom range
+        end_date: End date for custom range
+        timings: If given, filled with seconds per section
+
+    Returns:
+        CohortReport with one summary per patient
+    """
+    start_dt, end_dt = calculate_date_range(time_range, start_date, end_date)
+    start_day = start_dt.date()
+    days = (end_dt.date() - start_day).days + 1
+    sparkline_days = _sparkline_days(days)
+
+    patient_ids = [patient.id for patient in patients]
+
+    # Daily rows of all patients per section, grouped by patient
+    rows_by_patient: Dict[str, Dict[UUID, list]] = {section: {} for section in COHORT_SECTIONS}
+    if patient_ids:
+        with _report_snapshot(db) as (snapshot_db, snapshot):
+            rollup_through = get_rollup_watermark(snapshot_db)
+            section_rows = _run_sections(snapshot_db, snapshot, {
+                section: (f"report.cohort.{section}", rows, (patient_ids, start_dt, end_dt, rollup_through))
+                for section, (rows, _) in COHORT_SECTIONS.items()
+            }, timings)
+
+        for section, rows in section_rows.items():
+            grouped = defaultdict(list)
+            for row in rows:
+                grouped[row.patient_id].append(row)
+            rows_by_patient[section] = grouped
+
+    summaries = []
+    for patient in patients:
+        medication, activity, mood = (
+            build(rows_by_patient[section].get(patient.id, []))
+            for section, (_, build) in COHORT_SECTIONS.items()
+        )
+        summaries.append(PatientReportSummary(
+            patient_id=patient.id,
+            first_name=patient.first_name,
+            last_name=patient.last_name,
+            preferred_name=patient.preferred_name,
+            medication_adherence_rate=medication.overall_rate,
+            medication_trend=medication.trend,
+            average_daily_minutes=activity.average_daily_minutes,
+            activity_trend=activity.trend,
+            average_sentiment_score=mood.average_sentiment_score,
+            mood_trend=mood.trend,
+            sentiment_distribution=mood.sentiment_distribution,
+            medication_sparkline=_sparkline(medication.daily_data, start_day, days, sparkline_days, _adherence_value),
+            activity_sparkline=_sparkline(activity.daily_data, start_day, days, sparkline_days, _activity_value),
+            mood_sparkline=_sparkline(mood.daily_data, start_day, days, sparkline_days, _mood_value)
+        ))
+
+    return CohortReport(
+        time_range=time_range,
+        start_date=start_day,
+        end_date=end_dt.date(),
+        sparkline_days=sparkline_days,
+        patients=summaries
     )
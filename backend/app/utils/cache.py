@@ -0,0 +1,344 @@
+"""
+Cache Subsystem
+Bounded LRU + TTL caches with hit/miss/eviction counters and a pluggable backend
+
+Backends (settings.CACHE_BACKEND):
+- memory: per-process OrderedDict, bounded by max_entries (default)
+- redis: shared between workers via any Redis-compatible server (redis, valkey,
+  KeyDB...). Uses the `redis` package (requirements.txt); TTL is enforced by the
+  server and the size bound by its maxmemory policy (use allkeys-lru).
+
+Code running on the event loop uses the async methods (aget/aset/adelete); the
+Redis backend serves them with redis.asyncio so a slow server never blocks the
+loop. The sync methods are for sync endpoints, jobs and threads.
+
+Caches created with memory_only=True are always per process, also with the
+redis backend: delete() and clear() only reach the calling worker, and other
+workers keep their copies until the TTL expires.
+
+Usage:
+    letta_cache = get_cache("letta_context", max_entries=1000, ttl_seconds=300)
+    value = await letta_cache.aget(key)
+    if value is None:
+        value = ...
+        await letta_cache.aset(key, value)
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.loop_local import LoopLocal
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """
+    In-process LRU cache with per-entry TTL
+
+    Expired entries are dropped when read and evicted first when the cache is full,
+    so memory stays bounded by max_entries regardless of access pattern.
+    """
+
+    backend = "memory"
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        """Initialize empty cache"""
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if missing or expired"""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting expired then least recently used entries when full"""
+        expires_at = time.monotonic() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self.max_entries:
+                self._purge_expired()
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Get a value (never blocks - same as get)"""
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value (never blocks - same as set)"""
+        self.set(key, value, ttl_seconds)
+
+    async def adelete(self, key: str) -> None:
+        """Remove a value if present (never blocks - same as delete)"""
+        self.delete(key)
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters and current size"""
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "backend": self.backend,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else None
+        }
+
+    def _purge_expired(self) -> None:
+        """Drop all expired entries (caller holds the lock)"""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self._counters["expirations"] += len(expired)
+
+
+class RedisCache:
+    """
+    Shared cache backed by a Redis-compatible server
+
+    Values are stored as JSON under "<CACHE_KEY_PREFIX>:<name>:<key>". Server errors
+    are logged and treated as misses so a cache outage never fails a request.
+    """
+
+    backend = "redis"
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float, client: Any, async_clients: LoopLocal):
+        """Initialize with a redis.Redis client and per-loop redis.asyncio clients"""
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._client = client
+        self._async_clients = async_clients
+        self._prefix = f"{settings.CACHE_KEY_PREFIX}:{name}:"
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "errors": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if missing, expired or unreachable"""
+        try:
+            raw = self._client.get(self._prefix + key)
+        except Exception as e:
+            self._failed("get", e)
+            self._count("misses")
+            return None
+
+        return self._loaded(raw)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value with TTL"""
+        try:
+            self._client.set(self._prefix + key, json.dumps(value, default=str), ex=self._ttl(ttl_seconds))
+        except Exception as e:
+            self._failed("set", e)
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present"""
+        try:
+            self._client.delete(self._prefix + key)
+        except Exception as e:
+            self._failed("delete", e)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Get a value without blocking the event loop"""
+        try:
+            raw = await self._async_clients.get().get(self._prefix + key)
+        except Exception as e:
+            self._failed("get", e)
+            self._count("misses")
+            return None
+
+        return self._loaded(raw)
+
+    async def aset(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value with TTL without blocking the event loop"""
+        try:
+            await self._async_clients.get().set(
+                self._prefix + key, json.dumps(value, default=str), ex=self._ttl(ttl_seconds)
+            )
+        except Exception as e:
+            self._failed("set", e)
+
+    async def adelete(self, key: str) -> None:
+        """Remove a value without blocking the event loop"""
+        try:
+            await self._async_clients.get().delete(self._prefix + key)
+        except Exception as e:
+            self._failed("delete", e)
+
+    def clear(self) -> None:
+        """Remove all values in this cache's namespace"""
+        try:
+            keys = list(self._client.scan_iter(match=self._prefix + "*", count=500))
+            if keys:
+                self._client.delete(*keys)
+        except Exception as e:
+            self._failed("clear", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters (per process; size and evictions are tracked by the server)"""
+        with self._lock:
+            counters = dict(self._counters)
+
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "backend": self.backend,
+            "size": None,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else None
+        }
+
+    def _ttl(self, ttl_seconds: Optional[float]) -> int:
+        """Expiry in whole seconds (at least 1)"""
+        return max(1, int(ttl_seconds if ttl_seconds is not None else self.ttl_seconds))
+
+    def _loaded(self, raw: Optional[bytes]) -> Optional[Any]:
+        """Count and decode a fetched value"""
+        if raw is None:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return json.loads(raw)
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        """Count and log a server error (treated as a miss or a no-op)"""
+        self._count("errors")
+        logger.warning(f"Cache {self.name} {operation} failed: {error}")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+
+_caches: Dict[str, Any] = {}
+_caches_lock = threading.Lock()
+_redis_clients: Optional[Tuple[Any, LoopLocal]] = None
+
+
+def _get_redis_clients() -> Optional[Tuple[Any, LoopLocal]]:
+    """
+    Create the shared Redis clients, or None if the redis package is missing
+
+    Returns:
+        (redis.Redis client, per-event-loop redis.asyncio clients)
+    """
+    global _redis_clients
+
+    if _redis_clients is None:
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            logger.error(
+                "CACHE_BACKEND=redis but the redis package is not installed "
+                "(pip install -r requirements.txt), using per-process in-memory caches"
+            )
+            return None
+
+        options = {
+            "socket_timeout": settings.CACHE_REDIS_TIMEOUT_SECONDS,
+            "socket_connect_timeout": settings.CACHE_REDIS_TIMEOUT_SECONDS
+        }
+        _redis_clients = (
+            redis.Redis.from_url(settings.CACHE_REDIS_URL, **options),
+            LoopLocal(lambda: redis.asyncio.Redis.from_url(settings.CACHE_REDIS_URL, **options))
+        )
+
+    return _redis_clients
+
+
+async def aclose_caches() -> None:
+    """Close the async Redis connections of the current event loop"""
+    if _redis_clients is not None:
+        client = _redis_clients[1].pop()
+        if client is not None:
+            await client.aclose()
+
+
+def get_cache(name: str, max_entries: int, ttl_seconds: float, memory_only: bool = False):
+    """
+    Get (or create) the named cache on the configured backend
+
+    Args:
+        name: Cache name (also the Redis key namespace)
+        max_entries: Size bound for the in-memory backend
+        ttl_seconds: Default time-to-live for entries
+        memory_only: Always use the in-process backend (for values that are
+            mutated in place or are not JSON-serializable). Such caches are
+            per worker: invalidating an entry does not reach other workers.
+
+    Returns:
+        MemoryCache or RedisCache
+    """
+    cache = _caches.get(name)
+    if cache is not None:
+        return cache
+
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            use_redis = settings.CACHE_BACKEND == "redis" and not memory_only
+            clients = _get_redis_clients() if use_redis else None
+            if clients is not None:
+                cache = RedisCache(name, max_entries, ttl_seconds, *clients)
+            else:
+                cache = MemoryCache(name, max_entries, ttl_seconds)
+            _caches[name] = cache
+            logger.info(f"Cache '{name}' created ({cache.backend}, max {max_entries}, ttl {ttl_seconds}s)")
+
+    return cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for every cache (exposed at /admin/cache)"""
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
@@ -0,0 +1,93 @@
+"""
+Per-Process Journals
+Claiming on-disk journals shared by several worker processes
+
+Every process (uvicorn worker) journals into its own `<pid>/` folder under a
+journal directory. On start a process claims the journals of its own folder
+(left by an earlier process with the same PID), of the top-level folder
+(written before journals were kept per process) and of processes that are no
+longer running. Each file is claimed by an atomic rename into the process's
+own folder, so it is replayed by exactly one process even when several start
+at once - and never while the process that writes it is still running.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Collection, List
+
+logger = logging.getLogger(__name__)
+
+
+def process_dir(journal_dir: Path) -> Path:
+    """Journal folder owned by this process"""
+    return journal_dir / str(os.getpid())
+
+
+def claim_journals(journal_dir: Path, pattern: str, skip: Collection[Path] = ()) -> List[Path]:
+    """
+    Claim the journal files of this process's folder and of dead processes (blocking)
+
+    Leftover *.tmp files (half-written, never acknowledged) of dead processes
+    are deleted.
+
+    Args:
+        journal_dir: Journal directory holding the per-process folders
+        pattern: Glob of journal files, e.g. "*.json"
+        skip: Files of this process that are still being written
+
+    Returns:
+        Claimed files (now in this process's folder), sorted by name
+    """
+    own_dir = process_dir(journal_dir)
+    own_dir.mkdir(parents=True, exist_ok=True)
+
+    # Own folder first - claimed files are moved into it
+    sources = [own_dir, journal_dir]
+    sources += [
+        path for path in journal_dir.iterdir()
+        if path.is_dir() and path.name.isdigit() and path != own_dir and not pid_alive(int(path.name))
+    ]
+
+    claimed = []
+    for source in sources:
+        for path in source.glob(pattern):
+            target = own_dir / path.name
+            if path in skip:
+                continue
+            if path != target:
+                try:
+                    os.rename(path, target)  # Atomic - exactly one process wins the file
+                except FileNotFoundError:
+                    continue  # Claimed by another process
+            claimed.append(target)
+
+        if source not in (journal_dir, own_dir):
+            for tmp_path in source.glob("*.tmp"):
+                tmp_path.unlink(missing_ok=True)
+            try:
+                source.rmdir()
+            except OSError:
+                pass  # Another process is still claiming from it
+
+    return sorted(claimed, key=lambda path: path.name)
+
+
+def pid_alive(pid: int) -> bool:
+    """Check whether a process with the given PID is running (POSIX)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+def fsync_dir(directory: Path) -> None:
+    """Make renames in a directory durable"""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
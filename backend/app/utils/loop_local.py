@@ -0,0 +1,52 @@
+"""
+Per-Event-Loop Resources
+Keeps one async client/semaphore per running event loop
+
+Async HTTP clients and asyncio primitives are bound to the event loop that first
+uses them. The API server runs a single loop and shares one instance across all
+requests; background jobs that call asyncio.run() in a scheduler thread get their
+own instance instead of reusing (and breaking) the server's.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    """
+    Lazily create one object per running event loop
+
+    Usage:
+        _clients = LoopLocal(lambda: httpx.AsyncClient())
+        client = _clients.get()  # must be called from inside a running loop
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        """Initialize with a zero-argument factory"""
+        self._factory = factory
+        self._instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Get (or create) the instance for the current event loop"""
+        loop = asyncio.get_running_loop()
+
+        instance = self._instances.get(loop)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(loop)
+                if instance is None:
+                    instance = self._factory()
+                    self._instances[loop] = instance
+
+        return instance
+
+    def pop(self) -> Optional[T]:
+        """Remove and return the instance for the current loop, if one was created"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._instances.pop(loop, None)
@@ -0,0 +1,135 @@
+"""
+Latency Metrics
+In-process latency histograms for external calls (exposed at /admin/metrics/latency)
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+
+# Bucket upper bounds in milliseconds (last bucket is +Inf)
+DEFAULT_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    Percentiles are estimated from bucket boundaries (upper bound of the bucket
+    containing the requested rank), so they are accurate to one bucket.
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        """Initialize empty histogram"""
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration in seconds"""
+        value_ms = seconds * 1000
+        index = bisect.bisect_left(self.buckets_ms, value_ms)
+
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum_ms += value_ms
+            self._max_ms = max(self._max_ms, value_ms)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Estimate the p-th percentile (0-100) in milliseconds"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            max_ms = self._max_ms
+
+        if total == 0:
+            return None
+
+        rank = max(1, int(round(total * p / 100)))
+        cumulative = 0
+        for index, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= rank:
+                if index < len(self.buckets_ms):
+                    return round(min(self.buckets_ms[index], max_ms), 1)
+                return round(max_ms, 1)
+
+        return round(max_ms, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get counts, mean and estimated percentiles"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            sum_ms = self._sum_ms
+            max_ms = self._max_ms
+
+        labels = [f"le_{int(bound)}ms" for bound in self.buckets_ms] + ["le_inf"]
+
+        return {
+            "count": total,
+            "mean_ms": round(sum_ms / total, 1) if total else None,
+            "max_ms": round(max_ms, 1) if total else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": dict(zip(labels, counts))
+        }
+
+
+class LatencyMetrics:
+    """
+    Named latency histograms
+
+    Usage:
+        with latency_metrics.timer("letta.send_message"):
+            ...
+    """
+
+    def __init__(self):
+        """Initialize empty registry"""
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Get (or create) the histogram with the given name"""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration for the named histogram"""
+        self.histogram(name).observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the enclosed block (recorded even if it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def names(self) -> List[str]:
+        """Get all histogram names"""
+        return sorted(self._histograms)
+
+    def snapshot(self, prefix: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Get snapshots of all histograms, optionally filtered by name prefix"""
+        return {
+            name: self._histograms[name].snapshot()
+            for name in self.names()
+            if prefix is None or name.startswith(prefix)
+        }
+
+
+# Global instance
+latency_metrics = LatencyMetrics()
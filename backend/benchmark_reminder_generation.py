@@ -0,0 +1,138 @@
+"""
+Benchmark for the reminder generation job
+Measures the time of one generate_reminders_from_schedules tick as the number of schedules grows
+
+Usage:
+    python benchmark_reminder_generation.py --schedules 1000,10000,100000
+
+Seeds benchmark patients and schedules (spread evenly over the day, so about 1/24
+of them are due in any one-hour window), initializes their next_reminder_at (a
+one-time cost, reported separately), times the tick, and deletes everything it
+created. Each tick runs in a transaction that is rolled back, so repeated runs
+measure the same amount of work. The job runs every minute, so a tick must stay
+well under 60 seconds at the largest size.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, time as datetime_time, timedelta
+
+from sqlalchemy import delete, insert
+
+# Add parent directory to path
+sys.path.insert(0, '.')
+
+from app.database.session import SessionLocal
+from app.jobs.reminder_generator import _create_due_reminders, _initialize_next_reminder_times
+from app.models.patient import Patient
+from app.models.schedule import Schedule
+
+SCHEDULES_PER_PATIENT = 5
+BENCHMARK_LAST_NAME = "ReminderBenchmark"
+
+
+def seed(db, schedule_count: int) -> None:
+    """Insert benchmark patients and schedules"""
+    patient_ids = [uuid.uuid4() for _ in range(max(1, schedule_count // SCHEDULES_PER_PATIENT))]
+
+    db.execute(insert(Patient), [
+        {
+            "id": patient_id,
+            "first_name": "Bench",
+            "last_name": BENCHMARK_LAST_NAME,
+            "date_of_birth": date(1940, 1, 1),
+            "device_token": None
+        }
+        for patient_id in patient_ids
+    ])
+
+    rows = []
+    for index in range(schedule_count):
+        minute_of_day = (index * 1440 // schedule_count) % 1440
+        rows.append({
+            "id": uuid.uuid4(),
+            "patient_id": patient_ids[index % len(patient_ids)],
+            "type": "medication",
+            "title": f"Benchmark medication {index}",
+            "scheduled_time": datetime_time(minute_of_day // 60, minute_of_day % 60),
+            "recurrence_pattern": "daily" if index % 2 else "weekly",
+            "days_of_week": [0, 1, 2, 3, 4, 5, 6],
+            "reminder_advance_minutes": 5,
+            "is_active": True
+        })
+
+    for offset in range(0, len(rows), 10000):
+        db.execute(insert(Schedule), rows[offset:offset + 10000])
+
+    db.commit()
+
+
+def cleanup(db) -> None:
+    """Delete benchmark patients (schedules and reminders cascade)"""
+    db.execute(delete(Patient).where(Patient.last_name == BENCHMARK_LAST_NAME))
+    db.commit()
+
+
+def run_level(schedule_count: int, repeats: int) -> None:
+    """Seed, time the tick, and clean up"""
+    db = SessionLocal()
+    try:
+        cleanup(db)
+        seed_start = time.perf_counter()
+        seed(db, schedule_count)
+        seed_seconds = time.perf_counter() - seed_start
+
+        init_start = time.perf_counter()
+        _initialize_next_reminder_times(db, datetime.utcnow())
+        db.commit()
+        db.expunge_all()
+        init_seconds = time.perf_counter() - init_start
+
+        # First tick fills the one-hour look-ahead window; the tick one minute
+        # later only sees schedules that entered the window (steady state)
+        first_timings, next_timings = [], []
+        first_created = next_created = 0
+        for _ in range(repeats):
+            now = datetime.utcnow()
+
+            start = time.perf_counter()
+            first_created = len(_create_due_reminders(db, now))
+            db.flush()
+            first_timings.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            next_created = len(_create_due_reminders(db, now + timedelta(minutes=1)))
+            db.flush()
+            next_timings.append(time.perf_counter() - start)
+
+            db.rollback()
+            db.expunge_all()
+
+        print(
+            f"{schedule_count:>9,} schedules | seeded in {seed_seconds:5.1f}s | "
+            f"initialized in {init_seconds:5.1f}s | "
+            f"first tick {first_created:>5,} reminders, median {statistics.median(first_timings) * 1000:7.1f}ms | "
+            f"next tick {next_created:>4,} reminders, median {statistics.median(next_timings) * 1000:7.1f}ms"
+        )
+    finally:
+        db.rollback()
+        cleanup(db)
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reminder generation")
+    parser.add_argument("--schedules", default="1000,10000,100000", help="Comma-separated schedule counts")
+    parser.add_argument("--repeats", type=int, default=5, help="Ticks timed per schedule count")
+    args = parser.parse_args()
+
+    print("Reminder generation benchmark (one tick, database round trips included)")
+    for schedule_count in [int(value) for value in args.schedules.split(",")]:
+        run_level(schedule_count, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Benchmark for patient report aggregation
+Compares SQL-side daily aggregation (app.services.reports) with the previous
+approach of loading every row into ORM objects and grouping in Python
+
+Usage:
+    python benchmark_report_aggregation.py --days 365 --repeats 5
+
+Seeds one benchmark patient with a heartbeat every 15 minutes, a few app opens,
+conversations and medication reminders per day, checks that both approaches
+produce the same report sections, times each section for the 7d/30d/90d/all
+ranges, and deletes everything it created.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, time as datetime_time, timedelta
+from typing import Dict, List
+
+from sqlalchemy import and_, delete, insert
+
+# Add parent directory to path
+sys.path.insert(0, '.')
+
+from app.database.session import SessionLocal
+from app.models.activity_log import ActivityLog
+from app.models.conversation import Conversation
+from app.models.patient import Patient
+from app.models.reminder import Reminder
+from app.models.schedule import Schedule
+from app.schemas.report import (
+    ActivityTrendData,
+    ActivityTrends,
+    MedicationAdherence,
+    MedicationAdherenceData,
+    MoodAnalytics,
+    MoodAnalyticsData,
+    Sentiment,
+    SentimentDistribution,
+    Trend
+)
+from app.services.reports import (
+    ACTIVITY_MINUTES,
+    SENTIMENT_SCORES,
+    calculate_activity_trends,
+    calculate_date_range,
+    calculate_medication_adherence,
+    calculate_mood_analytics,
+    calculate_trend
+)
+
+BENCHMARK_LAST_NAME = "ReportBenchmark"
+SENTIMENTS = ["positive", "neutral", "negative", "concerned", "distressed", None]
+
+
+# ===== Previous implementation (rows loaded into Python) =====
+
+def python_medication_adherence(db, patient_id, start_dt, end_dt) -> MedicationAdherence:
+    """Medication adherence grouped in Python"""
+    reminders = db.query(Reminder).join(Schedule).filter(
+        and_(
+            Reminder.patient_id == patient_id,
+            Schedule.type == "medication",
+            Reminder.due_at >= start_dt,
+            Reminder.due_at <= end_dt
+        )
+    ).all()
+
+    daily: Dict[date, Dict[str, int]] = {}
+    for reminder in reminders:
+        stats = daily.setdefault(reminder.due_at.date(), {"total": 0, "completed": 0})
+        stats["total"] += 1
+        if reminder.status == "completed":
+            stats["completed"] += 1
+
+    daily_data, rates = [], []
+    for day in sorted(daily):
+        rate = daily[day]["completed"] / daily[day]["total"]
+        daily_data.append(MedicationAdherenceData(date=day, rate=rate, **daily[day]))
+        rates.append(rate)
+
+    total = sum(stats["total"] for stats in daily.values())
+    completed = sum(stats["completed"] for stats in daily.values())
+    return MedicationAdherence(
+        overall_rate=completed / total if total else 0.0,
+        trend=calculate_trend(rates) if rates else "stable",
+        daily_data=daily_data
+    )
+
+
+def python_activity_trends(db, patient_id, start_dt, end_dt) -> ActivityTrends:
+    """Activity trends grouped in Python"""
+    activities = db.query(ActivityLog).filter(
+        and_(
+            ActivityLog.patient_id == patient_id,
+            ActivityLog.logged_at >= start_dt,
+            ActivityLog.logged_at <= end_dt
+        )
+    ).all()
+
+    daily: Dict[date, Dict[str, int]] = {}
+    for activity in activities:
+        stats = daily.setdefault(activity.logged_at.date(), {"interactions": 0, "minutes": 0})
+        stats["interactions"] += 1
+        stats["minutes"] += ACTIVITY_MINUTES.get(activity.activity_type, 0)
+
+    daily_data = [ActivityTrendData(date=day, **daily[day]) for day in sorted(daily)]
+    minutes = [data.minutes for data in daily_data]
+    return ActivityTrends(
+        average_daily_minutes=sum(minutes) / len(minutes) if minutes else 0.0,
+        trend=calculate_trend(minutes) if minutes else Trend.STABLE,
+        daily_data=daily_data
+    )
+
+
+def python_mood_analytics(db, patient_id, start_dt, end_dt) -> MoodAnalytics:
+    """Mood analytics grouped in Python"""
+    conversations = db.query(Conversation).filter(
+        and_(
+            Conversation.patient_id == patient_id,
+            Conversation.created_at >= start_dt,
+            Conversation.created_at <= end_dt
+        )
+    ).all()
+
+    counts = {"positive": 0, "neutral": 0, "negative": 0}
+    daily: Dict[date, List[float]] = {}
+    for conversation in conversations:
+        sentiment = conversation.sentiment or "neutral"
+        daily.setdefault(conversation.created_at.date(), []).append(SENTIMENT_SCORES.get(sentiment, 5.0))
+        if sentiment == "positive":
+            counts["positive"] += 1
+        elif sentiment in ["negative", "concerned", "distressed"]:
+            counts["negative"] += 1
+        else:
+            counts["neutral"] += 1
+
+    daily_data, scores = [], []
+    for day in sorted(daily):
+        score = sum(daily[day]) / len(daily[day])
+        sentiment = Sentiment.POSITIVE if score >= 7 else Sentiment.NEUTRAL if score >= 4 else Sentiment.NEGATIVE
+        daily_data.append(MoodAnalyticsData(date=day, score=score, sentiment=sentiment))
+        scores.append(score)
+
+    total = sum(counts.values())
+    return MoodAnalytics(
+        average_sentiment_score=sum(scores) / len(scores) if scores else 5.0,
+        trend=calculate_trend(scores) if scores else Trend.STABLE,
+        sentiment_distribution=SentimentDistribution(
+            **{key: value / total if total else 0.0 for key, value in counts.items()}
+        ),
+        daily_data=daily_data
+    )
+
+
+SECTIONS = [
+    ("medication_adherence", python_medication_adherence, calculate_medication_adherence),
+    ("activity_trends", python_activity_trends, calculate_activity_trends),
+    ("mood_analytics", python_mood_analytics, calculate_mood_analytics),
+]
+
+
+# ===== Seeding =====
+
+def seed(db, days: int) -> uuid.UUID:
+    """Insert a benchmark patient with `days` days of history"""
+    rng = random.Random(42)
+    patient_id = uuid.uuid4()
+    schedule_id = uuid.uuid4()
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    db.execute(insert(Patient), [{
+        "id": patient_id,
+        "first_name": "Bench",
+        "last_name": BENCHMARK_LAST_NAME,
+        "date_of_birth": date(1940, 1, 1)
+    }])
+    db.execute(insert(Schedule), [{
+        "id": schedule_id,
+        "patient_id": patient_id,
+        "type": "medication",
+        "title": "Benchmark medication",
+        "scheduled_time": datetime_time(9, 0),
+        "recurrence_pattern": "daily",
+        "days_of_week": [],
+        "is_active": True
+    }])
+
+    activities, conversations, reminders = [], [], []
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        for quarter in range(96):
+            activities.append({
+                "patient_id": patient_id,
+                "activity_type": "heartbeat",
+                "logged_at": day + timedelta(minutes=15 * quarter, seconds=rng.randint(0, 59))
+            })
+        for activity_type in ["app_open"] * 3 + ["conversation"] * 4 + ["reminder_response"] * 2:
+            activities.append({
+                "patient_id": patient_id,
+                "activity_type": activity_type,
+                "logged_at": day + timedelta(minutes=rng.randint(0, 1439))
+            })
+        for _ in range(rng.randint(0, 6)):
+            conversations.append({
+                "patient_id": patient_id,
+                "patient_message": "Benchmark message",
+                "ai_response": "Benchmark response",
+                "sentiment": rng.choice(SENTIMENTS),
+                "created_at": day + timedelta(minutes=rng.randint(0, 1439))
+            })
+        for hour in (9, 13, 21):
+            reminders.append({
+                "patient_id": patient_id,
+                "schedule_id": schedule_id,
+                "title": "Benchmark medication",
+                "due_at": day + timedelta(hours=hour),
+                "status": rng.choice(["completed", "completed", "completed", "missed"])
+            })
+
+    for offset in range(0, len(activities), 10000):
+        db.execute(insert(ActivityLog), activities[offset:offset + 10000])
+    db.execute(insert(Conversation), conversations)
+    db.execute(insert(Reminder), reminders)
+    db.commit()
+
+    print(
+        f"Seeded {len(activities):,} activity logs, {len(conversations):,} conversations "
+        f"and {len(reminders):,} reminders over {days} days"
+    )
+    return patient_id
+
+
+def cleanup(db) -> None:
+    """Delete benchmark patients (their rows cascade)"""
+    db.execute(delete(Patient).where(Patient.last_name == BENCHMARK_LAST_NAME))
+    db.commit()
+
+
+def timed(function, db, *args, repeats: int) -> float:
+    """Median seconds of a section calculation (fresh identity map each run)"""
+    timings = []
+    for _ in range(repeats):
+        db.expunge_all()
+        start = time.perf_counter()
+        function(db, *args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark report aggregation")
+    parser.add_argument("--days", type=int, default=365, help="Days of seeded history")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per section and range")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        cleanup(db)
+        patient_id = seed(db, args.days)
+
+        print(f"{'range':>5} | {'section':<21} | {'python':>9} | {'sql':>9} | speedup")
+        for time_range in ["7d", "30d", "90d", "all"]:
+            start_dt, end_dt = calculate_date_range(time_range)
+
+            for name, python_version, sql_version in SECTIONS:
+                expected = python_version(db, patient_id, start_dt, end_dt).model_dump()
+                actual = sql_version(db, patient_id, start_dt, end_dt).model_dump()
+                assert repr(expected) == repr(actual) or _close(expected, actual), f"{name} differs for {time_range}"
+
+                python_seconds = timed(python_version, db, patient_id, start_dt, end_dt, repeats=args.repeats)
+                sql_seconds = timed(sql_version, db, patient_id, start_dt, end_dt, repeats=args.repeats)
+                print(
+                    f"{time_range:>5} | {name:<21} | {python_seconds * 1000:7.1f}ms | "
+                    f"{sql_seconds * 1000:7.1f}ms | {python_seconds / sql_seconds:6.1f}x"
+                )
+    finally:
+        db.rollback()
+        cleanup(db)
+        db.close()
+
+
+def _close(expected, actual) -> bool:
+    """Compare report sections, allowing float rounding differences"""
+    if isinstance(expected, float) and isinstance(actual, float):
+        return abs(expected - actual) < 1e-9
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(_close(expected[key], actual[key]) for key in expected)
+    if isinstance(expected, list) and isinstance(actual, list):
+        return len(expected) == len(actual) and all(_close(e, a) for e, a in zip(expected, actual))
+    return expected == actual
+
+
+if __name__ == "__main__":
+    main()
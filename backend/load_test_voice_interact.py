@@ -0,0 +1,230 @@
+"""
+Load test for /api/v1/voice/interact
+Measures how throughput and latency scale with concurrent requests against one worker
+
+Usage:
+    # Start a single worker so results are per-worker
+    uvicorn app.main:app --workers 1 --port 8000
+
+    python load_test_voice_interact.py --concurrency 1,4,8,16,32 --requests 64
+
+    # Reproducible run without the Claude API: the script serves a stub of the
+    # Messages API (fixed latency, canned reply) on --stub-port, and the worker
+    # is pointed at it with ANTHROPIC_BASE_URL
+    ANTHROPIC_BASE_URL=http://127.0.0.1:9999 CLAUDE_API_KEY=stub \
+        uvicorn app.main:app --workers 1 --port 8000
+    python load_test_voice_interact.py --stub --stub-latency 0.5 --concurrency 1,4,16
+
+With a blocking Claude client, throughput stays flat as concurrency grows (requests
+are served one at a time). With the async client it should grow roughly linearly
+until CLAUDE_MAX_CONCURRENCY or the API rate limit is reached.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+
+# Add parent directory to path
+sys.path.insert(0, '.')
+
+
+MESSAGES = [
+    "Good morning! I slept pretty well last night.",
+    "I took my blood pressure medication after breakfast.",
+    "My knee is a little sore today but I went for a short walk.",
+    "My granddaughter is visiting this weekend, I'm so excited.",
+]
+
+
+# Canned Claude output: the combined reply-and-analysis tool call, and the
+# JSON analysis used by the post-response job
+STUB_ANALYSIS = {
+    "sentiment": "positive",
+    "health_mentions": [],
+    "urgency_level": "none",
+    "detailed_analysis": "Stub analysis"
+}
+
+
+def create_stub_app(latency: float) -> FastAPI:
+    """Stub of the Anthropic Messages API that answers every call after `latency` seconds"""
+    stub = FastAPI()
+
+    @stub.post("/v1/messages")
+    async def create_message(request: Request) -> Dict[str, Any]:
+        body = await request.json()
+        await asyncio.sleep(latency)
+
+        if body.get("tools"):
+            tool = body["tools"][0]["name"]
+            content = [{
+                "type": "tool_use",
+                "id": "toolu_stub",
+                "name": tool,
+                "input": {"response": "That's lovely to hear. Tell me more!", **STUB_ANALYSIS}
+            }]
+            stop_reason = "tool_use"
+        else:
+            content = [{"type": "text", "text": json.dumps(STUB_ANALYSIS)}]
+            stop_reason = "end_turn"
+
+        return {
+            "id": "msg_stub",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {"input_tokens": 0, "output_tokens": 0}
+        }
+
+    return stub
+
+
+def start_stub(port: int, latency: float) -> uvicorn.Server:
+    """Serve the stub API in a background thread (returns once it accepts connections)"""
+    server = uvicorn.Server(uvicorn.Config(create_stub_app(latency), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Stub API could not start on port {port}")
+        time.sleep(0.05)
+    return server
+
+
+def get_default_patient_id() -> Optional[str]:
+    """Use the first patient in the database if none was given"""
+    from app.database.session import SessionLocal
+    from app.models.patient import Patient
+
+    db = SessionLocal()
+    try:
+        patient = db.query(Patient).first()
+        return str(patient.id) if patient else None
+    finally:
+        db.close()
+
+
+async def send_request(
+    client: httpx.AsyncClient,
+    patient_id: str,
+    index: int
+) -> Dict[str, Any]:
+    """Send one voice interaction and record its latency"""
+    start = time.perf_counter()
+    try:
+        response = await client.post(
+            "/api/v1/voice/interact",
+            json={
+                "patient_id": patient_id,
+                "message": MESSAGES[index % len(MESSAGES)],
+                "conversation_type": "spontaneous"
+            }
+        )
+        ok = response.status_code == 200
+    except httpx.HTTPError:
+        ok = False
+
+    return {"ok": ok, "latency": time.perf_counter() - start}
+
+
+async def run_level(
+    base_url: str,
+    patient_id: str,
+    concurrency: int,
+    total_requests: int,
+    timeout: float
+) -> Dict[str, Any]:
+    """Run total_requests with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def bounded(index: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await send_request(client, patient_id, index)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(bounded(i) for i in range(total_requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(r["latency"] for r in results if r["ok"])
+    errors = sum(1 for r in results if not r["ok"])
+
+    return {
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        "errors": errors
+    }
+
+
+def print_results(results: List[Dict[str, Any]]):
+    """Print a throughput table with speedup relative to the first level"""
+    print("\n" + "="*72)
+    print("VOICE INTERACT LOAD TEST (single worker)")
+    print("="*72)
+    print(f"{'Concurrency':>11} | {'Req/s':>8} | {'Speedup':>7} | {'p50 (s)':>8} | {'p95 (s)':>8} | {'Errors':>6}")
+    print("-"*72)
+
+    baseline = results[0]["throughput"] if results and results[0]["throughput"] else None
+    for r in results:
+        speedup = f"{r['throughput'] / baseline:.1f}x" if baseline else "-"
+        print(
+            f"{r['concurrency']:>11} | {r['throughput']:>8.2f} | {speedup:>7} | "
+            f"{r['p50']:>8.2f} | {r['p95']:>8.2f} | {r['errors']:>6}"
+        )
+    print("="*72)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test /api/v1/voice/interact")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--patient-id", help="Patient UUID (defaults to the first patient in the database)")
+    parser.add_argument("--concurrency", default="1,4,8,16,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--stub", action="store_true", help="Serve a stub Claude API (start the worker with ANTHROPIC_BASE_URL pointing to it)")
+    parser.add_argument("--stub-port", type=int, default=9999, help="Port of the stub Claude API")
+    parser.add_argument("--stub-latency", type=float, default=0.5, help="Seconds the stub takes per Claude call")
+    args = parser.parse_args()
+
+    if args.stub:
+        start_stub(args.stub_port, args.stub_latency)
+        print(f"Stub Claude API on http://127.0.0.1:{args.stub_port} ({args.stub_latency}s per call)")
+
+    patient_id = args.patient_id or get_default_patient_id()
+    if not patient_id:
+        print("❌ No patient found - pass --patient-id")
+        return False
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    print(f"Target: {args.base_url} | Patient: {patient_id} | {args.requests} requests per level")
+
+    results = []
+    for concurrency in levels:
+        result = await run_level(args.base_url, patient_id, concurrency, args.requests, args.timeout)
+        print(f"✅ concurrency={concurrency}: {result['throughput']:.2f} req/s ({result['errors']} errors)")
+        results.append(result)
+
+    print_results(results)
+    return all(r["errors"] == 0 for r in results)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    sys.exit(0 if success else 1)
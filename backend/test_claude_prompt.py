@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Claude prompt caching tests
+Checks that the system prompt has one cache breakpoint after the static prefix
+
+The prefix up to the breakpoint (tools and instructions) must not depend on
+the patient, or it could never be shared between patients.
+
+Run with pytest, or directly: python test_claude_prompt.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pytest
+
+from app.core.config import settings
+from app.services.claude_service import COMBINED_INSTRUCTIONS, ROLE_INSTRUCTIONS, claude_service
+
+PATIENT_CONTEXT = {
+    "first_name": "Dorothy",
+    "age": 82,
+    "medical_conditions": ["hypertension"],
+    "medications": ["lisinopril"],
+    "personal_context": {"hobbies": "gardening"}
+}
+
+
+@pytest.fixture
+def prompt_caching(monkeypatch):
+    """Enable prompt caching regardless of the environment"""
+    monkeypatch.setattr(settings, "CLAUDE_PROMPT_CACHING", True)
+
+
+@pytest.mark.parametrize("extra_instructions", ["", COMBINED_INSTRUCTIONS])
+def test_single_breakpoint_after_static_prefix(prompt_caching, extra_instructions):
+    """Only the static block is marked, and it does not depend on the patient"""
+    blocks = claude_service._build_system_prompt(PATIENT_CONTEXT, extra_instructions=extra_instructions)
+    other_blocks = claude_service._build_system_prompt({"first_name": "Arthur"}, extra_instructions=extra_instructions)
+
+    assert [block.get("cache_control") for block in blocks] == [{"type": "ephemeral"}, None]
+    assert blocks[0] == other_blocks[0]
+    assert blocks[0]["text"] == ROLE_INSTRUCTIONS + extra_instructions
+
+
+def test_no_breakpoint_without_caching(monkeypatch):
+    """CLAUDE_PROMPT_CACHING=false sends no cache_control"""
+    monkeypatch.setattr(settings, "CLAUDE_PROMPT_CACHING", False)
+    blocks = claude_service._build_system_prompt(PATIENT_CONTEXT)
+
+    assert all("cache_control" not in block for block in blocks)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Patient context store tests
+Checks that one worker's cached entry follows changes made through another worker
+
+Each PatientContextStore instance stands in for one uvicorn worker. Needs a
+PostgreSQL database with the current schema (DATABASE_URL); skipped when it
+is not reachable.
+
+Run with pytest, or directly: python test_patient_context_store.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert, text
+from sqlalchemy.exc import OperationalError
+
+from app.database.session import AsyncSessionLocal, SessionLocal, engine
+from app.models.conversation import Conversation
+from app.models.patient import Patient
+from app.services.ai_orchestrator import ai_orchestrator
+from app.services.patient_context_store import PatientContextStore
+
+
+@pytest.fixture
+def db():
+    """Session on the test database (skips without a database)"""
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Patient context store is only checked on PostgreSQL")
+
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT 1"))
+    except OperationalError:
+        session.close()
+        pytest.skip("Database not reachable")
+
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture(scope="module")
+def loop():
+    """One event loop for all lookups (pooled async connections belong to a loop)"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def patient_id(db):
+    """Patient with one medication (deleted afterwards)"""
+    patient_id = uuid.uuid4()
+    db.execute(insert(Patient), [{
+        "id": patient_id,
+        "first_name": "Context",
+        "last_name": "ContextStoreTest",
+        "date_of_birth": date(1940, 1, 1),
+        "medications": ["Lisinopril"]
+    }])
+    db.commit()
+
+    yield patient_id
+
+    db.rollback()
+    db.execute(delete(Patient).where(Patient.id == patient_id))
+    db.commit()
+
+
+def new_store() -> PatientContextStore:
+    """Store of one (simulated) worker"""
+    return PatientContextStore(history_turns=5, max_patients=10, ttl_seconds=600)
+
+
+def get_entry(loop, store: PatientContextStore, patient_id):
+    """Look up an entry with a fresh async session, like a request would"""
+    async def lookup():
+        async with AsyncSessionLocal() as session:
+            return await store.get(patient_id, session, ai_orchestrator._build_patient_context)
+
+    return loop.run_until_complete(lookup())
+
+
+def save_turn(db, patient_id, message: str) -> uuid.UUID:
+    """Save a conversation turn as another worker would"""
+    conversation_id = uuid.uuid4()
+    db.execute(insert(Conversation), [{
+        "id": conversation_id,
+        "patient_id": patient_id,
+        "patient_message": message,
+        "ai_response": "I see.",
+        "created_at": datetime.utcnow() + timedelta(seconds=1)
+    }])
+    db.commit()
+    return conversation_id
+
+
+def test_profile_change_reaches_other_workers(db, loop, patient_id):
+    """A medication edited through one worker is used by the others on their next turn"""
+    other_worker = new_store()
+    assert get_entry(loop, other_worker, patient_id)["patient_context"]["medications"] == ["Lisinopril"]
+
+    db.get(Patient, patient_id).medications = ["Metformin"]
+    db.commit()
+
+    assert get_entry(loop, other_worker, patient_id)["patient_context"]["medications"] == ["Metformin"]
+
+
+def test_turns_saved_by_other_workers_reload_history(db, loop, patient_id):
+    """Turns served by another worker appear in this worker's history"""
+    store = new_store()
+    assert store.get_history(get_entry(loop, store, patient_id)) == []
+
+    save_turn(db, patient_id, "I walked to the park")
+
+    history = store.get_history(get_entry(loop, store, patient_id))
+    assert [turn["patient_message"] for turn in history] == ["I walked to the park"]
+
+
+def test_own_turns_keep_the_entry(db, loop, patient_id):
+    """A turn this worker appended does not force a reload"""
+    store = new_store()
+    entry = get_entry(loop, store, patient_id)
+
+    conversation_id = save_turn(db, patient_id, "Good morning")
+    store.append_turn(patient_id, conversation_id, "Good morning", "I see.")
+
+    assert get_entry(loop, store, patient_id) is entry
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
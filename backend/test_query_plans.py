@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Query plan regression tests
+Checks that the hot job and endpoint queries use their composite/partial indexes
+
+The statements are built by the same functions the jobs and endpoints execute.
+Needs a PostgreSQL database with the current schema (DATABASE_URL); skipped
+when it is not reachable. Plans depend on table statistics, so the fixture
+inserts a representative data set and analyzes it inside a transaction that
+is rolled back afterwards. Sequential scans are disabled for the session so
+the planner picks an index whenever one matches.
+
+Run with pytest, or directly: python test_query_plans.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import random
+import uuid
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+
+from app.database.session import SessionLocal, engine
+from app.jobs.inactivity_detector import inactive_patients_query, latest_heartbeat_query
+from app.jobs.reminder_generator import (
+    exhausted_reminders_update,
+    missed_reminders_update,
+    reminded_query,
+    retried_reminders_update
+)
+from app.models.activity_log import ActivityLog
+from app.models.alert import Alert
+from app.models.conversation import Conversation
+from app.models.patient import Patient
+from app.models.reminder import Reminder
+from app.models.schedule import Schedule
+from app.services.patient_context_store import recent_conversations_query
+from app.services.reports import activity_daily_query, medication_daily_query, mood_daily_query
+
+PATIENT_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+NOW = datetime(2026, 1, 1, 12, 0)
+
+# Representative data set: patients with a few schedules and weeks of history
+PATIENTS = 100
+DAYS = 60
+
+ANALYZED_TABLES = ["patients", "schedules", "reminders", "alerts", "conversations", "activity_logs"]
+
+
+@pytest.fixture(scope="module")
+def db():
+    """Session with representative statistics and sequential scans disabled (skips without a database)"""
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Query plans are only checked on PostgreSQL")
+
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT 1"))
+    except OperationalError:
+        session.close()
+        pytest.skip("Database not reachable")
+
+    seed(session)
+    session.execute(text(f"ANALYZE {', '.join(ANALYZED_TABLES)}"))  # Sees the uncommitted rows
+    session.execute(text("SET enable_seqscan = off"))
+
+    yield session
+    session.rollback()
+    session.close()
+
+
+def seed(db) -> None:
+    """Insert the data set (not committed)"""
+    rng = random.Random(16)
+
+    def new_id() -> uuid.UUID:
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    patient_ids = [PATIENT_ID] + [new_id() for _ in range(PATIENTS - 1)]
+    schedules = [(patient_id, new_id()) for patient_id in patient_ids for _ in range(2)]
+
+    db.execute(insert(Patient), [
+        {
+            "id": patient_id,
+            "first_name": "Plan",
+            "last_name": "QueryPlanTest",
+            "date_of_birth": date(1940, 1, 1),
+            "last_heartbeat_at": NOW - timedelta(minutes=rng.randrange(600))
+        }
+        for patient_id in patient_ids
+    ])
+    db.execute(insert(Schedule), [
+        {
+            "id": schedule_id,
+            "patient_id": patient_id,
+            "type": rng.choice(["medication", "meal"]),
+            "title": "Plan test",
+            "scheduled_time": time(9, 0),
+            "recurrence_pattern": "daily",
+            "days_of_week": []
+        }
+        for patient_id, schedule_id in schedules
+    ])
+    db.execute(insert(Reminder), [
+        {
+            "id": new_id(),
+            "patient_id": patient_id,
+            "schedule_id": schedule_id,
+            "title": "Plan test",
+            "due_at": NOW - timedelta(days=day),
+            # Only the latest reminders are still pending
+            "status": "pending" if day == 0 else rng.choice(["completed", "completed", "missed"])
+        }
+        for patient_id, schedule_id in schedules
+        for day in range(DAYS)
+    ])
+    db.execute(insert(ActivityLog), [
+        {
+            "id": new_id(),
+            "patient_id": patient_id,
+            "activity_type": rng.choice(["heartbeat", "heartbeat", "app_open", "voice_interaction"]),
+            "logged_at": NOW - timedelta(hours=12 * event)
+        }
+        for patient_id in patient_ids
+        for event in range(2 * DAYS)
+    ])
+    db.execute(insert(Conversation), [
+        {
+            "id": new_id(),
+            "patient_id": patient_id,
+            "patient_message": "Hello",
+            "ai_response": "Hello",
+            "sentiment": rng.choice(["positive", "neutral", "concerned"]),
+            "created_at": NOW - timedelta(days=day, hours=rng.randrange(12))
+        }
+        for patient_id in patient_ids
+        for day in range(DAYS)
+    ])
+    db.execute(insert(Alert), [
+        {
+            "id": new_id(),
+            "patient_id": patient_id,
+            "alert_type": rng.choice(["inactivity", "missed_medication", "health_concern"]),
+            "severity": rng.choice(["medium", "high", "critical"]),
+            "title": "Plan test",
+            "description": "Plan test",
+            "created_at": NOW - timedelta(days=week * 7),
+            # Most alerts have been handled
+            "acknowledged_at": NOW - timedelta(days=week * 7) if week else None
+        }
+        for patient_id in patient_ids
+        for week in range(DAYS // 7)
+    ])
+
+
+def explain(db, statement) -> str:
+    """Get the plan of a statement as text (EXPLAIN without ANALYZE never runs it)"""
+    sql = statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    return "\n".join(row[0] for row in db.execute(text(f"EXPLAIN {sql}")))
+
+
+def index_conditions(plan: str) -> list:
+    """Index Cond lines of a plan"""
+    return [line.strip() for line in plan.splitlines() if "Index Cond" in line]
+
+
+def test_missed_reminders_use_pending_partial_index(db):
+    """Missed-reminder job: UPDATE ... RETURNING of pending reminders past due"""
+    assert "ix_reminders_pending_due_at" in explain(db, missed_reminders_update(NOW))
+
+
+@pytest.mark.parametrize("build_update", [exhausted_reminders_update, retried_reminders_update])
+def test_retried_reminders_use_pending_partial_index(db, build_update):
+    """Retry job: both UPDATE ... RETURNING statements"""
+    assert "ix_reminders_pending_due_at" in explain(db, build_update(NOW))
+
+
+def test_reminder_dedupe_uses_schedule_due_at_index(db):
+    """Reminder job: reminders already created for due schedules"""
+    statement = reminded_query([uuid.uuid4(), uuid.uuid4()], NOW, NOW + timedelta(hours=1))
+
+    assert "ix_reminders_schedule_id_due_at" in explain(db, statement)
+
+
+def test_recent_conversations_use_patient_created_at_index(db):
+    """Patient context: most recent conversation turns"""
+    plan = explain(db, recent_conversations_query(PATIENT_ID, 10))
+
+    assert "ix_conversations_patient_id_created_at" in plan
+    assert "Sort" not in plan
+
+
+def test_inactivity_anti_join_uses_open_alert_partial_index(db):
+    """Inactivity timer: a patient without an open alert at their severity"""
+    plan = explain(db, inactive_patients_query(NOW, [PATIENT_ID]))
+
+    assert "ix_alerts_open_patient_type_severity_created_at" in plan
+
+
+def test_inactivity_full_scan_reads_recent_alerts_only(db):
+    """Inactivity detector: the anti-join over all patients only reads alerts of the dedupe window"""
+    plan = explain(db, inactive_patients_query(NOW))
+
+    assert "Anti Join" in plan
+    assert any("created_at >=" in condition for condition in index_conditions(plan))
+
+
+def test_latest_heartbeat_uses_patient_type_logged_at_index(db):
+    """Latest heartbeat, newest first"""
+    plan = explain(db, latest_heartbeat_query(PATIENT_ID))
+
+    assert "ix_activity_logs_patient_id_type_logged_at" in plan
+    assert "Sort" not in plan
+
+
+@pytest.mark.parametrize("daily_query", [medication_daily_query, activity_daily_query, mood_daily_query])
+def test_report_daily_aggregates_scan_by_patient(db, daily_query):
+    """Report sections: per-day aggregates read only the requested patients' rows"""
+    plan = explain(db, daily_query(NOW - timedelta(days=7), NOW, [PATIENT_ID, uuid.uuid4()]))
+
+    assert "Seq Scan" not in plan
+    assert any("patient_id = ANY" in condition for condition in index_conditions(plan))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
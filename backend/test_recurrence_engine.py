@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Property-based tests for the reminder recurrence engine
+Checks next_reminder_at across timezones and daylight saving transitions
+
+Run with pytest, or directly: python test_recurrence_engine.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from datetime import datetime, time, timedelta
+
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings as hypothesis_settings, strategies as st
+
+from app.models.schedule import Schedule
+from app.services.recurrence import (
+    local_day,
+    local_to_utc,
+    next_reminder_at,
+    schedule_applies_on,
+    to_local
+)
+
+# Zones with DST (including 30-minute shifts and southern hemisphere), without DST, and fractional offsets
+TIMEZONES = [
+    "UTC",
+    "America/New_York",
+    "America/Los_Angeles",
+    "America/Sao_Paulo",
+    "Europe/London",
+    "Europe/Berlin",
+    "Australia/Sydney",
+    "Australia/Lord_Howe",
+    "Asia/Kolkata",
+    "Asia/Tokyo",
+    "Pacific/Chatham",
+    "Pacific/Kiritimati",
+]
+
+
+@st.composite
+def schedules(draw):
+    """Random daily or weekly schedule"""
+    pattern = draw(st.sampled_from(["daily", "weekly", "custom"]))
+    days = draw(st.lists(st.integers(0, 6), min_size=1, max_size=7, unique=True))
+    return Schedule(
+        type="medication",
+        title="Test",
+        scheduled_time=draw(st.times()).replace(second=0, microsecond=0),
+        recurrence_pattern=pattern,
+        days_of_week=[] if pattern == "daily" else days,
+        reminder_advance_minutes=draw(st.integers(0, 60))
+    )
+
+
+moments = st.datetimes(min_value=datetime(2020, 1, 1), max_value=datetime(2035, 12, 31))
+timezones = st.sampled_from(TIMEZONES)
+
+
+def occurrence_day(schedule: Schedule, reminder_at: datetime, timezone_name: str):
+    """Local day of the occurrence a reminder time belongs to"""
+    return local_day(reminder_at + timedelta(minutes=schedule.reminder_advance_minutes), timezone_name)
+
+
+@hypothesis_settings(max_examples=300, deadline=None)
+@given(schedule=schedules(), after=moments, timezone_name=timezones)
+def test_next_reminder_is_not_before_after(schedule, after, timezone_name):
+    """The next reminder is never in the past and always exists for valid schedules"""
+    result = next_reminder_at(schedule, after, timezone_name)
+
+    assert result is not None
+    assert result >= after
+    # At most one week (plus a DST shift) ahead
+    assert result - after <= timedelta(days=7, hours=2)
+
+
+@hypothesis_settings(max_examples=300, deadline=None)
+@given(schedule=schedules(), after=moments, timezone_name=timezones)
+def test_next_reminder_is_on_an_applicable_local_day(schedule, after, timezone_name):
+    """The occurrence falls on a weekday the schedule applies to, in the patient's timezone"""
+    result = next_reminder_at(schedule, after, timezone_name)
+    day = occurrence_day(schedule, result, timezone_name)
+
+    assert schedule_applies_on(schedule, day.weekday())
+
+
+@hypothesis_settings(max_examples=300, deadline=None)
+@given(schedule=schedules(), after=moments, timezone_name=timezones)
+def test_next_reminder_keeps_local_wall_clock_time(schedule, after, timezone_name):
+    """The occurrence is at the scheduled local time, unless that time does not exist that day"""
+    result = next_reminder_at(schedule, after, timezone_name)
+    occurrence = to_local(result + timedelta(minutes=schedule.reminder_advance_minutes), timezone_name)
+
+    if occurrence.time() != schedule.scheduled_time:
+        # Only allowed in a spring-forward gap: shifted forward, by at most the gap
+        naive = datetime.combine(occurrence.date(), schedule.scheduled_time)
+        shift = occurrence.replace(tzinfo=None) - naive
+        assert timedelta(0) < shift <= timedelta(hours=1)
+
+
+@hypothesis_settings(max_examples=300, deadline=None)
+@given(schedule=schedules(), after=moments, timezone_name=timezones, fraction=st.floats(0, 1))
+def test_no_occurrence_is_skipped(schedule, after, timezone_name, fraction):
+    """Asking again from any moment up to the result gives the same result"""
+    result = next_reminder_at(schedule, after, timezone_name)
+    later = after + (result - after) * fraction
+
+    assert next_reminder_at(schedule, min(later, result), timezone_name) == result
+
+
+@hypothesis_settings(max_examples=300, deadline=None)
+@given(schedule=schedules(), after=moments, timezone_name=timezones)
+def test_advancing_gives_one_reminder_per_local_day(schedule, after, timezone_name):
+    """Advancing past a reminder moves to a later local day (DST never duplicates a day)"""
+    first = next_reminder_at(schedule, after, timezone_name)
+    second = next_reminder_at(schedule, first + timedelta(minutes=1), timezone_name)
+
+    assert second > first
+    assert occurrence_day(schedule, second, timezone_name) > occurrence_day(schedule, first, timezone_name)
+
+
+@hypothesis_settings(max_examples=300, deadline=None)
+@given(schedule=schedules(), after=moments, timezone_name=timezones)
+def test_daily_reminders_are_a_day_apart(schedule, after, timezone_name):
+    """Consecutive daily reminders are 24h apart, give or take one DST shift"""
+    schedule.recurrence_pattern = "daily"
+    first = next_reminder_at(schedule, after, timezone_name)
+    second = next_reminder_at(schedule, first + timedelta(minutes=1), timezone_name)
+
+    assert timedelta(hours=22) <= second - first <= timedelta(hours=26)
+
+
+def test_spring_forward_gap_fires_after_transition():
+    """02:30 does not exist in New York on 2026-03-08 - fires at 03:30 EDT"""
+    schedule = Schedule(scheduled_time=time(2, 30), recurrence_pattern="daily", reminder_advance_minutes=0)
+    result = next_reminder_at(schedule, datetime(2026, 3, 8, 5, 0), "America/New_York")
+
+    assert result == datetime(2026, 3, 8, 7, 30)  # 03:30 EDT
+    assert to_local(result, "America/New_York").hour == 3
+
+
+def test_fall_back_fires_once_at_first_occurrence():
+    """01:30 happens twice in New York on 2026-11-01 - fires once, at 01:30 EDT"""
+    schedule = Schedule(scheduled_time=time(1, 30), recurrence_pattern="daily", reminder_advance_minutes=0)
+    first = next_reminder_at(schedule, datetime(2026, 11, 1, 4, 0), "America/New_York")
+    second = next_reminder_at(schedule, first + timedelta(minutes=1), "America/New_York")
+
+    assert first == datetime(2026, 11, 1, 5, 30)  # 01:30 EDT
+    assert second == datetime(2026, 11, 2, 6, 30)  # 01:30 EST next day
+
+
+def test_weekday_is_the_patients_local_weekday():
+    """A Monday 08:00 schedule in Tokyo fires on Sunday 23:00 UTC"""
+    schedule = Schedule(
+        scheduled_time=time(8, 0),
+        recurrence_pattern="weekly",
+        days_of_week=[0],
+        reminder_advance_minutes=0
+    )
+    result = next_reminder_at(schedule, datetime(2026, 10, 18, 0, 0), "Asia/Tokyo")
+
+    assert result == datetime(2026, 10, 18, 23, 0)
+    assert local_day(result, "Asia/Tokyo").weekday() == 0
+
+
+def test_unknown_timezone_falls_back_to_utc():
+    """An invalid Patient.timezone is treated as UTC instead of failing the job"""
+    assert local_to_utc(datetime(2026, 1, 1).date(), time(9, 0), "Not/AZone") == datetime(2026, 1, 1, 9, 0)
+
+
+def test_weekly_schedule_without_days_never_fires():
+    """A weekly schedule with no days has no next reminder"""
+    schedule = Schedule(scheduled_time=time(9, 0), recurrence_pattern="weekly", days_of_week=[], reminder_advance_minutes=5)
+
+    assert next_reminder_at(schedule, datetime(2026, 1, 1), "UTC") is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Report cache tests
+Checks that writes of report data change the report ETag (patients.data_version)
+
+The job tests need a PostgreSQL database with the current schema
+(DATABASE_URL); they are skipped when it is not reachable.
+
+Run with pytest, or directly: python test_report_cache.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import uuid
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.exc import OperationalError
+
+from app.database.session import SessionLocal, engine
+from app.jobs.metrics_rollup import compact_daily_metrics, refresh_stale_daily_metrics
+from app.jobs.reminder_generator import check_and_mark_missed_reminders, retry_unacknowledged_reminders
+from app.models.patient import Patient
+from app.models.patient_daily_metrics import PatientDailyMetrics
+from app.models.reminder import Reminder
+from app.models.schedule import Schedule
+from app.models.stale_daily_metrics import StaleDailyMetrics
+from app.services.report_cache import etag_matches, report_etag
+from app.services.reports import calculate_date_range
+
+
+@pytest.fixture
+def db():
+    """Session on the test database (skips without a database)"""
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Report cache jobs are only checked on PostgreSQL")
+
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT 1"))
+    except OperationalError:
+        session.close()
+        pytest.skip("Database not reachable")
+
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def patient(db):
+    """Patient with a medication schedule (deleted afterwards)"""
+    patient_id, schedule_id = uuid.uuid4(), uuid.uuid4()
+    db.execute(insert(Patient), [{
+        "id": patient_id,
+        "first_name": "Cache",
+        "last_name": "ReportCacheTest",
+        "date_of_birth": date(1940, 1, 1)
+    }])
+    db.execute(insert(Schedule), [{
+        "id": schedule_id,
+        "patient_id": patient_id,
+        "type": "medication",
+        "title": "Test medication",
+        "scheduled_time": time(9, 0),
+        "recurrence_pattern": "daily",
+        "days_of_week": [],
+        "is_active": True
+    }])
+    db.commit()
+
+    yield db.get(Patient, patient_id)
+
+    db.rollback()
+    db.execute(delete(Patient).where(Patient.id == patient_id))
+    db.commit()
+
+
+def add_pending_reminder(db, patient, due_at: datetime, retry_count: int = 0) -> uuid.UUID:
+    """Insert a pending reminder with a bulk INSERT (no flush hook)"""
+    reminder_id = uuid.uuid4()
+    db.execute(insert(Reminder), [{
+        "id": reminder_id,
+        "patient_id": patient.id,
+        "schedule_id": patient.schedules[0].id,
+        "title": "Test medication",
+        "due_at": due_at,
+        "retry_count": retry_count
+    }])
+    db.commit()
+    return reminder_id
+
+
+def current_etag(db, patient) -> str:
+    """ETag of the patient's 7-day report"""
+    db.refresh(patient)
+    start_dt, end_dt = calculate_date_range("7d")
+    return report_etag(patient, "7d", start_dt, end_dt)
+
+
+def stale_marks(db, patient) -> int:
+    """Number of stale-day marks of a patient"""
+    return db.scalar(select(func.count()).where(StaleDailyMetrics.patient_id == patient.id))
+
+
+def test_etag_matches():
+    """If-None-Match lists, weak validators and *"""
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"def", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"def"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_missed_reminder_changes_etag(db, patient):
+    """The missed-reminder job invalidates the report"""
+    reminder_id = add_pending_reminder(db, patient, datetime.utcnow() - timedelta(hours=2))
+    before = current_etag(db, patient)
+
+    check_and_mark_missed_reminders()
+
+    assert db.get(Reminder, reminder_id, populate_existing=True).status == "missed"
+    assert current_etag(db, patient) != before
+
+
+def test_exhausted_retry_changes_etag(db, patient):
+    """The retry job invalidates the report when it gives up on a reminder"""
+    reminder_id = add_pending_reminder(db, patient, datetime.utcnow() - timedelta(minutes=20), retry_count=3)
+    before = current_etag(db, patient)
+
+    retry_unacknowledged_reminders()
+
+    assert db.get(Reminder, reminder_id, populate_existing=True).status == "missed"
+    assert current_etag(db, patient) != before
+
+
+def test_rollup_rewrite_changes_etag(db, patient):
+    """The rollup job invalidates reports when it rewrites rolled-up days"""
+    add_pending_reminder(db, patient, datetime.utcnow() - timedelta(days=2))
+    compact_daily_metrics()
+
+    # A write that bypasses every hook leaves the rolled-up day stale
+    db.execute(
+        text("UPDATE reminders SET status = 'completed' WHERE patient_id = :patient_id"),
+        {"patient_id": patient.id}
+    )
+    db.commit()
+    before = current_etag(db, patient)
+
+    compact_daily_metrics()
+    after = current_etag(db, patient)
+    assert after != before
+
+    # Nothing changed since - the ETag stays valid
+    compact_daily_metrics()
+    assert current_etag(db, patient) == after
+
+
+def test_late_write_marks_days_for_refresh(db, patient):
+    """A late ORM write only records the stale day; the refresh job recomputes it"""
+    due_at = datetime.utcnow() - timedelta(days=2)
+    reminder_id = add_pending_reminder(db, patient, due_at)
+    compact_daily_metrics()
+
+    db.get(Reminder, reminder_id).status = "completed"
+    db.commit()
+    assert stale_marks(db, patient) == 1
+    before = current_etag(db, patient)
+
+    refresh_stale_daily_metrics()
+
+    rolled_up = db.get(PatientDailyMetrics, (patient.id, due_at.date()), populate_existing=True)
+    assert rolled_up.reminders_completed == 1
+    assert stale_marks(db, patient) == 0
+    assert current_etag(db, patient) != before
+
+
+def test_new_schedule_marks_nothing(db, patient):
+    """A new schedule has no reminders, so no rolled-up day is stale"""
+    db.add(Schedule(
+        patient_id=patient.id,
+        type="medication",
+        title="Another medication",
+        scheduled_time=time(20, 0),
+        recurrence_pattern="daily",
+        days_of_week=[]
+    ))
+    db.commit()
+
+    assert stale_marks(db, patient) == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))